@@ -0,0 +1,87 @@
+"""
+Runs all benchmarks. Results can be written as JSON and compared with stored baseline.
+Run with `python -m benchmarks [--output results.json] [--baseline benchmarks/baseline.json]`.
+All results are lower-is-better, results slower than baseline by more than tolerance are reported
+as regressions and exit status is 1.
+"""
+from __future__ import annotations
+
+import argparse
+import json
+import platform
+import sys
+from typing import Any
+
+from benchmarks import decoding, models, payload, stats
+
+
+SUITES = {
+    "models": models.run,
+    "decoding": decoding.run,
+    "payload": payload.run,
+    "stats": stats.run,
+}
+DEFAULT_TOLERANCE = 0.2  # 20%, timings are noisy on shared machines.
+
+
+def run(suites: list[str]) -> dict[str, Any]:
+    """
+    Runs given suites. Returns report with environment and results.
+    """
+    results: dict[str, float] = {}
+    for suite in suites:
+        results.update(SUITES[suite]())
+    return {
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "results": results,
+    }
+
+
+def compare(results: dict[str, float], baseline: dict[str, float], tolerance: float) -> list[str]:
+    """
+    Prints results next to baseline. Returns names of results worse than baseline over tolerance.
+    """
+    regressions = []
+    for name, value in results.items():
+        base = baseline.get(name)
+        if not base:
+            print(f"{name:<45}{value:>10.2f}")
+            continue
+        change = value / base - 1
+        regressed = change > tolerance
+        if regressed:
+            regressions.append(name)
+        print(f"{name:<45}{value:>10.2f}{base:>10.2f}{change:>+9.1%}{'  REGRESSION' if regressed else ''}")
+    return regressions
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(prog="python -m benchmarks", description="Runs benchmarks.")
+    parser.add_argument("suites", nargs="*", help=f"Suites to run, all by default: {', '.join(SUITES)}.")
+    parser.add_argument("--output", help="Writes JSON report to given file.")
+    parser.add_argument("--baseline", help="Compares results with JSON report in given file.")
+    parser.add_argument("--tolerance", type=float, default=DEFAULT_TOLERANCE, help="Allowed slowdown, 0.2 is 20%%.")
+    args = parser.parse_args(argv)
+    if unknown := set(args.suites) - set(SUITES):
+        parser.error(f"unknown suites: {', '.join(sorted(unknown))}")
+
+    report = run(args.suites or list(SUITES))
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            json.dump(report, f, indent=2)
+            f.write("\n")
+
+    baseline: dict[str, float] = {}
+    if args.baseline:
+        with open(args.baseline, encoding="utf-8") as f:
+            baseline = json.load(f)["results"]
+    regressions = compare(report["results"], baseline, args.tolerance)
+    if regressions:
+        print(f"{len(regressions)} regression(s) over {args.tolerance:.0%}: {', '.join(regressions)}")
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,63 @@
+"""
+Stats detail page decoding benchmark, time and peak memory of whole body and incremental decoding.
+Run with `python -m benchmarks.decoding`.
+"""
+from __future__ import annotations
+
+import json
+from typing import Any, Callable
+
+from benchmarks.models import STATS_SUBSCRIBER_DATA, time_per_call
+from benchmarks.payload import peak_memory
+from ecomail.campaign_stats_detail import CampaignStatsDetailSubscriber
+from ecomail.decoding import STREAM_CHUNK_SIZE, decode_stats_detail_page, orjson
+
+
+NUMBER = 20  # Pages decoded in single timing run.
+PAGE_SIZE = 5_000  # Subscribers of decoded page.
+
+
+def decode_whole(body: bytes, loads: Callable[[bytes], Any]) -> list[CampaignStatsDetailSubscriber]:
+    """
+    Decodes whole body at once, the same way as service without `stream_stats_pages` option.
+    """
+    return CampaignStatsDetailSubscriber.list_from_dict(loads(body)["subscribers"])
+
+
+def decode_incremental(body: bytes) -> list[CampaignStatsDetailSubscriber]:
+    """
+    Decodes body from chunks, the same way as service with `stream_stats_pages` option.
+    """
+    subscribers: list[CampaignStatsDetailSubscriber] = []
+    from_trusted_dict = CampaignStatsDetailSubscriber.from_trusted_dict
+    decode_stats_detail_page(
+        (body[_i:_i + STREAM_CHUNK_SIZE] for _i in range(0, len(body), STREAM_CHUNK_SIZE)),
+        lambda _e, _d: subscribers.append(from_trusted_dict(_e, _d)),
+    )
+    return subscribers
+
+
+def run() -> dict[str, float]:
+    """
+    Runs benchmarks. Returns mapping of benchmark names to results.
+    """
+    body = json.dumps({
+        "total": PAGE_SIZE,
+        "per_page": PAGE_SIZE,
+        "subscribers": {f"user{_i}@example.com": STATS_SUBSCRIBER_DATA for _i in range(PAGE_SIZE)},
+        "next_page_url": None,
+    }).encode()
+    results = {
+        "stats_page.json [ms]": time_per_call(lambda: decode_whole(body, json.loads), number=NUMBER) / 1000,
+        "stats_page.incremental [ms]": time_per_call(lambda: decode_incremental(body), number=NUMBER) / 1000,
+        "stats_page.json_peak_memory [KiB]": peak_memory(lambda: decode_whole(body, json.loads)),
+        "stats_page.incremental_peak_memory [KiB]": peak_memory(lambda: decode_incremental(body)),
+    }
+    if orjson is not None:
+        results["stats_page.orjson [ms]"] = time_per_call(lambda: decode_whole(body, orjson.loads), number=NUMBER) / 1000
+    return results
+
+
+if __name__ == "__main__":
+    for name, value in run().items():
+        print(f"{name:<45}{value:>10.2f}")
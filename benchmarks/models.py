@@ -0,0 +1,92 @@
+"""
+Construction time and memory benchmark of model classes.
+Run with `python -m benchmarks.models`.
+"""
+from __future__ import annotations
+
+import gc
+import timeit
+import tracemalloc
+from typing import Any, Callable
+
+from ecomail.campaign import Campaign
+from ecomail.campaign_stats_detail import CampaignStatsDetailSubscriber
+from ecomail.subscriber import Subscriber
+
+
+NUMBER = 20_000  # Objects created in single timing run.
+REPEAT = 5  # Best of timing runs is reported.
+
+SUBSCRIBER_DATA = {
+    "name": "John",
+    "surname": "Doe",
+    "email": "user@example.com",
+    "phone": "123456789",
+    "country": "CZ",
+    "tags": ["tag1", "tag2"],
+}
+CAMPAIGN_DATA = {
+    "id": 52,
+    "from_name": "Example from name",
+    "from_email": "sender@example.com",
+    "reply_to": "replyto@example.com",
+    "title": "Example title",
+    "subject": "Example subject",
+    "sent_at": "2024-10-01 17:02:21",
+    "recipients": 401,
+    "status": 3,
+}
+STATS_SUBSCRIBER_DATA = {"open": 2, "send": 1, "click": 1}
+
+
+def time_per_call(func: Callable[[], Any], number: int = NUMBER, repeat: int = REPEAT) -> float:
+    """
+    Returns best time of single call in microseconds.
+    """
+    return min(timeit.repeat(func, number=number, repeat=repeat)) / number * 1e6
+
+
+def memory_per_object(factory: Callable[[int], Any], number: int = NUMBER) -> float:
+    """
+    Returns bytes allocated per object created by factory, called with object index.
+    """
+    gc.collect()
+    tracemalloc.start()
+    try:
+        objects = [factory(_i) for _i in range(number)]
+        size, _ = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    # List of objects itself is not counted.
+    return (size - objects.__sizeof__()) / number
+
+
+def run() -> dict[str, float]:
+    """
+    Runs benchmarks. Returns mapping of benchmark names to results.
+    """
+    # Unique emails make sure only the objects are measured, not shared strings.
+    emails = [f"user{_i}@example.com" for _i in range(NUMBER)]
+    return {
+        "subscriber.as_dict [us]": time_per_call(Subscriber.from_dict(SUBSCRIBER_DATA).as_dict),
+        "subscriber.from_dict [us]": time_per_call(lambda: Subscriber.from_dict(SUBSCRIBER_DATA)),
+        "subscriber.from_trusted_dict [us]": time_per_call(lambda: Subscriber.from_trusted_dict(SUBSCRIBER_DATA)),
+        "subscriber.memory [B]": memory_per_object(lambda _i: Subscriber.from_trusted_dict(SUBSCRIBER_DATA)),
+        "campaign.from_dict [us]": time_per_call(lambda: Campaign.from_dict(CAMPAIGN_DATA)),
+        "campaign.from_trusted_dict [us]": time_per_call(lambda: Campaign.from_trusted_dict(CAMPAIGN_DATA)),
+        "campaign.memory [B]": memory_per_object(lambda _i: Campaign.from_trusted_dict(CAMPAIGN_DATA)),
+        "stats_subscriber.from_dict [us]": time_per_call(
+            lambda: CampaignStatsDetailSubscriber.from_dict("user@example.com", STATS_SUBSCRIBER_DATA),
+        ),
+        "stats_subscriber.from_trusted_dict [us]": time_per_call(
+            lambda: CampaignStatsDetailSubscriber.from_trusted_dict("user@example.com", STATS_SUBSCRIBER_DATA),
+        ),
+        "stats_subscriber.memory [B]": memory_per_object(
+            lambda _i: CampaignStatsDetailSubscriber.from_trusted_dict(emails[_i], STATS_SUBSCRIBER_DATA),
+        ),
+    }
+
+
+if __name__ == "__main__":
+    for name, value in run().items():
+        print(f"{name:<45}{value:>10.2f}")
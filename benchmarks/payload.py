@@ -0,0 +1,93 @@
+"""
+Bulk payload building benchmark, time and peak memory of buffered and streamed encoding.
+Run with `python -m benchmarks.payload`.
+"""
+from __future__ import annotations
+
+import gc
+import tracemalloc
+from json import dumps
+from typing import Any, Callable, Iterable
+
+from benchmarks.models import SUBSCRIBER_DATA, time_per_call
+from ecomail.bulk import BULK_LIMIT, iter_bulk_payload
+from ecomail.service import EcoMailOptions, EcoMailService
+from ecomail.subscriber import Subscriber
+
+
+NUMBER = 20  # Payloads built in single timing run.
+LARGE_TAGS = 50  # Tags of every subscriber in memory benchmark.
+
+
+def peak_memory(func: Callable[[], Any]) -> float:
+    """
+    Returns peak memory allocated during call in KiB.
+    """
+    gc.collect()
+    tracemalloc.start()
+    try:
+        func()
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    return peak / 1024
+
+
+def encode_buffered(subscribers: list[Subscriber]) -> None:
+    """
+    Encodes payload as a whole, the same way as requests encodes `json` parameter.
+    """
+    data = {"subscriber_data": [_s.as_dict() for _s in subscribers], "update_existing": True}
+    _ = dumps(data, allow_nan=False).encode("utf-8")
+
+
+def consume(chunks: Iterable[bytes]) -> None:
+    """
+    Reads streamed payload chunk by chunk, like connection sending it.
+    """
+    for _ in chunks:
+        pass
+
+
+def run() -> dict[str, float]:
+    """
+    Runs benchmarks. Returns mapping of benchmark names to results.
+    """
+    subscribers = [Subscriber.from_dict({**SUBSCRIBER_DATA, "email": f"user{_i}@example.com"}) for _i in range(BULK_LIMIT)]
+    tagged = [
+        Subscriber.from_dict({**SUBSCRIBER_DATA, "email": f"user{_i}@example.com", "tags": [f"tag{_t}" for _t in range(LARGE_TAGS)]})
+        for _i in range(BULK_LIMIT)
+    ]
+    service = EcoMailService(options=EcoMailOptions(base_url="https://example.com", api_key="key"))
+
+    # noinspection PyUnusedLocal
+    def encode_payload(
+        endpoint: str,
+        json: dict[str, Any] | None = None,
+        idempotent: bool = False,
+        template: str | None = None,
+        body: Callable[[], Iterable[bytes]] | None = None,
+    ) -> None:
+        consume(body())
+
+    service._call_post = encode_payload  # Payload is built and encoded, but not sent.
+    with service:
+        return {
+            "bulk_payload.build [ms]": time_per_call(
+                lambda: [_s.as_dict() for _s in subscribers],
+                number=NUMBER,
+            ) / 1000,
+            "bulk_payload.build_and_encode [ms]": time_per_call(
+                lambda: service._call_add_bulk_subscribers_to_list(1, subscribers),
+                number=NUMBER,
+            ) / 1000,
+            "bulk_payload.buffered_peak_memory [KiB]": peak_memory(lambda: encode_buffered(tagged)),
+            "bulk_payload.streamed_peak_memory [KiB]": peak_memory(
+                lambda: consume(iter_bulk_payload(_s.as_dict() for _s in tagged)),
+            ),
+        }
+
+
+if __name__ == "__main__":
+    for name, value in run().items():
+        print(f"{name:<45}{value:>10.2f}")
@@ -0,0 +1,47 @@
+"""
+End-to-end benchmark of paginated campaign stats detail against local fake server.
+Run with `python -m benchmarks.stats`.
+"""
+from __future__ import annotations
+
+import time
+
+from ecomail.service import EcoMailOptions, EcoMailService
+from ecomail.testing import FakeEcoMailServer, FakeServerOptions
+
+
+SUBSCRIBERS = 50_000
+PER_PAGE = 1000
+REPEAT = 3  # Best of runs is reported.
+
+
+def time_stats_detail(server: FakeEcoMailServer, max_workers: int, repeat: int = REPEAT) -> float:
+    """
+    Returns best time of fetching whole stats detail of campaign in seconds.
+    """
+    options = EcoMailOptions(base_url=server.url, api_key="key", rate_limit_calls=None)
+    timings = []
+    with EcoMailService(options=options) as service:
+        for _ in range(repeat):
+            started_at = time.perf_counter()
+            stats = service.get_campaigns_stats_detail(campaign_id=1, max_workers=max_workers)
+            timings.append(time.perf_counter() - started_at)
+            assert len(stats.subscribers) == SUBSCRIBERS
+    return min(timings)
+
+
+def run() -> dict[str, float]:
+    """
+    Runs benchmarks. Returns mapping of benchmark names to results.
+    """
+    options = FakeServerOptions(stats_subscribers=SUBSCRIBERS, stats_per_page=PER_PAGE, rate_limit_calls=None)
+    with FakeEcoMailServer(options) as server:
+        return {
+            "stats_detail.sequential [s]": time_stats_detail(server, max_workers=1),
+            "stats_detail.4_workers [s]": time_stats_detail(server, max_workers=4),
+        }
+
+
+if __name__ == "__main__":
+    for name, value in run().items():
+        print(f"{name:<45}{value:>10.2f}")
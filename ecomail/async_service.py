@@ -0,0 +1,850 @@
+from __future__ import annotations
+
+import asyncio
+import time
+from collections import deque
+from types import TracebackType
+from typing import Any, AsyncIterator, Callable, Iterable
+from urllib.parse import urljoin
+
+try:
+    import httpx
+except ImportError:  # pragma: no cover
+    httpx = None  # Optional dependency, install with `pip install ecomail[async]`.
+
+from ecomail.bulk import (
+    BULK_LIMIT,
+    DEFAULT_MAX_POLL_INTERVAL,
+    DEFAULT_POLL_INTERVAL,
+    DEFAULT_WAIT_TIMEOUT,
+    BulkChunkResult,
+    BulkImportResult,
+    BulkJob,
+    iter_bulk_payload,
+)
+from ecomail.cache import CACHE_CAMPAIGNS, CACHE_SUBSCRIBER, ResponseCache
+from ecomail.campaign import Campaign, CampaignStatus
+from ecomail.campaign_stats_detail import (
+    CampaignStatsDetail,
+    CampaignStatsDetailColumns,
+    CampaignStatsDetailSubscriber,
+    CampaignStatsResult,
+)
+from ecomail.decoding import STREAM_CHUNK_SIZE, StatsDetailPageDecoder
+from ecomail.exceptions import ApiConnectionError, ApiRequestError, EcoMailError
+from ecomail.service import (
+    DEFAULT_MAX_WORKERS,
+    EcoMailOptions,
+    _BaseService,
+    _body_factory,
+    _bulk_job_queues,
+    _bulk_update_data,
+    _campaign_from_response,
+    _CampaignPages,
+    _campaigns_by_size,
+    _check_bulk_limit,
+    _chunk_result,
+    _collect_to,
+    _created_id,
+    _mapping,
+    _stats_detail_page,
+    _StatsFanOut,
+    _StatsPages,
+    _subscriber_from_response,
+    _SubscriberLookup,
+    _update_bulk_job,
+)
+from ecomail.subscriber import Subscriber, SubscriberLookupResult
+from ecomail.utils import chunked
+
+
+class AsyncEcoMailService(_BaseService):
+    """
+    Asyncio connection service for EcoMail API. Mirrors public methods of EcoMailService.
+    Docs: https://ecomailappapiv2.docs.apiary.io/#
+    API is rate-limited 1000 calls for an API key per minute.
+    Other request will be throttled with 429 return code and a Retry-After header.
+
+    All coroutines of the service share one connection pool and one rate limiter.
+    Call close() or use service as async context manager to release pooled connections.
+    Responses of campaigns list and subscriber details can be cached, see EcoMailOptions.cache_ttls.
+    Requires httpx package.
+    """
+    _client: httpx.AsyncClient
+
+    def __init__(self, options: EcoMailOptions) -> None:
+        if httpx is None:
+            raise ImportError("AsyncEcoMailService requires httpx package, install ecomail[async].")
+        super().__init__(options)
+        self._client = httpx.AsyncClient(
+            headers={"key": options.api_key},  # Authentication required.
+            timeout=options.default_timeout,
+            follow_redirects=True,
+            limits=httpx.Limits(
+                max_connections=options.pool_maxsize,
+                max_keepalive_connections=options.pool_maxsize if options.keep_alive else 0,
+            ),
+        )
+
+    async def __aenter__(self) -> AsyncEcoMailService:
+        return self
+
+    async def __aexit__(
+        self,
+        exc_type: type[BaseException] | None,
+        exc_val: BaseException | None,
+        exc_tb: TracebackType | None,
+    ) -> None:
+        await self.close()
+
+    async def close(self) -> None:
+        """
+        Closes all pooled connections. Service cannot be used after closing.
+        """
+        await self._client.aclose()
+
+    async def add_new_list(
+        self,
+        name: str,
+        from_name: str,
+        from_email: str,
+        reply_to: str | None = None,
+    ) -> int:
+        """
+        Creates new list of subscribers. Returns ID of newly created list.
+        """
+        response = await self._call_add_new_list(
+            name=name,
+            from_name=from_name,
+            from_email=from_email,
+            reply_to=reply_to or from_email,  # Reply to from_email by default.
+        )
+        return _created_id(response.json(), "List")
+
+    async def add_new_subscriber_to_list(
+        self,
+        list_id: int,
+        subscriber: Subscriber,
+        trigger_autoresponders: bool = False,
+    ) -> int:
+        """
+        Adds new subscriber to given list. Updates data if subscriber already exists.
+        Does not force resubscribe. Returns ID of newly created subscriber.
+        """
+        response = await self._call_add_new_subscriber_to_list(
+            list_id=list_id,
+            subscriber=subscriber,
+            trigger_autoresponders=trigger_autoresponders
+        )
+        return _created_id(response.json(), "Subscriber")
+
+    async def add_bulk_subscribers_to_list(
+        self,
+        list_id: int,
+        subscribers: list[Subscriber],
+    ) -> BulkJob | None:
+        """
+        Adds new subscribers in bulk to given list. Updates existing subscribers.
+        Bulk endpoint is limited to 3000 subscribers, subscribers over 3000 will be ignored.
+        Returns handle of import job processed by API in background, see wait_for_bulk_jobs().
+        None if API returned no job ID.
+        """
+        _check_bulk_limit(len(subscribers))
+        response = await self._call_add_bulk_subscribers_to_list(list_id, subscribers)
+        return BulkJob.from_body(list_id, len(subscribers), response.content)
+
+    async def import_subscribers_to_list(
+        self,
+        list_id: int,
+        subscribers: Iterable[Subscriber],
+        max_workers: int = DEFAULT_MAX_WORKERS,
+        chunk_size: int = BULK_LIMIT,
+        on_chunk: Callable[[BulkChunkResult, list[Subscriber]], None] | None = None,
+        skip_chunk: Callable[[int, list[Subscriber]], BulkChunkResult | None] | None = None,
+    ) -> BulkImportResult:
+        """
+        Adds any number of subscribers to given list. Updates existing subscribers.
+        Subscribers are split into bulk calls of at most 3000 subscribers, up to `max_workers`
+        calls are sent at once. Iterable is consumed lazily, only chunks in flight are held in memory.
+        Failed chunks do not stop the import, they are reported in result.
+        `on_chunk` is called with result and subscribers of every finished chunk.
+        `skip_chunk` is called with index and subscribers of every chunk before it is sent. If it returns
+        result, eg. of chunk sent by interrupted import, chunk is not sent and the result is reported instead.
+        """
+        if not 0 < chunk_size <= BULK_LIMIT:
+            raise ApiRequestError("Bulk endpoint is limited to 3000 subscribers.")
+
+        results: list[BulkChunkResult] = []
+        pending: dict[asyncio.Task[BulkChunkResult], list[Subscriber]] = {}
+
+        def collect(tasks: Iterable[asyncio.Task[BulkChunkResult]]) -> None:
+            for task in tasks:
+                chunk = pending.pop(task)
+                results.append(result := task.result())
+                if on_chunk is not None:
+                    on_chunk(result, chunk)
+
+        for index, chunk in enumerate(chunked(subscribers, chunk_size)):
+            if skip_chunk is not None and (skipped := skip_chunk(index, chunk)) is not None:
+                results.append(skipped)
+                continue
+            if len(pending) >= max_workers:
+                done, _ = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+                collect(done)
+            pending[asyncio.ensure_future(self._import_chunk(list_id, index, chunk))] = chunk
+        if pending:
+            collect((await asyncio.wait(pending))[0])
+        return BulkImportResult(chunks=sorted(results, key=lambda _r: _r.index))
+
+    async def refresh_bulk_job(self, job: BulkJob) -> BulkJob:
+        """
+        Updates status of bulk import job. Returns the same handle.
+        Job status endpoint is not part of documented API, see EcoMailService.refresh_bulk_job().
+        """
+        response = await self._call_get_bulk_job_status(job.list_id, job.job_id)
+        return _update_bulk_job(job, response.content)
+
+    async def wait_for_bulk_jobs(
+        self,
+        jobs: Iterable[BulkJob],
+        timeout: float = DEFAULT_WAIT_TIMEOUT,
+        poll_interval: float = DEFAULT_POLL_INTERVAL,
+        max_poll_interval: float = DEFAULT_MAX_POLL_INTERVAL,
+    ) -> list[BulkJob]:
+        """
+        Waits until given bulk import jobs are finished, or until timeout (1 hour by default).
+        Returns jobs still pending. Raises ApiConnectionError if status of a job cannot be read.
+        Job status endpoint is not part of documented API and may not be available, see refresh_bulk_job().
+        Polls the same way as EcoMailService.wait_for_bulk_jobs(), oldest pending job of each
+        list is polled concurrently in every round.
+        """
+        queues = _bulk_job_queues(jobs)
+
+        async def poll_list(queue: deque[BulkJob]) -> bool:
+            finished = False
+            while queue and (await self.refresh_bulk_job(queue[0])).finished:
+                queue.popleft()
+                finished = True
+            return finished
+
+        deadline = time.monotonic() + timeout
+        interval = poll_interval
+        while queues:
+            delay = min(interval, deadline - time.monotonic())
+            if delay > 0:
+                await asyncio.sleep(delay)
+            finished = any(await asyncio.gather(*(poll_list(_q) for _q in queues.values())))
+            queues = {_l: _q for _l, _q in queues.items() if _q}
+            if time.monotonic() >= deadline:
+                break
+            interval = poll_interval if finished else min(max_poll_interval, interval * 2)
+        return [_j for _q in queues.values() for _j in _q]
+
+    async def get_campaigns_list(self) -> list[Campaign]:
+        """
+        Returns list of campaigns from all pages.
+        """
+        return [_c async for _c in self.iter_campaigns()]
+
+    async def iter_campaigns(
+        self,
+        since_id: int | None = None,
+        include_ids: Iterable[int] = (),
+    ) -> AsyncIterator[Campaign]:
+        """
+        Yields campaigns page by page. Plain list returned by API is a single page.
+        With `since_id`, only campaigns with higher ID or with ID in `include_ids` are parsed
+        and yielded. If pages are ordered from the newest campaign, paging stops at page reaching
+        `since_id` and `include_ids` not seen yet are fetched one by one, deleted ones are skipped.
+        """
+        pages = _CampaignPages(since_id, include_ids)
+        page = 1
+        while True:
+            campaigns, next_page = pages.parse((await self._call_get_campaigns_list_page(page)).json())
+            for campaign in campaigns:
+                yield campaign
+            if pages.stopped:
+                for campaign_id in sorted(pages.remaining):
+                    try:
+                        campaign = await self.get_campaign(campaign_id)
+                    except ApiConnectionError as exc:
+                        if exc.status_code != 404:
+                            raise
+                        continue  # Campaign was deleted.
+                    yield campaign
+                return
+            if not next_page:
+                return
+            page += 1
+
+    async def get_campaign(self, campaign_id: int) -> Campaign:
+        """
+        Returns campaign with given ID.
+        """
+        response = await self._call_get_campaign(campaign_id)
+        return _campaign_from_response(response.json())
+
+    async def get_campaigns_stats_detail(self, campaign_id: int, max_workers: int = 1) -> CampaignStatsDetail:
+        """
+        Returns detailed statistics of campaign.
+        With `max_workers` over 1, total and page size are read from the first page
+        and remaining pages are fetched concurrently. Subscribers are returned in page order.
+        """
+        stats = CampaignStatsDetail(subscribers=[])
+        async for page_subscribers in self.iter_campaign_stats_detail_pages(campaign_id, max_workers):
+            stats.subscribers.extend(page_subscribers)
+        return stats
+
+    async def get_campaign_stats_detail_columns(
+        self,
+        campaign_id: int,
+        max_workers: int = 1,
+    ) -> CampaignStatsDetailColumns:
+        """
+        Returns detailed statistics of campaign in compact columnar representation.
+        Pages are added to columns as they arrive, see iter_campaign_stats_detail_pages().
+        """
+        columns = CampaignStatsDetailColumns()
+        async for page_subscribers in self.iter_campaign_stats_detail_pages(campaign_id, max_workers):
+            columns.extend(page_subscribers)
+        return columns
+
+    async def iter_campaign_stats_detail(
+        self,
+        campaign_id: int,
+        max_workers: int = 1,
+    ) -> AsyncIterator[CampaignStatsDetailSubscriber]:
+        """
+        Yields subscribers of detailed statistics of campaign as pages arrive.
+        Only pages being fetched or consumed are held in memory.
+        """
+        async for page_subscribers in self.iter_campaign_stats_detail_pages(campaign_id, max_workers):
+            for subscriber in page_subscribers:
+                yield subscriber
+
+    async def iter_campaign_stats_detail_pages(
+        self,
+        campaign_id: int,
+        max_workers: int = 1,
+        start_page: int = 1,
+    ) -> AsyncIterator[list[CampaignStatsDetailSubscriber]]:
+        """
+        Yields subscribers of detailed statistics of campaign page by page, in page order.
+        Pages are fetched concurrently if `max_workers` is over 1 and first page contains
+        total and page size. At most `max_workers` pages are fetched ahead of consumer,
+        so memory stays proportional to page size.
+        Pages before `start_page` are skipped, eg. to resume interrupted processing.
+        """
+        json_data, page_subscribers = await self._get_campaign_stats_detail_page(campaign_id, start_page)
+        yield page_subscribers
+
+        pages = _StatsPages(json_data, start_page, len(page_subscribers))
+        if max_workers > 1 and pages.following is not None:
+            async for page_subscribers in self._prefetch_campaign_stats_detail_pages(
+                campaign_id,
+                pages.following,
+                max_workers,
+            ):
+                yield page_subscribers
+            return
+
+        while (page := pages.next_page(json_data)) is not None:
+            json_data, page_subscribers = await self._get_campaign_stats_detail_page(campaign_id, page)
+            pages.page_done(len(page_subscribers))
+            yield page_subscribers
+
+    async def iter_campaigns_stats_detail(
+        self,
+        campaign_ids: Iterable[int] | None = None,
+        statuses: Iterable[CampaignStatus] | None = None,
+        max_workers: int = DEFAULT_MAX_WORKERS,
+    ) -> AsyncIterator[CampaignStatsResult]:
+        """
+        Collects detailed statistics of many campaigns concurrently. Yields result of every campaign
+        as soon as all its pages are fetched. Campaigns are given by IDs, or selected from campaigns
+        list by status, all campaigns by default.
+        Up to `max_workers` pages of all campaigns are fetched at once under the shared rate limiter.
+        Campaigns with fewer recipients are fetched first, so their results arrive early, and pages
+        of started campaigns take precedence over first pages of following ones.
+        Failed campaign does not stop the others, its error is reported in result.
+        """
+        campaigns = [_c async for _c in self.iter_campaigns()]
+        fan_out = _StatsFanOut(_campaigns_by_size(campaigns, campaign_ids, statuses))
+
+        pending: dict[asyncio.Task[tuple[dict[str, Any], list[CampaignStatsDetailSubscriber]]], tuple[int, int]] = {}
+        try:
+            while True:
+                while len(pending) < max_workers and (item := fan_out.next_page()) is not None:
+                    pending[asyncio.ensure_future(self._get_campaign_stats_detail_page(*item))] = item
+                if not pending:
+                    break
+                done, _ = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+                for task in done:
+                    campaign_id, page = pending.pop(task)
+                    try:
+                        result = fan_out.page_done(campaign_id, page, *task.result())
+                    except EcoMailError as exc:
+                        result = fan_out.page_failed(campaign_id, exc)
+                    if result is not None:
+                        yield result
+        finally:
+            # Do not fetch pages nobody will consume, eg. on error or closed iterator.
+            for task in pending:
+                task.cancel()
+
+    async def get_subscriber_details(self, list_id: int, subscriber_email: str) -> Subscriber:
+        """
+        Returns details of subscriber from given list.
+        """
+        response = await self._call_get_subscriber_details(list_id, subscriber_email)
+        return _subscriber_from_response(response.json())
+
+    async def get_subscribers_details(
+        self,
+        list_id: int,
+        emails: Iterable[str],
+        max_workers: int = DEFAULT_MAX_WORKERS,
+    ) -> SubscriberLookupResult:
+        """
+        Returns details of many subscribers from given list. Duplicate emails are looked up once.
+        Up to `max_workers` lookups are sent at once, all of them wait for rate limiter.
+        Missing subscribers and failed lookups do not stop the batch, they are reported in result.
+        """
+        lookup = _SubscriberLookup(emails)
+        pending: dict[asyncio.Task[Subscriber], str] = {}
+
+        def collect(tasks: Iterable[asyncio.Task[Subscriber]]) -> None:
+            for task in tasks:
+                email = pending.pop(task)
+                try:
+                    lookup.found(email, task.result())
+                except EcoMailError as exc:
+                    lookup.failed(email, exc)
+
+        for email in lookup.emails:
+            if len(pending) >= max_workers:
+                done, _ = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+                collect(done)
+            pending[asyncio.ensure_future(self.get_subscriber_details(list_id, email))] = email
+        if pending:
+            collect((await asyncio.wait(pending))[0])
+        return lookup.result()
+
+    async def update_subscriber(self, list_id: int, subscriber_email: str, data: dict[str, Any]) -> None:
+        """
+        Updates subscriber data in given list.
+        """
+        _ = await self._call_update_subscriber(list_id, subscriber_email, data)
+
+    async def update_subscribers(self, list_id: int, updates: dict[str, dict[str, Any]]) -> None:
+        """
+        Updates data of subscribers in given list in single bulk call. Maps emails to data.
+        Bulk endpoint is limited to 3000 subscribers. Emails not in the list are subscribed.
+        """
+        _ = await self._call_add_bulk_subscriber_data_to_list(list_id, _bulk_update_data(updates))
+
+    async def _get_campaign_stats_detail_page(
+        self,
+        campaign_id: int,
+        page: int,
+    ) -> tuple[dict[str, Any], list[CampaignStatsDetailSubscriber]]:
+        """
+        Returns fields and subscribers of page of campaign statistics,
+        see EcoMailService._get_campaign_stats_detail_page.
+        """
+        if not self._options.stream_stats_pages:
+            return _stats_detail_page((await self._call_get_campaigns_stats_detail_page(campaign_id, page)).content)
+
+        subscribers: list[CampaignStatsDetailSubscriber] = []
+        decoder = StatsDetailPageDecoder(_collect_to(subscribers))
+        response = await self._call_get_campaigns_stats_detail_page(campaign_id, page, stream=True)
+        try:
+            async for chunk in response.aiter_bytes(STREAM_CHUNK_SIZE):
+                decoder.feed(chunk)
+        finally:
+            await response.aclose()
+        return decoder.close(), subscribers
+
+    async def _prefetch_campaign_stats_detail_pages(
+        self,
+        campaign_id: int,
+        pages: range,
+        max_workers: int,
+    ) -> AsyncIterator[list[CampaignStatsDetailSubscriber]]:
+        """
+        Fetches given pages of campaign statistics concurrently. Yields them in page order.
+        """
+        async def fetch_page(page: int) -> list[CampaignStatsDetailSubscriber]:
+            return (await self._get_campaign_stats_detail_page(campaign_id, page))[1]
+
+        pending: deque[asyncio.Task[list[CampaignStatsDetailSubscriber]]] = deque()
+        try:
+            for page in pages:
+                pending.append(asyncio.ensure_future(fetch_page(page)))
+                if len(pending) >= max_workers:
+                    yield await pending.popleft()
+            while pending:
+                yield await pending.popleft()
+        finally:
+            # Do not fetch pages nobody will consume, eg. on error or closed iterator.
+            for task in pending:
+                task.cancel()
+
+    async def _import_chunk(self, list_id: int, index: int, subscribers: list[Subscriber]) -> BulkChunkResult:
+        """
+        Sends single chunk of bulk import. Returns result instead of raising API errors.
+        """
+        try:
+            response = await self._call_add_bulk_subscribers_to_list(list_id, subscribers)
+        except EcoMailError as exc:
+            return BulkChunkResult(index=index, count=len(subscribers), error=exc)
+        return _chunk_result(list_id, index, len(subscribers), response.content)
+
+    # region Private methods to call API endpoints.
+    async def _call_add_new_list(
+        self,
+        name: str,
+        from_name: str,
+        from_email: str,
+        reply_to: str,
+    ) -> httpx.Response:
+        """
+        Calls "Lists/List Collections/Add new list" api endpoint.
+        https://ecomailappapiv2.docs.apiary.io/#reference/lists/list-collections/add-new-list
+        """
+        endpoint_path = "lists"
+        data = {
+            "name": name,
+            "from_name": from_name,
+            "from_email": from_email,
+            "reply_to": reply_to,
+        }
+        return await self._call_post(endpoint=endpoint_path, json=data)
+
+    async def _call_add_new_subscriber_to_list(
+        self,
+        list_id: int,
+        subscriber: Subscriber,
+        trigger_autoresponders: bool,
+    ) -> httpx.Response:
+        """
+        Calls "Lists/List subscribe/Add new subscriber to list" api endpoint.
+        https://ecomailappapiv2.docs.apiary.io/#reference/lists/list-subscribe/add-new-subscriber-to-list
+        """
+        endpoint_template = "lists/{list_id}/subscribe"
+        endpoint_path = endpoint_template.format(list_id=list_id)
+        data = {
+            "subscriber_data": subscriber.as_dict(),
+            "update_existing": True,
+            "resubscribe": False,
+            # Trigger automations after subscribe.
+            "trigger_autoresponders": trigger_autoresponders,
+            # Skip double opt-in.
+            "skip_confirmation": True,
+        }
+        try:
+            # Subscribe updates existing subscriber without resubscribe, it is safe to repeat.
+            return await self._call_post(endpoint=endpoint_path, json=data, idempotent=True, template=endpoint_template)
+        finally:
+            self._invalidate_subscriber_cache(list_id, [subscriber.email])
+
+    async def _call_add_bulk_subscribers_to_list(
+        self,
+        list_id: int,
+        subscribers: list[Subscriber],
+    ) -> httpx.Response:
+        """
+        Calls "Lists/List subscribe bulk/Add bulk subscribers to list" api endpoint.
+        https://ecomailappapiv2.docs.apiary.io/#reference/lists/list-subscribe-bulk/add-bulk-subscribers-to-list
+        """
+        return await self._call_subscribe_bulk(
+            list_id,
+            [_s.email for _s in subscribers],
+            lambda: (_s.as_dict() for _s in subscribers),
+        )
+
+    async def _call_add_bulk_subscriber_data_to_list(
+        self,
+        list_id: int,
+        subscriber_data: list[dict[str, Any]],
+    ) -> httpx.Response:
+        """
+        Calls "Lists/List subscribe bulk/Add bulk subscribers to list" api endpoint with raw
+        subscriber data. Every item must contain email, other fields are optional.
+        https://ecomailappapiv2.docs.apiary.io/#reference/lists/list-subscribe-bulk/add-bulk-subscribers-to-list
+        """
+        return await self._call_subscribe_bulk(
+            list_id,
+            [_d["email"] for _d in subscriber_data],
+            lambda: subscriber_data,
+        )
+
+    async def _call_subscribe_bulk(
+        self,
+        list_id: int,
+        emails: list[str],
+        subscriber_data: Callable[[], Iterable[dict[str, Any]]],
+    ) -> httpx.Response:
+        """
+        Calls "Lists/List subscribe bulk/Add bulk subscribers to list" api endpoint,
+        see EcoMailService._call_subscribe_bulk().
+        """
+        endpoint_template = "lists/{list_id}/subscribe-bulk"
+        endpoint_path = endpoint_template.format(list_id=list_id)
+        try:
+            # Bulk subscribe updates existing subscribers, it is safe to repeat.
+            # Payload is encoded incrementally and streamed, so it is never held in memory as a whole.
+            return await self._call_post(
+                endpoint=endpoint_path,
+                idempotent=True,
+                template=endpoint_template,
+                body=lambda: iter_bulk_payload(subscriber_data()),
+            )
+        finally:
+            self._invalidate_subscriber_cache(list_id, emails)
+
+    async def _call_get_bulk_job_status(self, list_id: int, job_id: int) -> httpx.Response:
+        """
+        Calls bulk import job status endpoint, see EcoMailService._call_get_bulk_job_status().
+        """
+        endpoint_template = "lists/{list_id}/subscribe-bulk/{job_id}"
+        endpoint_path = endpoint_template.format(list_id=list_id, job_id=job_id)
+        return await self._call_get(endpoint=endpoint_path, query={}, template=endpoint_template)
+
+    async def _call_get_campaigns_list_page(self, page: int = 1) -> httpx.Response:
+        """
+        Calls "Campaigns/List campaigns/List campaigns" api endpoint.
+        https://ecomailappapiv2.docs.apiary.io/#reference/campaigns/campaigns-collection/list-all-campaigns
+        """
+        endpoint_path = "campaigns"
+        query = {"page": page} if page > 1 else {}  # First page is cached under plain endpoint.
+        return await self._call_get(endpoint=endpoint_path, query=query, cache=CACHE_CAMPAIGNS)
+
+    async def _call_get_campaign(self, campaign_id: int) -> httpx.Response:
+        """
+        Calls "Campaigns/Campaign detail" api endpoint.
+        https://ecomailappapiv2.docs.apiary.io/#reference/campaigns/campaign/campaign-detail
+        """
+        endpoint_template = "campaigns/{campaign_id}"
+        endpoint_path = endpoint_template.format(campaign_id=campaign_id)
+        return await self._call_get(endpoint=endpoint_path, query={}, template=endpoint_template)
+
+    async def _call_get_campaigns_stats_detail_page(
+        self,
+        campaign_id: int,
+        page: int,
+        stream: bool = False,
+    ) -> httpx.Response:
+        """
+        Calls "Campaigns/Campaign stats/Get campaign stats" api endpoint.
+        https://ecomailappapiv2.docs.apiary.io/#reference/campaigns/get-campaign-stats-detail/get-campaign-stats-detail
+        """
+        endpoint_template = "campaigns/{campaign_id}/stats-detail"
+        endpoint_path = endpoint_template.format(campaign_id=campaign_id)
+        return await self._call_get(
+            endpoint=endpoint_path,
+            query={"page": page},
+            template=endpoint_template,
+            stream=stream,
+        )
+
+    async def _call_get_subscriber_details(self, list_id: int, subscriber_email: str) -> httpx.Response:
+        """
+        Calls "Lists/List subscribers/Get subscriber" api endpoint.
+        https://ecomailappapiv2.docs.apiary.io/#reference/lists/list-subscribe/get-subscriber
+        """
+        endpoint_template = "lists/{list_id}/subscriber/{subscriber_email}"
+        endpoint_path = endpoint_template.format(list_id=list_id, subscriber_email=subscriber_email)
+        return await self._call_get(
+            endpoint=endpoint_path,
+            query={},
+            cache=CACHE_SUBSCRIBER,
+            template=endpoint_template,
+        )
+
+    async def _call_update_subscriber(
+        self,
+        list_id: int,
+        subscriber_email: str,
+        data: dict[str, Any],
+    ) -> httpx.Response:
+        """
+        Calls "Lists/List subscribers/Update subscriber" api endpoint.
+        https://ecomailappapiv2.docs.apiary.io/#reference/lists/list-subscribe/update-subscriber
+        """
+        endpoint_template = "lists/{list_id}/update-subscriber"
+        endpoint_path = endpoint_template.format(list_id=list_id)
+        _d = {"email": subscriber_email, "subscriber_data": data}
+        try:
+            return await self._call_put(endpoint=endpoint_path, json=_d, template=endpoint_template)
+        finally:
+            self._invalidate_subscriber_cache(list_id, [subscriber_email])
+    # endregion
+
+    # region Generic API call methods.
+    async def _call_get(
+        self,
+        endpoint: str,
+        query: _mapping,
+        cache: str | None = None,
+        template: str | None = None,
+        stream: bool = False,
+    ) -> httpx.Response:
+        """
+        Generic GET api call with provided parameters. `template` is reported to observers.
+        Response is cached if TTL of given cache group is configured. Expired response is
+        revalidated with conditional request if API returned ETag or Last-Modified header.
+        With `stream`, body is not read before returning response and response is not cached.
+        """
+        ttl = self._cache_ttl(cache, stream)
+        if ttl is None:
+            return await self._call_api(
+                "GET",
+                endpoint=endpoint,
+                query=query,
+                idempotent=True,
+                template=template,
+                stream=stream,
+            )
+
+        key = ResponseCache.make_key(endpoint, query)
+        entry, fresh = self._cache.get(key)
+        if entry is not None and fresh:
+            return entry.value
+        response = await self._call_api(
+            "GET",
+            endpoint=endpoint,
+            query=query,
+            headers=entry.conditional_headers() if entry is not None else None,
+            idempotent=True,
+            template=template,
+        )
+        return self._cache_response(key, ttl, entry, response)
+
+    async def _call_post(
+        self,
+        endpoint: str,
+        json: _mapping | None = None,
+        idempotent: bool = False,
+        template: str | None = None,
+        body: _body_factory | None = None,
+    ) -> httpx.Response:
+        """
+        Generic POST api call with provided parameters. `template` is reported to observers.
+        POST is retried on errors only if caller marks it as idempotent.
+        Instead of `json`, encoded JSON can be streamed from chunks returned by `body`.
+        """
+        return await self._call_api(
+            "POST",
+            endpoint=endpoint,
+            json=json,
+            headers={"Content-Type": "application/json"} if body is not None else None,
+            idempotent=idempotent,
+            template=template,
+            body=body,
+        )
+
+    async def _call_put(self, endpoint: str, json: _mapping, template: str | None = None) -> httpx.Response:
+        """
+        Generic PUT api call with provided parameters. `template` is reported to observers.
+        """
+        return await self._call_api("PUT", endpoint=endpoint, json=json, idempotent=True, template=template)
+
+    async def _call_api(
+        self,
+        method: str,
+        endpoint: str,
+        query: _mapping | None = None,
+        json: _mapping | None = None,
+        headers: _mapping | None = None,
+        idempotent: bool = False,
+        template: str | None = None,
+        body: _body_factory | None = None,
+        stream: bool = False,
+    ) -> httpx.Response:
+        """
+        Generic api call with provided parameters. Follows the same rate limit, retry, observer
+        and streaming rules as EcoMailService._call_api, waiting without blocking the event loop.
+        Raises ApiConnectionError if response status is not OK.
+        """
+        started_at = time.monotonic()
+        attempt = 1
+        while True:
+            throttle_wait = self._rate_limiter.reserve() if self._rate_limiter is not None else 0.0
+            if throttle_wait > 0:
+                await asyncio.sleep(throttle_wait)
+            sent_at = time.monotonic()
+            streamed = [0]  # Bytes of streamed body.
+            try:
+                request = self._client.build_request(
+                    method,
+                    urljoin(self._options.base_url, endpoint),
+                    params=query,
+                    json=json,
+                    content=_async_counted(body(), streamed) if body is not None else None,
+                    headers=headers,
+                )
+                response = await self._client.send(request, stream=stream)
+            except httpx.TransportError as exc:
+                if self._options.observers:
+                    self._notify_attempt(
+                        method,
+                        template or endpoint,
+                        sent_at,
+                        attempt,
+                        throttle_wait,
+                        request_bytes=streamed[0] if body is not None else _request_size(exc),
+                        error=str(exc),
+                    )
+                # Call might have reached API, repeat only if it is safe.
+                delay = self._retry_delay(attempt, started_at) if idempotent else None
+                if delay is None:
+                    raise ApiConnectionError(str(exc)) from exc
+            else:
+                if self._options.observers:
+                    self._notify_attempt(
+                        method,
+                        template or endpoint,
+                        sent_at,
+                        attempt,
+                        throttle_wait,
+                        request_bytes=streamed[0] if body is not None else len(response.request.content),
+                        response=response,
+                        stream=stream,
+                    )
+                try:
+                    # Raise exception if response status is not OK. Unlike requests, httpx raises
+                    # on 304, which is a valid answer to conditional request.
+                    if response.status_code != 304:
+                        response.raise_for_status()
+                    return response
+                except httpx.HTTPStatusError as exc:
+                    delay = None
+                    if idempotent or response.status_code == 429:
+                        delay = self._retry_delay(attempt, started_at, response.status_code, response.headers)
+                    if delay is None:
+                        await response.aread()
+                        raise ApiConnectionError(response.text, status_code=response.status_code) from exc
+                await response.aclose()  # Release connection back to pool.
+            await asyncio.sleep(delay)
+            attempt += 1
+    # endregion
+
+
+async def _async_counted(chunks: Iterable[bytes], counter: list[int]) -> AsyncIterator[bytes]:
+    """
+    Yields chunks of streamed body, adding their size to counter.
+    """
+    for chunk in chunks:
+        counter[0] += len(chunk)
+        yield chunk
+
+
+def _request_size(exc: httpx.TransportError) -> int:
+    """
+    Returns size of body of failed request in bytes, 0 if request is not known.
+    """
+    try:
+        return len(exc.request.content)
+    except RuntimeError:  # Request is not set on exception.
+        return 0
@@ -0,0 +1,172 @@
+from __future__ import annotations
+
+import dataclasses
+import enum
+import json
+from typing import Any, Iterable, Iterator
+
+from ecomail.decoding import loads
+from ecomail.exceptions import EcoMailError
+from ecomail.utils import chunked
+
+
+BULK_LIMIT = 3000  # Max subscribers in single bulk call.
+DEFAULT_POLL_INTERVAL = 1  # 1s, first wait for bulk jobs.
+DEFAULT_MAX_POLL_INTERVAL = 30  # 30s, wait grows up to this while no job finishes.
+DEFAULT_WAIT_TIMEOUT = 3600  # 1h, waiting for bulk jobs gives up after this.
+PAYLOAD_BATCH_SIZE = 100  # Subscribers encoded at once into chunk of streamed bulk payload.
+
+_encode = json.JSONEncoder(allow_nan=False, separators=(",", ":")).encode
+
+
+class BulkJobStatus(enum.Enum):
+    """
+    Enum representing status of bulk import job.
+    """
+    PENDING = "pending"
+    DONE = "done"
+    FAILED = "failed"
+
+    @classmethod
+    def from_api(cls, value: str | None) -> BulkJobStatus:
+        """
+        Maps job status returned by API. Raises ValueError if status is missing or unknown,
+        so a job is never polled forever because of unexpected response.
+        """
+        normalized = value.lower() if isinstance(value, str) else None
+        if normalized in ("done", "finished", "completed", "success"):
+            return cls.DONE
+        if normalized in ("failed", "error", "errored"):
+            return cls.FAILED
+        if normalized in ("pending", "queued", "waiting", "processing", "running", "in_progress"):
+            return cls.PENDING
+        raise ValueError(f"Unknown bulk job status: {value!r}.")
+
+
+@dataclasses.dataclass(kw_only=True, eq=False, slots=True)
+class BulkJob:
+    """
+    Handle of bulk import job processed by API in background. Requires keyword arguments.
+    Status is updated by EcoMailService.refresh_bulk_job() and wait_for_bulk_jobs().
+    """
+    list_id: int
+    job_id: int
+    count: int  # Number of subscribers in job.
+    status: BulkJobStatus = BulkJobStatus.PENDING
+
+    @property
+    def finished(self) -> bool:
+        """
+        True if job is done or failed.
+        """
+        return self.status is not BulkJobStatus.PENDING
+
+    @classmethod
+    def from_response(cls, list_id: int, count: int, data: dict[str, Any]) -> BulkJob | None:
+        """
+        Creates handle from response of bulk endpoint. Returns None if response contains no job ID.
+        """
+        job_id = data.get("job_id")
+        if job_id is None:
+            return None
+        return cls(list_id=list_id, job_id=int(job_id), count=count)
+
+    @classmethod
+    def from_body(cls, list_id: int, count: int, body: bytes) -> BulkJob | None:
+        """
+        Creates handle from raw body of bulk endpoint response. The call was accepted by API,
+        so body that is not JSON object with valid job ID is treated as no job ID, returns None.
+        """
+        try:
+            data = loads(body)
+            return cls.from_response(list_id, count, data) if isinstance(data, dict) else None
+        except (ValueError, TypeError):
+            return None
+
+
+@dataclasses.dataclass(kw_only=True, frozen=True)
+class BulkChunkResult:
+    """
+    Result of single bulk call. Requires keyword arguments. Frozen class (values cannot be reassigned).
+    """
+    index: int  # Position of chunk in import, starting with 0.
+    count: int  # Number of subscribers in chunk.
+    job_id: int | None = None  # Import job ID returned by API.
+    job: BulkJob | None = None  # Handle of import job.
+    error: EcoMailError | None = None
+
+    @property
+    def ok(self) -> bool:
+        """
+        True if chunk was accepted by API.
+        """
+        return self.error is None
+
+
+@dataclasses.dataclass(kw_only=True, frozen=True)
+class BulkImportResult:
+    """
+    Summary of bulk import split into chunks. Requires keyword arguments. Frozen class (values cannot be reassigned).
+    """
+    chunks: list[BulkChunkResult]  # Ordered by chunk index.
+
+    @property
+    def ok(self) -> bool:
+        """
+        True if all chunks were accepted by API.
+        """
+        return all(_c.ok for _c in self.chunks)
+
+    @property
+    def total(self) -> int:
+        """
+        Number of subscribers sent to API.
+        """
+        return sum(_c.count for _c in self.chunks)
+
+    @property
+    def imported(self) -> int:
+        """
+        Number of subscribers in chunks accepted by API.
+        """
+        return sum(_c.count for _c in self.chunks if _c.ok)
+
+    @property
+    def failed_chunks(self) -> list[BulkChunkResult]:
+        """
+        Chunks rejected by API.
+        """
+        return [_c for _c in self.chunks if not _c.ok]
+
+    @property
+    def job_ids(self) -> list[int]:
+        """
+        Import job IDs of accepted chunks.
+        """
+        return [_c.job_id for _c in self.chunks if _c.job_id is not None]
+
+    @property
+    def jobs(self) -> list[BulkJob]:
+        """
+        Import job handles of accepted chunks, see EcoMailService.wait_for_bulk_jobs().
+        """
+        return [_c.job for _c in self.chunks if _c.job is not None]
+
+
+def iter_bulk_payload(
+    subscriber_data: Iterable[dict[str, Any]],
+    update_existing: bool = True,
+    batch_size: int = PAYLOAD_BATCH_SIZE,
+) -> Iterator[bytes]:
+    """
+    Encodes body of bulk subscribe call incrementally. Yields UTF-8 encoded JSON in chunks,
+    one per batch of `batch_size` subscribers. Iterable is consumed lazily, only current batch
+    is held in memory.
+    """
+    yield b'{"subscriber_data":['
+    separator = ""
+    for batch in chunked(subscriber_data, batch_size):
+        # Encoding batch at once is much faster than encoding items one by one.
+        yield (separator + _encode(batch)[1:-1]).encode()
+        separator = ","
+    yield f'],"update_existing":{"true" if update_existing else "false"}}}'.encode()
@@ -0,0 +1,116 @@
+from __future__ import annotations
+
+import dataclasses
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Callable, Mapping
+
+
+DEFAULT_CACHE_MAX_SIZE = 1024  # Cached responses.
+
+CACHE_CAMPAIGNS = "campaigns"
+"""Cache group of campaigns list endpoint."""
+CACHE_SUBSCRIBER = "subscriber"
+"""Cache group of subscriber details endpoint."""
+
+
+@dataclasses.dataclass(kw_only=True, frozen=True, slots=True)
+class CacheEntry:
+    """
+    Cached value with expiry and validators for conditional requests. Requires keyword arguments.
+    Frozen class (values cannot be reassigned).
+    """
+    value: Any
+    expires_at: float
+    etag: str | None = None
+    last_modified: str | None = None
+
+    def conditional_headers(self) -> dict[str, str]:
+        """
+        Returns headers for conditional revalidation of entry. Empty if entry has no validators.
+        """
+        headers = {}
+        if self.etag:
+            headers["If-None-Match"] = self.etag
+        if self.last_modified:
+            headers["If-Modified-Since"] = self.last_modified
+        return headers
+
+
+class ResponseCache:
+    """
+    Thread-safe LRU cache of API responses with per-entry expiry.
+    Expired entries are kept while they can be revalidated by conditional request,
+    least recently used entries are evicted when cache is full.
+    """
+    _max_size: int
+    _entries: OrderedDict[str, CacheEntry]
+    _clock: Callable[[], float]
+    _lock: threading.Lock
+
+    def __init__(self, max_size: int = DEFAULT_CACHE_MAX_SIZE, clock: Callable[[], float] = time.monotonic) -> None:
+        self._max_size = max_size
+        self._entries = OrderedDict()
+        self._clock = clock
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    @staticmethod
+    def make_key(endpoint: str, query: Mapping[str, Any] | None = None) -> str:
+        """
+        Returns cache key of endpoint called with given query.
+        """
+        if not query:
+            return endpoint
+        return endpoint + "?" + "&".join(f"{_k}={_v}" for _k, _v in sorted(query.items()))
+
+    def get(self, key: str) -> tuple[CacheEntry | None, bool]:
+        """
+        Returns entry of key and whether it is still fresh.
+        Expired entry is returned only if it can be revalidated.
+        """
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None, False
+            fresh = entry.expires_at > self._clock()
+            if not fresh and not (entry.etag or entry.last_modified):
+                del self._entries[key]
+                return None, False
+            self._entries.move_to_end(key)
+            return entry, fresh
+
+    def set(
+        self,
+        key: str,
+        value: Any,
+        ttl: float,
+        etag: str | None = None,
+        last_modified: str | None = None,
+    ) -> None:
+        """
+        Stores value for `ttl` seconds. Evicts least recently used entries over max size.
+        """
+        entry = CacheEntry(value=value, expires_at=self._clock() + ttl, etag=etag, last_modified=last_modified)
+        with self._lock:
+            self._entries[key] = entry
+            self._entries.move_to_end(key)
+            while len(self._entries) > self._max_size:
+                self._entries.popitem(last=False)
+
+    def invalidate(self, key: str) -> None:
+        """
+        Removes entry of key, if cached.
+        """
+        with self._lock:
+            self._entries.pop(key, None)
+
+    def clear(self) -> None:
+        """
+        Removes all entries.
+        """
+        with self._lock:
+            self._entries.clear()
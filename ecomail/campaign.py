@@ -4,6 +4,8 @@ import dataclasses
 import datetime
 import enum
 
+from ecomail.utils import slot_setters
+
 
 class CampaignStatus(enum.Enum):
     """
@@ -16,8 +18,15 @@ class CampaignStatus(enum.Enum):
     ERRORED = 4
     SCHEDULED = 7
 
+    @property
+    def is_final(self) -> bool:
+        """
+        True if campaign in this status cannot change anymore.
+        """
+        return self in (CampaignStatus.SENT, CampaignStatus.ERRORED)
 
-@dataclasses.dataclass(kw_only=True, frozen=True)
+
+@dataclasses.dataclass(kw_only=True, frozen=True, slots=True)
 class Campaign:
     """
     Campaign data. Requires keyword arguments. Frozen class (values cannot be reassigned).
@@ -48,3 +57,37 @@ class Campaign:
             recipients=int(data["recipients"]),
             status=CampaignStatus(int(data["status"])),
         )
+
+    @classmethod
+    def from_trusted_dict(cls, data: dict[str, str]) -> Campaign:
+        """
+        Creates Campaign object from dict returned by API.
+        Fast path, skips dataclass __init__. Use only for valid data.
+        """
+        obj = object.__new__(cls)
+        set_id, set_from_name, set_from_email, set_reply_to, set_title, set_subject, set_sent_at, \
+            set_recipients, set_status = _CAMPAIGN_SETTERS
+        set_id(obj, int(data["id"]))
+        set_from_name(obj, data["from_name"])
+        set_from_email(obj, data["from_email"])
+        set_reply_to(obj, data["reply_to"])
+        set_title(obj, data["title"])
+        set_subject(obj, data["subject"])
+        set_sent_at(obj, datetime.datetime.fromisoformat(data["sent_at"]) if data["sent_at"] else None)
+        set_recipients(obj, int(data["recipients"]))
+        set_status(obj, CampaignStatus(int(data["status"])))
+        return obj
+
+
+_CAMPAIGN_SETTERS = slot_setters(
+    Campaign,
+    "id",
+    "from_name",
+    "from_email",
+    "reply_to",
+    "title",
+    "subject",
+    "sent_at",
+    "recipients",
+    "status",
+)
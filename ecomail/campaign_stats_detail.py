@@ -1,17 +1,48 @@
 from __future__ import annotations
 
+import array
 import dataclasses
+import heapq
+import itertools
+from typing import Iterable, Iterator
 
+from ecomail.exceptions import EcoMailError
+from ecomail.utils import slot_setters
 
-@dataclasses.dataclass(kw_only=True, frozen=True)
+
+@dataclasses.dataclass(kw_only=True, frozen=True, slots=True)
 class CampaignStatsDetail:
     """
     Campaign statistics detail data. Requires keyword arguments. Frozen class (values cannot be reassigned).
     """
     subscribers: list[CampaignStatsDetailSubscriber]
 
+    def to_columns(self) -> CampaignStatsDetailColumns:
+        """
+        Returns subscribers in compact columnar representation.
+        """
+        return CampaignStatsDetailColumns.from_subscribers(self.subscribers)
+
 
 @dataclasses.dataclass(kw_only=True, frozen=True)
+class CampaignStatsResult:
+    """
+    Detailed statistics of one of many campaigns collected at once, or error of its collection.
+    Requires keyword arguments. Frozen class (values cannot be reassigned).
+    """
+    campaign_id: int
+    stats: CampaignStatsDetail | None = None
+    error: EcoMailError | None = None
+
+    @property
+    def ok(self) -> bool:
+        """
+        True if all pages of statistics were fetched.
+        """
+        return self.error is None
+
+
+@dataclasses.dataclass(kw_only=True, frozen=True, slots=True)
 class CampaignStatsDetailSubscriber:
     """
     Subscriber detail data for campaign statistics. Requires keyword arguments. Frozen class (values cannot be reassigned).
@@ -32,3 +63,155 @@ class CampaignStatsDetailSubscriber:
             send=int(data["send"]),
             click=int(data["click"]),
         )
+
+    @classmethod
+    def from_trusted_dict(cls, email: str, data: dict[str, str]) -> CampaignStatsDetailSubscriber:
+        """
+        Creates CampaignStatsDetailSubscriber object from dict returned by API.
+        Fast path, skips dataclass __init__. Use only for valid data.
+        """
+        obj = object.__new__(cls)
+        set_email, set_open, set_send, set_click = _STATS_SUBSCRIBER_SETTERS
+        set_email(obj, email)
+        set_open(obj, int(data["open"]))
+        set_send(obj, int(data["send"]))
+        set_click(obj, int(data["click"]))
+        return obj
+
+    @classmethod
+    def list_from_dict(cls, data: dict[str, dict[str, str]]) -> list[CampaignStatsDetailSubscriber]:
+        """
+        Creates list of CampaignStatsDetailSubscriber objects from dict returned by API,
+        mapping emails to data. Uses fast path of from_trusted_dict().
+        """
+        from_trusted_dict = cls.from_trusted_dict
+        return [from_trusted_dict(_e, _d) for _e, _d in data.items()]
+
+
+_STATS_SUBSCRIBER_SETTERS = slot_setters(CampaignStatsDetailSubscriber, "email", "open", "send", "click")
+
+
+def _counter_array() -> array.array:
+    """
+    Returns empty array of unsigned int counters.
+    """
+    return array.array("I")
+
+
+@dataclasses.dataclass(kw_only=True)
+class CampaignStatsDetailColumns:
+    """
+    Columnar campaign statistics detail data. Requires keyword arguments.
+    Stores emails in list and counters in compact integer arrays, which is much smaller than
+    list of CampaignStatsDetailSubscriber objects. Aggregates run on arrays without creating rows,
+    rows are created on demand.
+    """
+    emails: list[str] = dataclasses.field(default_factory=list)
+    opens: array.array = dataclasses.field(default_factory=_counter_array)
+    sends: array.array = dataclasses.field(default_factory=_counter_array)
+    clicks: array.array = dataclasses.field(default_factory=_counter_array)
+
+    @classmethod
+    def from_subscribers(cls, subscribers: Iterable[CampaignStatsDetailSubscriber]) -> CampaignStatsDetailColumns:
+        """
+        Creates columns from subscriber rows.
+        """
+        columns = cls()
+        columns.extend(subscribers)
+        return columns
+
+    def __len__(self) -> int:
+        return len(self.emails)
+
+    def __getitem__(self, index: int) -> CampaignStatsDetailSubscriber:
+        return CampaignStatsDetailSubscriber(
+            email=self.emails[index],
+            open=self.opens[index],
+            send=self.sends[index],
+            click=self.clicks[index],
+        )
+
+    def __iter__(self) -> Iterator[CampaignStatsDetailSubscriber]:
+        for email, open_, send, click in zip(self.emails, self.opens, self.sends, self.clicks):
+            yield CampaignStatsDetailSubscriber(email=email, open=open_, send=send, click=click)
+
+    def append(self, subscriber: CampaignStatsDetailSubscriber) -> None:
+        """
+        Appends subscriber row to columns.
+        """
+        self.emails.append(subscriber.email)
+        self.opens.append(subscriber.open)
+        self.sends.append(subscriber.send)
+        self.clicks.append(subscriber.click)
+
+    def extend(self, subscribers: Iterable[CampaignStatsDetailSubscriber]) -> None:
+        """
+        Appends subscriber rows to columns.
+        """
+        for subscriber in subscribers:
+            self.append(subscriber)
+
+    @property
+    def total_opens(self) -> int:
+        """
+        Sum of opens of all subscribers.
+        """
+        return sum(self.opens)
+
+    @property
+    def total_sends(self) -> int:
+        """
+        Sum of sends of all subscribers.
+        """
+        return sum(self.sends)
+
+    @property
+    def total_clicks(self) -> int:
+        """
+        Sum of clicks of all subscribers.
+        """
+        return sum(self.clicks)
+
+    @property
+    def open_rate(self) -> float:
+        """
+        Ratio of subscribers who opened campaign to subscribers it was sent to.
+        """
+        return self._rate(self.opens)
+
+    @property
+    def click_rate(self) -> float:
+        """
+        Ratio of subscribers who clicked in campaign to subscribers it was sent to.
+        """
+        return self._rate(self.clicks)
+
+    def top_clickers(self, n: int) -> list[CampaignStatsDetailSubscriber]:
+        """
+        Returns `n` subscribers with most clicks, ordered by clicks descending.
+        """
+        return [self[_i] for _i in heapq.nlargest(n, range(len(self)), key=self.clicks.__getitem__)]
+
+    def filter(self, min_open: int = 0, min_send: int = 0, min_click: int = 0) -> CampaignStatsDetailColumns:
+        """
+        Returns new columns with subscribers meeting all given thresholds.
+        """
+        selectors = [
+            _o >= min_open and _s >= min_send and _c >= min_click
+            for _o, _s, _c in zip(self.opens, self.sends, self.clicks)
+        ]
+        columns = CampaignStatsDetailColumns(emails=list(itertools.compress(self.emails, selectors)))
+        columns.opens.extend(itertools.compress(self.opens, selectors))
+        columns.sends.extend(itertools.compress(self.sends, selectors))
+        columns.clicks.extend(itertools.compress(self.clicks, selectors))
+        return columns
+
+    def _rate(self, counters: array.array) -> float:
+        """
+        Ratio of non-zero counters to subscribers with non-zero sends. Zero if nothing was sent.
+        """
+        # array.count runs in C, no Python objects are created per row.
+        sent = len(self.sends) - self.sends.count(0)
+        if sent == 0:
+            return 0.0
+        return (len(counters) - counters.count(0)) / sent
@@ -0,0 +1,170 @@
+from __future__ import annotations
+
+import dataclasses
+import logging
+import threading
+from types import TracebackType
+from typing import TYPE_CHECKING, Any, Callable
+
+from ecomail.bulk import BULK_LIMIT
+from ecomail.utils import chunked
+
+if TYPE_CHECKING:
+    from ecomail.service import EcoMailService
+
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_MAX_DELAY = 5  # 5s.
+
+
+@dataclasses.dataclass(kw_only=True, frozen=True, slots=True)
+class UpdateResult:
+    """
+    Result of buffered subscriber update. Requires keyword arguments. Frozen class (values cannot be reassigned).
+    """
+    list_id: int
+    email: str
+    error: Exception | None = None  # EcoMailError if rejected by API.
+
+    @property
+    def ok(self) -> bool:
+        """
+        True if update was accepted by API.
+        """
+        return self.error is None
+
+
+class UpdateCoalescer:
+    """
+    Buffers subscriber updates per list and sends them in bulk instead of one call per update.
+    Repeated updates of the same email are merged, later values win. Buffer of a list is flushed
+    through bulk subscribe endpoint when it reaches `max_batch_size` emails, buffers of all lists
+    are flushed `max_delay` seconds after first buffered update, on flush() and on close().
+
+    Note that bulk subscribe adds emails not yet subscribed to the list, unlike update_subscriber().
+    Results of every flush are passed to `on_flush` callback, explicit flush() also returns them.
+    Emails rejected by API or failed with any other error (eg. data not serializable to JSON) are
+    reported in results. Errors of the callback are logged, they do not fail the flush.
+    """
+    _service: EcoMailService
+    _max_batch_size: int
+    _max_delay: float | None
+    _on_flush: Callable[[list[UpdateResult]], None] | None
+    _buffers: dict[int, dict[str, dict[str, Any]]]
+    _buffer_lock: threading.Lock
+    _send_lock: threading.Lock
+    _timer: threading.Timer | None
+
+    def __init__(
+        self,
+        service: EcoMailService,
+        max_batch_size: int = BULK_LIMIT,
+        max_delay: float | None = DEFAULT_MAX_DELAY,
+        on_flush: Callable[[list[UpdateResult]], None] | None = None,
+    ) -> None:
+        if not 0 < max_batch_size <= BULK_LIMIT:
+            raise ValueError("Batch size must be between 1 and 3000.")
+        self._service = service
+        self._max_batch_size = max_batch_size
+        self._max_delay = max_delay
+        self._on_flush = on_flush
+        self._buffers = {}
+        self._buffer_lock = threading.Lock()
+        self._send_lock = threading.Lock()
+        self._timer = None
+
+    def __enter__(self) -> UpdateCoalescer:
+        return self
+
+    def __exit__(
+        self,
+        exc_type: type[BaseException] | None,
+        exc_val: BaseException | None,
+        exc_tb: TracebackType | None,
+    ) -> None:
+        self.close()
+
+    @property
+    def pending(self) -> int:
+        """
+        Number of buffered emails waiting for flush.
+        """
+        with self._buffer_lock:
+            return sum(len(_b) for _b in self._buffers.values())
+
+    def update(self, list_id: int, subscriber_email: str, data: dict[str, Any]) -> None:
+        """
+        Buffers update of subscriber data in given list. Merges with pending update of the same email.
+        """
+        with self._buffer_lock:
+            buffer = self._buffers.setdefault(list_id, {})
+            buffer.setdefault(subscriber_email, {}).update(data)
+            full = len(buffer) >= self._max_batch_size
+            if not full and self._timer is None and self._max_delay is not None:
+                self._timer = threading.Timer(self._max_delay, self._flush_in_background)
+                self._timer.daemon = True
+                self._timer.start()
+        if full:
+            self._flush_buffers(list_id)
+
+    def flush(self) -> list[UpdateResult]:
+        """
+        Sends all buffered updates. Returns result of every sent email.
+        """
+        return self._flush_buffers()
+
+    def close(self) -> list[UpdateResult]:
+        """
+        Flushes buffered updates. Coalescer can be used again after closing.
+        """
+        return self.flush()
+
+    def _flush_in_background(self) -> None:
+        """
+        Flushes buffers from timer thread. Errors are logged, there is no caller to raise them to.
+        """
+        try:
+            self.flush()
+        except Exception:
+            logger.exception("Delayed flush of update coalescer failed.")
+
+    def _flush_buffers(self, list_id: int | None = None) -> list[UpdateResult]:
+        """
+        Sends buffered updates of given list, or of all lists if list is not given.
+        Returns result of every sent email and passes it to on_flush callback.
+        """
+        # Buffers are taken and sent under the same lock, so older data of an email
+        # is never sent after newer data.
+        with self._send_lock:
+            with self._buffer_lock:
+                if list_id is None:
+                    buffers, self._buffers = self._buffers, {}
+                    if self._timer is not None:
+                        self._timer.cancel()
+                        self._timer = None
+                else:
+                    buffers = {list_id: self._buffers.pop(list_id, {})}
+            results = self._send(buffers)
+        if results and self._on_flush is not None:
+            try:
+                self._on_flush(results)
+            except Exception:
+                logger.exception("Flush callback of update coalescer failed.")
+        return results
+
+    def _send(self, buffers: dict[int, dict[str, dict[str, Any]]]) -> list[UpdateResult]:
+        """
+        Sends buffered updates through bulk endpoint. Returns result of every email.
+        Any error of a call is reported in results, so buffers of other lists are still sent.
+        """
+        results: list[UpdateResult] = []
+        for list_id, buffer in buffers.items():
+            for chunk in chunked(buffer.items(), self._max_batch_size):
+                try:
+                    self._service.update_subscribers(list_id, dict(chunk))
+                except Exception as exc:
+                    results.extend(UpdateResult(list_id=list_id, email=_e, error=exc) for _e, _ in chunk)
+                else:
+                    results.extend(UpdateResult(list_id=list_id, email=_e) for _e, _ in chunk)
+        return results
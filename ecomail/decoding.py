@@ -0,0 +1,183 @@
+from __future__ import annotations
+
+import codecs
+import json
+import re
+from json.decoder import scanstring
+from typing import Any, Callable, Iterable
+
+try:
+    import orjson
+except ImportError:  # pragma: no cover
+    orjson = None  # Optional dependency, install with `pip install ecomail[fast]`.
+
+
+STREAM_CHUNK_SIZE = 64 * 1024  # 64 KiB, size of chunks read from response stream.
+
+_WHITESPACE = re.compile(r"[ \t\n\r]*")
+_OPEN = re.compile(r"[ \t\n\r]*\{[ \t\n\r]*")
+_COLON = re.compile(r"[ \t\n\r]*:[ \t\n\r]*")
+_SEPARATOR = re.compile(r"[ \t\n\r]*([,}])[ \t\n\r]*")
+_scan_once = json.JSONDecoder().scan_once
+
+# Parser states.
+_START = 0
+_MEMBER = 1
+_SUBSCRIBERS_START = 2
+_SUBSCRIBER = 3
+_AFTER_VALUE = 4
+_DONE = 5
+
+
+def loads(data: bytes | str) -> Any:
+    """
+    Decodes JSON document. Uses orjson if installed, which is several times faster than json module.
+    """
+    if orjson is not None:
+        return orjson.loads(data)
+    return json.loads(data)
+
+
+class _Incomplete(Exception):
+    """
+    Buffer ends before parsed token.
+    """
+
+
+class StatsDetailPageDecoder:
+    """
+    Incremental decoder of page of campaign stats detail. Body of response is fed in chunks as it
+    arrives. Every entry of `subscribers` mapping is passed to `on_subscriber` with email and data
+    as soon as it is decoded, so the mapping is never held in memory as a whole. Other fields
+    of the page, eg. total and next_page_url, are returned by close().
+    Only the unfinished entry is buffered between chunks.
+    """
+    _on_subscriber: Callable[[str, dict[str, Any]], None]
+    _utf8: codecs.IncrementalDecoder
+    _buffer: str
+    _pos: int
+    _state: int
+    _fields: dict[str, Any]
+
+    def __init__(self, on_subscriber: Callable[[str, dict[str, Any]], None]) -> None:
+        self._on_subscriber = on_subscriber
+        self._utf8 = codecs.getincrementaldecoder("utf-8")()
+        self._buffer = ""
+        self._pos = 0
+        self._state = _START
+        self._fields = {}
+
+    def feed(self, data: bytes) -> None:
+        """
+        Decodes next chunk of body.
+        """
+        self._buffer = self._buffer[self._pos:] + self._utf8.decode(data)
+        self._pos = 0
+        self._parse(final=False)
+
+    def close(self) -> dict[str, Any]:
+        """
+        Finishes decoding. Returns fields of page except subscribers.
+        Raises ValueError if body is not complete valid page.
+        """
+        self._buffer = self._buffer[self._pos:] + self._utf8.decode(b"", final=True)
+        self._pos = 0
+        self._parse(final=True)
+        if _WHITESPACE.match(self._buffer, self._pos).end() != len(self._buffer):
+            raise json.JSONDecodeError("Extra data", self._buffer, self._pos)
+        return self._fields
+
+    def _parse(self, final: bool) -> None:
+        """
+        Parses buffer up to last complete token. Position is advanced only after whole token.
+        """
+        buffer = self._buffer
+        try:
+            while self._state != _DONE:
+                if self._state == _SUBSCRIBER:
+                    self._parse_subscribers(buffer)
+                    continue
+                pos = _WHITESPACE.match(buffer, self._pos).end()  # Whitespace might continue in next chunk.
+                if self._state == _START:
+                    match = _OPEN.match(buffer, pos)
+                    if match is None:
+                        raise _Incomplete
+                    pos = match.end()
+                    if buffer[pos] == "}":
+                        self._pos, self._state = pos + 1, _DONE
+                    else:
+                        self._pos, self._state = pos, _MEMBER
+                elif self._state == _MEMBER:
+                    if buffer[pos] != '"':
+                        raise _Incomplete
+                    key, pos = scanstring(buffer, pos + 1)
+                    match = _COLON.match(buffer, pos)
+                    if match is None:
+                        raise _Incomplete
+                    pos = match.end()
+                    if key == "subscribers" and buffer[pos] == "{":
+                        self._pos, self._state = _OPEN.match(buffer, pos).end(), _SUBSCRIBERS_START
+                        continue
+                    value, pos = _scan_once(buffer, pos)
+                    # Separator must follow, otherwise value (eg. number) might continue in next chunk.
+                    match = _SEPARATOR.match(buffer, pos)
+                    if match is None:
+                        raise _Incomplete
+                    self._fields[key] = value
+                    self._pos, self._state = match.end(), _MEMBER if match.group(1) == "," else _DONE
+                elif self._state == _SUBSCRIBERS_START:
+                    if buffer[pos] == "}":
+                        self._pos, self._state = pos + 1, _AFTER_VALUE
+                    else:
+                        self._state = _SUBSCRIBER
+                elif self._state == _AFTER_VALUE:
+                    # After subscribers mapping.
+                    match = _SEPARATOR.match(buffer, pos)
+                    if match is None:
+                        raise _Incomplete
+                    self._pos, self._state = match.end(), _MEMBER if match.group(1) == "," else _DONE
+        except (_Incomplete, IndexError, StopIteration, ValueError) as exc:
+            # Token is not complete, or is invalid. Invalid data is reported when there is no more data.
+            if final:
+                raise json.JSONDecodeError("Invalid stats detail page", buffer, self._pos) from exc
+
+    def _parse_subscribers(self, buffer: str) -> None:
+        """
+        Parses entries of subscribers mapping. Hot loop, every entry is parsed at once.
+        """
+        on_subscriber = self._on_subscriber
+        separator = _SEPARATOR.match
+        colon = _COLON.match
+        pos = self._pos
+        while True:
+            if buffer[pos] != '"':
+                pos = _WHITESPACE.match(buffer, pos).end()
+                if buffer[pos] != '"':
+                    raise _Incomplete
+            email, end = scanstring(buffer, pos + 1)
+            match = colon(buffer, end)
+            if match is None:
+                raise _Incomplete
+            data, end = _scan_once(buffer, match.end())
+            match = separator(buffer, end)
+            if match is None:
+                raise _Incomplete
+            on_subscriber(email, data)
+            self._pos = pos = match.end()
+            if match.group(1) == "}":
+                self._state = _AFTER_VALUE
+                return
+
+
+def decode_stats_detail_page(
+    chunks: Iterable[bytes],
+    on_subscriber: Callable[[str, dict[str, Any]], None],
+) -> dict[str, Any]:
+    """
+    Decodes page of campaign stats detail from chunks of body, see StatsDetailPageDecoder.
+    Returns fields of page except subscribers.
+    """
+    decoder = StatsDetailPageDecoder(on_subscriber)
+    for chunk in chunks:
+        decoder.feed(chunk)
+    return decoder.close()
@@ -0,0 +1,221 @@
+from __future__ import annotations
+
+import logging
+import threading
+import time
+from collections import deque
+from types import TracebackType
+from typing import TYPE_CHECKING, Any, Callable
+
+from ecomail.bulk import BULK_LIMIT
+from ecomail.coalescer import UpdateResult
+from ecomail.exceptions import QueueFullError
+
+if TYPE_CHECKING:
+    from ecomail.service import EcoMailService
+    from ecomail.subscriber import Subscriber
+
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_MAX_QUEUE_SIZE = 10_000  # Operations queued at once.
+DEFAULT_DISPATCH_WORKERS = 2
+DEFAULT_MAX_DELAY = 0.1  # 100ms, wait for batch to fill.
+
+BACKPRESSURE_BLOCK = "block"  # Wait for free space, up to `timeout` seconds.
+BACKPRESSURE_RAISE = "raise"  # Raise QueueFullError at once.
+BACKPRESSURE_MODES = (BACKPRESSURE_BLOCK, BACKPRESSURE_RAISE)
+
+_operation = tuple[int, str, dict[str, Any]]  # List ID, email and data.
+
+
+class WriteBehindDispatcher:
+    """
+    Sends subscribe and update calls in background. Operations are queued in bounded in-memory
+    queue and the calling thread returns at once. Worker threads drain the queue in batches
+    through bulk subscribe endpoint. Operations of the same email are always handled by the same
+    worker in order, repeated operations of an email in one batch are merged, later values win.
+    A worker sends its batch when it reaches `max_batch_size` operations, `max_delay` seconds
+    after its oldest operation was queued, or at once on flush() and close().
+
+    When queue holds `max_queue_size` operations, `backpressure` decides what happens to next one:
+    "block" waits for free space, up to `timeout` seconds if given, then raises QueueFullError,
+    "raise" raises QueueFullError at once.
+
+    Note that bulk subscribe adds emails not yet subscribed to the list and does not trigger
+    autoresponders. Results of emails that could not be sent, rejected by API or failed with any
+    other error (eg. data not serializable to JSON), are passed to `on_error` callback, called
+    from worker thread. Errors of the callback are logged, they do not stop the worker.
+    """
+    _service: EcoMailService
+    _max_queue_size: int
+    _backpressure: str
+    _timeout: float | None
+    _max_batch_size: int
+    _max_delay: float
+    _on_error: Callable[[list[UpdateResult]], None] | None
+    _queues: list[deque[tuple[float, _operation]]]  # Queue of every worker, with time of queueing.
+    _queued: int
+    _in_flight: int  # Operations taken by workers and not sent yet.
+    _flushing: int  # Callers waiting in flush().
+    _condition: threading.Condition
+    _workers: list[threading.Thread]
+    _closed: bool
+
+    def __init__(
+        self,
+        service: EcoMailService,
+        max_workers: int = DEFAULT_DISPATCH_WORKERS,
+        max_queue_size: int = DEFAULT_MAX_QUEUE_SIZE,
+        backpressure: str = BACKPRESSURE_BLOCK,
+        timeout: float | None = None,
+        max_batch_size: int = BULK_LIMIT,
+        max_delay: float = DEFAULT_MAX_DELAY,
+        on_error: Callable[[list[UpdateResult]], None] | None = None,
+    ) -> None:
+        if backpressure not in BACKPRESSURE_MODES:
+            raise ValueError(f"Backpressure must be one of: {', '.join(BACKPRESSURE_MODES)}.")
+        if not 0 < max_batch_size <= BULK_LIMIT:
+            raise ValueError("Batch size must be between 1 and 3000.")
+        self._service = service
+        self._max_queue_size = max_queue_size
+        self._backpressure = backpressure
+        self._timeout = timeout
+        self._max_batch_size = max_batch_size
+        self._max_delay = max_delay
+        self._on_error = on_error
+        self._queues = [deque() for _ in range(max_workers)]
+        self._queued = 0
+        self._in_flight = 0
+        self._flushing = 0
+        self._condition = threading.Condition()
+        self._closed = False
+        self._workers = [
+            threading.Thread(target=self._work, args=(_q,), name=f"WriteBehindDispatcher-{_i}", daemon=True)
+            for _i, _q in enumerate(self._queues)
+        ]
+        for worker in self._workers:
+            worker.start()
+
+    def __enter__(self) -> WriteBehindDispatcher:
+        return self
+
+    def __exit__(
+        self,
+        exc_type: type[BaseException] | None,
+        exc_val: BaseException | None,
+        exc_tb: TracebackType | None,
+    ) -> None:
+        self.close()
+
+    @property
+    def pending(self) -> int:
+        """
+        Number of operations queued or being sent.
+        """
+        with self._condition:
+            return self._queued + self._in_flight
+
+    def subscribe(self, list_id: int, subscriber: Subscriber) -> None:
+        """
+        Queues adding subscriber to given list. Updates data if subscriber already exists.
+        """
+        self._put(list_id, subscriber.email, subscriber.as_dict())
+
+    def update(self, list_id: int, subscriber_email: str, data: dict[str, Any]) -> None:
+        """
+        Queues update of subscriber data in given list.
+        """
+        self._put(list_id, subscriber_email, dict(data))  # Copy, caller may change data before it is sent.
+
+    def flush(self, timeout: float | None = None) -> bool:
+        """
+        Sends queued operations without waiting for batches to fill and waits until they are sent.
+        Returns False if operations are still pending after timeout.
+        """
+        with self._condition:
+            self._flushing += 1
+            self._condition.notify_all()
+            try:
+                return self._condition.wait_for(lambda: not self._queued and not self._in_flight, timeout)
+            finally:
+                self._flushing -= 1
+
+    def close(self) -> None:
+        """
+        Sends queued operations and stops workers. No operations can be queued after closing.
+        """
+        with self._condition:
+            self._closed = True
+            self._condition.notify_all()
+        for worker in self._workers:
+            worker.join()
+
+    def _put(self, list_id: int, email: str, data: dict[str, Any]) -> None:
+        """
+        Queues operation to queue of worker of the email. Applies backpressure if queue is full.
+        """
+        with self._condition:
+            if self._queued >= self._max_queue_size and not self._closed:
+                if self._backpressure == BACKPRESSURE_RAISE:
+                    raise QueueFullError("Write-behind queue is full.")
+                if not self._condition.wait_for(
+                    lambda: self._queued < self._max_queue_size or self._closed,
+                    self._timeout,
+                ):
+                    raise QueueFullError("Write-behind queue is full.")
+            if self._closed:
+                raise RuntimeError("Cannot queue operations to closed dispatcher.")
+            queue = self._queues[hash((list_id, email)) % len(self._queues)]
+            queue.append((time.monotonic(), (list_id, email, data)))
+            self._queued += 1
+            self._condition.notify_all()
+
+    def _work(self, queue: deque[tuple[float, _operation]]) -> None:
+        """
+        Worker loop, sends batches of its queue until dispatcher is closed and queue is empty.
+        """
+        while True:
+            with self._condition:
+                while True:
+                    wait = None
+                    if queue:
+                        wait = queue[0][0] + self._max_delay - time.monotonic()
+                        if wait <= 0 or len(queue) >= self._max_batch_size or self._flushing or self._closed:
+                            break
+                    elif self._closed:
+                        return
+                    self._condition.wait(timeout=wait)
+                batch = [queue.popleft()[1] for _ in range(min(len(queue), self._max_batch_size))]
+                self._queued -= len(batch)
+                self._in_flight += len(batch)
+                self._condition.notify_all()  # Queue has free space.
+
+            try:
+                failed = self._send(batch)
+                if failed and self._on_error is not None:
+                    try:
+                        self._on_error(failed)
+                    except Exception:
+                        logger.exception("Error callback of write-behind dispatcher failed.")
+            finally:
+                with self._condition:
+                    self._in_flight -= len(batch)
+                    self._condition.notify_all()
+
+    def _send(self, batch: list[_operation]) -> list[UpdateResult]:
+        """
+        Sends batch through bulk endpoint, one call per list. Returns results of emails not sent.
+        Any error of a call is reported in results, so it does not stop the worker.
+        """
+        lists: dict[int, dict[str, dict[str, Any]]] = {}
+        for list_id, email, data in batch:
+            lists.setdefault(list_id, {}).setdefault(email, {}).update(data)
+
+        failed: list[UpdateResult] = []
+        for list_id, updates in lists.items():
+            try:
+                self._service.update_subscribers(list_id, updates)
+            except Exception as exc:
+                failed.extend(UpdateResult(list_id=list_id, email=_e, error=exc) for _e in updates)
+        return failed
@@ -1,3 +1,6 @@
+from __future__ import annotations
+
+
 class EcoMailError(Exception):
     """
     Generic EcoMail service exception.
@@ -6,8 +9,13 @@ class EcoMailError(Exception):
 
 class ApiConnectionError(EcoMailError):
     """
-    Service connection error.
+    Service connection error. `status_code` is HTTP status of error response, None if no response was received.
     """
+    status_code: int | None
+
+    def __init__(self, message: str = "", status_code: int | None = None) -> None:
+        super().__init__(message)
+        self.status_code = status_code
 
 
 class ApiRequestError(EcoMailError):
@@ -20,3 +28,9 @@ class SubscriberError(EcoMailError):
     """
     Subscriber error.
     """
+
+
+class QueueFullError(EcoMailError):
+    """
+    Queue of write-behind dispatcher is full.
+    """
@@ -0,0 +1,157 @@
+from __future__ import annotations
+
+import csv
+import dataclasses
+import gzip
+import io
+import json
+import os
+from typing import Iterable
+
+from ecomail.campaign_stats_detail import CampaignStatsDetailSubscriber
+from ecomail.service import EcoMailService
+from ecomail.utils import write_json_atomic
+
+
+EXPORT_CSV = "csv"
+EXPORT_NDJSON = "ndjson"
+EXPORT_FORMATS = (EXPORT_CSV, EXPORT_NDJSON)
+
+CSV_HEADER = ("campaign_id", "email", "open", "send", "click")
+CHECKPOINT_SUFFIX = ".checkpoint"
+
+
+@dataclasses.dataclass(kw_only=True, frozen=True)
+class ExportResult:
+    """
+    Summary of finished export. Requires keyword arguments. Frozen class (values cannot be reassigned).
+    """
+    path: str
+    campaigns: int  # Number of exported campaigns.
+    rows: int  # Number of exported subscriber rows, including rows written before resume.
+    resumed: bool  # True if export continued from checkpoint.
+
+
+def export_campaign_stats(
+    service: EcoMailService,
+    campaign_ids: Iterable[int],
+    path: str | os.PathLike[str],
+    export_format: str | None = None,
+    compress: bool | None = None,
+    resume: bool = False,
+    max_workers: int = 1,
+) -> ExportResult:
+    """
+    Streams detailed statistics of given campaigns page by page into single CSV or NDJSON file,
+    one row per campaign subscriber. Memory stays proportional to page size.
+
+    Format and gzip compression are guessed from file name (eg. "stats.csv.gz") unless given.
+    Progress is saved to checkpoint file next to output after every page. With `resume`,
+    interrupted export of the same campaigns continues after last saved page, otherwise export
+    starts over. Compressed output is written as one gzip member per page, so it can be truncated
+    and appended on resume; gzip readers decompress the members as one stream.
+    Checkpoint is removed when export is finished.
+    """
+    path = os.fspath(path)
+    campaign_ids = list(campaign_ids)
+    name = path[:-3] if path.endswith(".gz") else path
+    if compress is None:
+        compress = path.endswith(".gz")
+    if export_format is None:
+        export_format = EXPORT_NDJSON if name.endswith((".ndjson", ".jsonl")) else EXPORT_CSV
+    if export_format not in EXPORT_FORMATS:
+        raise ValueError(f"Export format must be one of: {', '.join(EXPORT_FORMATS)}.")
+
+    checkpoint_path = path + CHECKPOINT_SUFFIX
+    checkpoint = {
+        "format": export_format,
+        "compress": compress,
+        "campaign_ids": campaign_ids,
+        "campaigns_done": 0,  # Campaigns exported completely.
+        "next_page": 1,  # Next page of current campaign.
+        "offset": 0,  # Size of output after last exported page.
+        "rows": 0,
+    }
+    resumed = False
+    if resume and os.path.exists(checkpoint_path) and os.path.exists(path):
+        saved = _read_checkpoint(checkpoint_path)
+        if any(saved[_k] != checkpoint[_k] for _k in ("format", "compress", "campaign_ids")):
+            raise ValueError("Checkpoint belongs to export of other campaigns or format.")
+        checkpoint, resumed = saved, True
+
+    with open(path, "r+b" if resumed else "wb") as f:
+        f.truncate(checkpoint["offset"])  # Drop data written after last checkpoint.
+        f.seek(checkpoint["offset"])
+        if not resumed and export_format == EXPORT_CSV:
+            _write(f, _encode_csv([CSV_HEADER]), compress)
+            checkpoint["offset"] = f.tell()
+            write_json_atomic(checkpoint_path, checkpoint)
+
+        for campaign_id in campaign_ids[checkpoint["campaigns_done"]:]:
+            pages = service.iter_campaign_stats_detail_pages(
+                campaign_id,
+                max_workers=max_workers,
+                start_page=checkpoint["next_page"],
+            )
+            for page_subscribers in pages:
+                if export_format == EXPORT_CSV:
+                    data = _encode_csv(_csv_rows(campaign_id, page_subscribers))
+                else:
+                    data = _encode_ndjson(campaign_id, page_subscribers)
+                _write(f, data, compress)
+                checkpoint["offset"] = f.tell()
+                checkpoint["rows"] += len(page_subscribers)
+                checkpoint["next_page"] += 1
+                write_json_atomic(checkpoint_path, checkpoint)
+            checkpoint["campaigns_done"] += 1
+            checkpoint["next_page"] = 1
+            write_json_atomic(checkpoint_path, checkpoint)
+
+    os.remove(checkpoint_path)
+    return ExportResult(path=path, campaigns=len(campaign_ids), rows=checkpoint["rows"], resumed=resumed)
+
+
+def _csv_rows(campaign_id: int, subscribers: list[CampaignStatsDetailSubscriber]) -> Iterable[tuple]:
+    """
+    Returns CSV rows of subscribers, in order of CSV_HEADER.
+    """
+    return ((campaign_id, _s.email, _s.open, _s.send, _s.click) for _s in subscribers)
+
+
+def _encode_csv(rows: Iterable[tuple]) -> bytes:
+    """
+    Returns rows as UTF-8 encoded CSV.
+    """
+    buffer = io.StringIO()
+    csv.writer(buffer, lineterminator="\n").writerows(rows)
+    return buffer.getvalue().encode()
+
+
+def _encode_ndjson(campaign_id: int, subscribers: list[CampaignStatsDetailSubscriber]) -> bytes:
+    """
+    Returns subscribers as UTF-8 encoded JSON objects, one per line.
+    """
+    return "".join(
+        json.dumps(
+            {"campaign_id": campaign_id, "email": _s.email, "open": _s.open, "send": _s.send, "click": _s.click},
+            separators=(",", ":"),
+        ) + "\n"
+        for _s in subscribers
+    ).encode()
+
+
+def _write(f: io.BufferedIOBase, data: bytes, compress: bool) -> None:
+    """
+    Writes data to output, as separate gzip member if compressed, and flushes it to disk.
+    """
+    f.write(gzip.compress(data, compresslevel=6, mtime=0) if compress else data)
+    f.flush()
+    os.fsync(f.fileno())
+
+
+def _read_checkpoint(checkpoint_path: str) -> dict:
+    """
+    Returns checkpoint of interrupted export.
+    """
+    with open(checkpoint_path, encoding="utf-8") as f:
+        return json.load(f)
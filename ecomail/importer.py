@@ -0,0 +1,98 @@
+from __future__ import annotations
+
+import hashlib
+import json
+import os
+from typing import Any, Iterable
+
+from ecomail.bulk import BULK_LIMIT, BulkChunkResult, BulkImportResult, BulkJob
+from ecomail.service import DEFAULT_MAX_WORKERS, EcoMailService
+from ecomail.subscriber import Subscriber
+from ecomail.utils import write_json_atomic
+
+
+def chunk_fingerprint(subscribers: list[Subscriber]) -> str:
+    """
+    Returns fingerprint of emails of chunk. Chunk of the same emails in the same order has equal fingerprint.
+    """
+    data = "\n".join(_s.email for _s in subscribers)
+    return hashlib.sha1(data.encode(), usedforsecurity=False).hexdigest()
+
+
+def import_subscribers_to_list(
+    service: EcoMailService,
+    list_id: int,
+    subscribers: Iterable[Subscriber],
+    checkpoint_path: str | os.PathLike[str],
+    resume: bool = False,
+    max_workers: int = DEFAULT_MAX_WORKERS,
+    chunk_size: int = BULK_LIMIT,
+) -> BulkImportResult:
+    """
+    Adds any number of subscribers to given list in bulk chunks, see EcoMailService.import_subscribers_to_list().
+    Every chunk acknowledged by API is journaled with its job ID to checkpoint file.
+
+    With `resume`, chunks journaled by interrupted import are not sent again and the import
+    continues with the rest, otherwise import starts over. Subscribers must be given in the same
+    order, chunk whose emails differ from journaled chunk is sent again. Result contains journaled
+    chunks as well, with handles of their jobs.
+    Checkpoint is removed when all chunks are acknowledged. If some chunks failed, it is kept,
+    so resumed import sends only failed and unsent chunks.
+    """
+    checkpoint_path = os.fspath(checkpoint_path)
+    checkpoint: dict[str, Any] = {
+        "list_id": list_id,
+        "chunk_size": chunk_size,
+        "chunks": [],  # Acknowledged chunks, with index, count, job_id and fingerprint.
+    }
+    if resume and os.path.exists(checkpoint_path):
+        saved = _read_checkpoint(checkpoint_path)
+        if any(saved[_k] != checkpoint[_k] for _k in ("list_id", "chunk_size")):
+            raise ValueError("Checkpoint belongs to import to other list or with other chunk size.")
+        checkpoint = saved
+    journal: dict[int, dict[str, Any]] = {_c["index"]: _c for _c in checkpoint["chunks"]}
+    write_json_atomic(checkpoint_path, checkpoint)
+
+    def skip_chunk(index: int, chunk: list[Subscriber]) -> BulkChunkResult | None:
+        entry = journal.get(index)
+        if entry is None or entry["fingerprint"] != chunk_fingerprint(chunk):
+            return None
+        job_id, count = entry["job_id"], entry["count"]
+        return BulkChunkResult(
+            index=index,
+            count=count,
+            job_id=job_id,
+            job=BulkJob(list_id=list_id, job_id=job_id, count=count) if job_id is not None else None,
+        )
+
+    def record_chunk(result: BulkChunkResult, chunk: list[Subscriber]) -> None:
+        if not result.ok:
+            return
+        journal[result.index] = {
+            "index": result.index,
+            "count": result.count,
+            "job_id": result.job_id,
+            "fingerprint": chunk_fingerprint(chunk),
+        }
+        checkpoint["chunks"] = list(journal.values())
+        write_json_atomic(checkpoint_path, checkpoint)
+
+    result = service.import_subscribers_to_list(
+        list_id,
+        subscribers,
+        max_workers=max_workers,
+        chunk_size=chunk_size,
+        on_chunk=record_chunk,
+        skip_chunk=skip_chunk,
+    )
+    if result.ok:
+        os.remove(checkpoint_path)
+    return result
+
+
+def _read_checkpoint(checkpoint_path: str) -> dict:
+    """
+    Returns checkpoint of interrupted import.
+    """
+    with open(checkpoint_path, encoding="utf-8") as f:
+        return json.load(f)
@@ -0,0 +1,174 @@
+from __future__ import annotations
+
+import dataclasses
+import math
+import threading
+from typing import Callable
+
+
+HISTOGRAM_MIN_VALUE = 1e-6  # 1us, smaller values share the first bucket.
+HISTOGRAM_GROWTH = 1.02  # Bucket bounds grow by 2%, which is the max relative error of percentiles.
+
+
+@dataclasses.dataclass(kw_only=True, frozen=True, slots=True)
+class RequestEvent:
+    """
+    Single attempt of API request. Requires keyword arguments. Frozen class (values cannot be reassigned).
+    """
+    method: str
+    endpoint: str  # Endpoint template, eg. "lists/{list_id}/subscribe".
+    status: int | None  # None if attempt failed on connection error.
+    duration: float  # Seconds from sending request to receiving whole response.
+    request_bytes: int  # Size of request body.
+    response_bytes: int  # Size of response body.
+    attempt: int  # 1 for first attempt, higher for retries.
+    throttle_wait: float  # Seconds waited for client-side rate limiter before attempt.
+    error: str | None = None  # Connection error message.
+
+    @property
+    def ok(self) -> bool:
+        """
+        True if API returned successful response.
+        """
+        return self.status is not None and self.status < 400
+
+
+RequestObserver = Callable[[RequestEvent], None]
+"""Callable receiving event of every request attempt, see EcoMailOptions.observers."""
+
+
+class Histogram:
+    """
+    Histogram of positive values with logarithmic buckets. Memory is bounded by range of values,
+    not by their count. Percentiles are approximated with relative error of HISTOGRAM_GROWTH.
+    Not thread-safe.
+    """
+    _buckets: dict[int, int]
+    _count: int
+    _total: float
+    _min: float
+    _max: float
+
+    def __init__(self) -> None:
+        self._buckets = {}
+        self._count = 0
+        self._total = 0.0
+        self._min = math.inf
+        self._max = 0.0
+
+    def __len__(self) -> int:
+        return self._count
+
+    @property
+    def mean(self) -> float:
+        return self._total / self._count if self._count else 0.0
+
+    @property
+    def max(self) -> float:
+        return self._max
+
+    def record(self, value: float) -> None:
+        """
+        Adds value to histogram.
+        """
+        index = max(0, math.ceil(math.log(max(value, HISTOGRAM_MIN_VALUE) / HISTOGRAM_MIN_VALUE, HISTOGRAM_GROWTH)))
+        self._buckets[index] = self._buckets.get(index, 0) + 1
+        self._count += 1
+        self._total += value
+        self._min = min(self._min, value)
+        self._max = max(self._max, value)
+
+    def percentile(self, percent: float) -> float:
+        """
+        Returns approximate value below which given percent of values falls. 0 if histogram is empty.
+        """
+        if not self._count:
+            return 0.0
+        rank = max(1, math.ceil(percent / 100 * self._count))
+        seen = 0
+        for index in sorted(self._buckets):
+            seen += self._buckets[index]
+            if seen >= rank:
+                # Upper bound of bucket, limited by observed values.
+                return min(self._max, max(self._min, HISTOGRAM_MIN_VALUE * HISTOGRAM_GROWTH ** index))
+        return self._max
+
+
+@dataclasses.dataclass(kw_only=True)
+class EndpointMetrics:
+    """
+    Aggregated metrics of endpoint. Requires keyword arguments.
+    """
+    durations: Histogram = dataclasses.field(default_factory=Histogram)
+    errors: int = 0  # Attempts failed on connection error or with error status.
+    throttled: int = 0  # Attempts throttled by API (429).
+    retries: int = 0  # Attempts after the first one.
+    request_bytes: int = 0
+    response_bytes: int = 0
+    throttle_wait: float = 0.0  # Seconds waited for client-side rate limiter.
+
+    @property
+    def count(self) -> int:
+        return len(self.durations)
+
+    def as_dict(self) -> dict[str, float]:
+        """
+        Returns metrics with p50, p95 and p99 of durations in seconds.
+        """
+        return {
+            "count": self.count,
+            "errors": self.errors,
+            "throttled": self.throttled,
+            "retries": self.retries,
+            "error_rate": self.errors / self.count if self.count else 0.0,
+            "p50": self.durations.percentile(50),
+            "p95": self.durations.percentile(95),
+            "p99": self.durations.percentile(99),
+            "mean": self.durations.mean,
+            "max": self.durations.max,
+            "request_bytes": self.request_bytes,
+            "response_bytes": self.response_bytes,
+            "throttle_wait": self.throttle_wait,
+        }
+
+
+class MetricsCollector:
+    """
+    Thread-safe in-memory observer aggregating request events per method and endpoint template.
+    Pass collector to EcoMailOptions.observers and read report() at any time.
+    """
+    _metrics: dict[str, EndpointMetrics]
+    _lock: threading.Lock
+
+    def __init__(self) -> None:
+        self._metrics = {}
+        self._lock = threading.Lock()
+
+    def __call__(self, event: RequestEvent) -> None:
+        key = f"{event.method} {event.endpoint}"
+        with self._lock:
+            metrics = self._metrics.get(key)
+            if metrics is None:
+                metrics = self._metrics[key] = EndpointMetrics()
+            metrics.durations.record(event.duration)
+            metrics.errors += not event.ok
+            metrics.throttled += event.status == 429
+            metrics.retries += event.attempt > 1
+            metrics.request_bytes += event.request_bytes
+            metrics.response_bytes += event.response_bytes
+            metrics.throttle_wait += event.throttle_wait
+
+    def report(self) -> dict[str, dict[str, float]]:
+        """
+        Returns metrics of every endpoint, keyed by method and endpoint template,
+        eg. "POST lists/{list_id}/subscribe".
+        """
+        with self._lock:
+            return {_k: _m.as_dict() for _k, _m in sorted(self._metrics.items())}
+
+    def clear(self) -> None:
+        """
+        Removes collected metrics.
+        """
+        with self._lock:
+            self._metrics.clear()
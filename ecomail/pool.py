@@ -0,0 +1,164 @@
+from __future__ import annotations
+
+import dataclasses
+import threading
+from collections import deque
+from concurrent.futures import Future
+from types import TracebackType
+from typing import Callable, TypeVar
+
+from ecomail.service import DEFAULT_MAX_WORKERS, EcoMailOptions, EcoMailService
+
+
+DEFAULT_MAX_IN_FLIGHT = 2  # Operations of single account running at once.
+
+_T = TypeVar("_T")
+
+
+@dataclasses.dataclass(kw_only=True, eq=False)
+class _Account:
+    """
+    Service of account with its queued operations. Requires keyword arguments.
+    """
+    service: EcoMailService
+    queue: deque[tuple[Future, Callable[[EcoMailService], object]]] = dataclasses.field(default_factory=deque)
+    in_flight: int = 0
+
+
+class ServicePool:
+    """
+    Runs operations of many accounts (API keys) on shared worker threads.
+    Every account has its own service, so its own rate limiter and connection pool.
+    Queued operations are scheduled round-robin across accounts. Account is skipped while its
+    rate limiter has no tokens or while `max_in_flight` of its operations are running,
+    so workers are not blocked by throttled or noisy accounts and throughput grows with
+    number of accounts.
+    """
+    _accounts: dict[str, _Account]
+    _ready: deque[str]  # Accounts with queued operations, in round-robin order.
+    _max_in_flight: int
+    _condition: threading.Condition
+    _workers: list[threading.Thread]
+    _closed: bool
+
+    def __init__(self, max_workers: int = DEFAULT_MAX_WORKERS, max_in_flight: int = DEFAULT_MAX_IN_FLIGHT) -> None:
+        self._accounts = {}
+        self._ready = deque()
+        self._max_in_flight = max_in_flight
+        self._condition = threading.Condition()
+        self._closed = False
+        self._workers = [
+            threading.Thread(target=self._work, name=f"ServicePool-{_i}", daemon=True) for _i in range(max_workers)
+        ]
+        for worker in self._workers:
+            worker.start()
+
+    def __enter__(self) -> ServicePool:
+        return self
+
+    def __exit__(
+        self,
+        exc_type: type[BaseException] | None,
+        exc_val: BaseException | None,
+        exc_tb: TracebackType | None,
+    ) -> None:
+        self.close()
+
+    def add_account(self, account: str, options: EcoMailOptions) -> EcoMailService:
+        """
+        Creates service of account with given options. Returns the service.
+        """
+        with self._condition:
+            if account in self._accounts:
+                raise ValueError(f"Account {account} already exists.")
+            service = EcoMailService(options=options)
+            self._accounts[account] = _Account(service=service)
+            return service
+
+    def service(self, account: str) -> EcoMailService:
+        """
+        Returns service of account.
+        """
+        return self._accounts[account].service
+
+    def submit(self, account: str, operation: Callable[[EcoMailService], _T]) -> Future[_T]:
+        """
+        Queues operation of account. Operation is called with service of the account
+        in worker thread. Returns future of its result.
+        """
+        future: Future[_T] = Future()
+        with self._condition:
+            if self._closed:
+                raise RuntimeError("Cannot submit operations to closed pool.")
+            state = self._accounts[account]
+            if not state.queue:
+                self._ready.append(account)
+            state.queue.append((future, operation))
+            self._condition.notify()
+        return future
+
+    def close(self, cancel_pending: bool = False) -> None:
+        """
+        Waits for queued operations, or cancels them, stops workers and closes services.
+        """
+        with self._condition:
+            self._closed = True
+            if cancel_pending:
+                for state in self._accounts.values():
+                    while state.queue:
+                        state.queue.popleft()[0].cancel()
+                self._ready.clear()
+            self._condition.notify_all()
+        for worker in self._workers:
+            worker.join()
+        for state in self._accounts.values():
+            state.service.close()
+
+    def _work(self) -> None:
+        """
+        Worker loop, runs scheduled operations until pool is closed and queues are empty.
+        """
+        while True:
+            with self._condition:
+                while True:
+                    account, wait = self._next()
+                    if account is not None:
+                        break
+                    if self._closed and not self._ready:
+                        return
+                    self._condition.wait(timeout=wait)
+                state = self._accounts[account]
+                future, operation = state.queue.popleft()
+                if state.queue:
+                    self._ready.append(account)
+                state.in_flight += 1
+
+            if future.set_running_or_notify_cancel():
+                try:
+                    future.set_result(operation(state.service))
+                except BaseException as exc:
+                    future.set_exception(exc)
+
+            with self._condition:
+                state.in_flight -= 1
+                self._condition.notify_all()
+
+    def _next(self) -> tuple[str | None, float | None]:
+        """
+        Returns next account to run operation of, in round-robin order, and removes it from order.
+        If no account can run now, returns None and seconds until rate limiter of some account
+        has a token (None if waiting for running operations or new submits).
+        Must be called with lock held.
+        """
+        wait = None
+        for _ in range(len(self._ready)):
+            account = self._ready.popleft()
+            state = self._accounts[account]
+            if state.in_flight < self._max_in_flight:
+                rate_limiter = state.service.rate_limiter
+                token_wait = rate_limiter.wait_time if rate_limiter is not None else 0.0
+                if token_wait <= 0:
+                    return account, None
+                wait = token_wait if wait is None else min(wait, token_wait)
+            self._ready.append(account)
+        return None, wait
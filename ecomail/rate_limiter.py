@@ -0,0 +1,105 @@
+from __future__ import annotations
+
+import threading
+import time
+from typing import Callable
+
+
+DEFAULT_BURST_SHARE = 10  # Burst is tenth of the quota, unless given.
+
+
+class TokenBucket:
+    """
+    Thread-safe token bucket rate limiter.
+    Bucket holds up to `capacity` tokens and is refilled with `rate` tokens per second.
+    Every call takes one token. Calls are delayed while bucket is empty.
+    """
+    _rate: float
+    _capacity: float
+    _tokens: float
+    _updated_at: float
+    _clock: Callable[[], float]
+    _lock: threading.Lock
+
+    def __init__(self, rate: float, capacity: int, clock: Callable[[], float] = time.monotonic) -> None:
+        if rate <= 0:
+            raise ValueError("Rate must be positive.")
+        if capacity < 1:
+            raise ValueError("Capacity must be at least 1.")
+        self._rate = rate
+        self._capacity = float(capacity)
+        self._tokens = float(capacity)  # Start with full bucket to allow initial burst.
+        self._clock = clock
+        self._updated_at = clock()
+        self._lock = threading.Lock()
+
+    @classmethod
+    def for_quota(cls, calls: int, period: float, burst: int | None = None) -> TokenBucket:
+        """
+        Creates bucket that never exceeds `calls` per `period` in any time window.
+        Burst is taken from the quota, the rest of it is spread evenly over the period.
+        Burst defaults to tenth of the quota, at least 1 call.
+        """
+        if burst is None:
+            burst = max(1, calls // DEFAULT_BURST_SHARE)
+        if not 0 < burst < calls:
+            raise ValueError("Burst must be positive and lower than number of calls.")
+        return cls(rate=(calls - burst) / period, capacity=burst)
+
+    @property
+    def rate(self) -> float:
+        """
+        Number of tokens added to bucket per second.
+        """
+        return self._rate
+
+    @property
+    def capacity(self) -> int:
+        """
+        Max number of tokens in bucket, ie. max burst size.
+        """
+        return int(self._capacity)
+
+    @property
+    def wait_time(self) -> float:
+        """
+        Seconds the next call would have to wait for a token. Zero if token is available.
+        """
+        with self._lock:
+            self._refill()
+            return self._wait_time(1)
+
+    def reserve(self, tokens: int = 1) -> float:
+        """
+        Takes tokens from bucket without blocking. Returns delay in seconds the caller
+        must wait before making the call. Tokens are taken even if they are not available yet,
+        so concurrent callers are queued in order of reservation.
+        """
+        with self._lock:
+            self._refill()
+            delay = self._wait_time(tokens)
+            self._tokens -= tokens
+            return delay
+
+    def acquire(self, tokens: int = 1) -> float:
+        """
+        Takes tokens from bucket, blocks until they are available. Returns seconds waited.
+        """
+        delay = self.reserve(tokens)
+        if delay > 0:
+            time.sleep(delay)
+        return delay
+
+    def _refill(self) -> None:
+        """
+        Adds tokens for time elapsed since last update. Must be called with lock held.
+        """
+        now = self._clock()
+        self._tokens = min(self._capacity, self._tokens + (now - self._updated_at) * self._rate)
+        self._updated_at = now
+
+    def _wait_time(self, tokens: int) -> float:
+        """
+        Seconds until given number of tokens is available. Must be called with lock held.
+        """
+        return max(0.0, (tokens - self._tokens) / self._rate)
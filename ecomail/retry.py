@@ -0,0 +1,72 @@
+from __future__ import annotations
+
+import datetime
+import random
+from dataclasses import dataclass
+from email.utils import parsedate_to_datetime
+from typing import Mapping
+
+
+DEFAULT_RETRY_STATUSES = frozenset({429, 500, 502, 503, 504})
+
+
+@dataclass(kw_only=True, frozen=True)
+class RetryPolicy:
+    """
+    Policy of automatic retries of failed API calls. Requires keyword arguments. Frozen class.
+    Waits for Retry-After header if provided, otherwise backs off exponentially with full jitter.
+    """
+    max_retries: int = 5  # Retries after the first attempt.
+    backoff_factor: float = 0.5  # First backoff is up to 0.5s, then doubles.
+    max_backoff: float = 30  # 30s.
+    max_retry_time: float = 120  # Total time spent retrying a single call, 120s.
+    retry_statuses: frozenset[int] = DEFAULT_RETRY_STATUSES
+
+    def backoff(self, attempt: int) -> float:
+        """
+        Returns jittered backoff in seconds after given failed attempt, starting with 1.
+        """
+        return random.uniform(0, min(self.max_backoff, self.backoff_factor * 2 ** (attempt - 1)))
+
+    def next_delay(
+        self,
+        attempt: int,
+        elapsed: float,
+        status_code: int | None = None,
+        headers: Mapping[str, str] | None = None,
+    ) -> float | None:
+        """
+        Returns seconds to wait before next attempt, None if call should not be retried anymore.
+        `elapsed` is time already spent on the call, `status_code` and `headers` are taken
+        from failed response. Both are None if call failed on connection error.
+        """
+        if attempt > self.max_retries:
+            return None
+        if status_code is not None and status_code not in self.retry_statuses:
+            return None
+        delay = parse_retry_after(headers.get("Retry-After")) if headers is not None else None
+        if delay is None:
+            delay = self.backoff(attempt)
+        if elapsed + delay > self.max_retry_time:
+            return None
+        return delay
+
+
+def parse_retry_after(value: str | None) -> float | None:
+    """
+    Parses Retry-After header value, either delay in seconds or HTTP date.
+    Returns seconds to wait, None if value is missing or invalid.
+    """
+    if not value:
+        return None
+    try:
+        return max(0.0, float(value))
+    except ValueError:
+        pass
+    try:
+        retry_at = parsedate_to_datetime(value)
+    except (TypeError, ValueError):
+        return None
+    if retry_at.tzinfo is None:
+        retry_at = retry_at.replace(tzinfo=datetime.timezone.utc)
+    return max(0.0, (retry_at - datetime.datetime.now(datetime.timezone.utc)).total_seconds())
@@ -1,21 +1,68 @@
-from dataclasses import dataclass
-from typing import Any
+from __future__ import annotations
+
+import heapq
+import logging
+import math
+import threading
+import time
+import weakref
+from collections import deque
+from concurrent.futures import FIRST_COMPLETED, Future, ThreadPoolExecutor, wait
+from dataclasses import dataclass, field
+from types import TracebackType
+from typing import Any, Callable, Iterable, Iterator, Mapping, TypeVar
 from urllib.parse import urljoin
 
 import requests
+from requests.adapters import HTTPAdapter
+
+from ecomail.bulk import (
+    BULK_LIMIT,
+    DEFAULT_MAX_POLL_INTERVAL,
+    DEFAULT_POLL_INTERVAL,
+    DEFAULT_WAIT_TIMEOUT,
+    BulkChunkResult,
+    BulkImportResult,
+    BulkJob,
+    BulkJobStatus,
+    iter_bulk_payload,
+)
+from ecomail.cache import CACHE_CAMPAIGNS, CACHE_SUBSCRIBER, DEFAULT_CACHE_MAX_SIZE, CacheEntry, ResponseCache
+from ecomail.campaign import Campaign, CampaignStatus
+from ecomail.campaign_stats_detail import (
+    CampaignStatsDetail,
+    CampaignStatsDetailColumns,
+    CampaignStatsDetailSubscriber,
+    CampaignStatsResult,
+)
+from ecomail.decoding import STREAM_CHUNK_SIZE, decode_stats_detail_page, loads
+from ecomail.exceptions import ApiConnectionError, ApiRequestError, EcoMailError
+from ecomail.observer import RequestEvent, RequestObserver
+from ecomail.rate_limiter import TokenBucket
+from ecomail.retry import RetryPolicy
+from ecomail.subscriber import Subscriber, SubscriberLookupResult
+from ecomail.utils import chunked
 
-from ecomail.campaign import Campaign
-from ecomail.campaign_stats_detail import CampaignStatsDetail, CampaignStatsDetailSubscriber
-from ecomail.exceptions import ApiConnectionError, ApiRequestError
-from ecomail.subscriber import Subscriber
 
+logger = logging.getLogger(__name__)
 
 DEFAULT_TIMEOUT = 60  # 60s.
+DEFAULT_POOL_CONNECTIONS = 1  # Single API host.
+DEFAULT_POOL_MAXSIZE = 10  # Connections kept alive per host.
+DEFAULT_RATE_LIMIT_CALLS = 1000  # API quota, 1000 calls for an API key per minute.
+DEFAULT_RATE_LIMIT_PERIOD = 60  # 60s.
+DEFAULT_MAX_WORKERS = 4  # Concurrent calls of single operation.
 
 
 _mapping = dict[str, Any]
 """Type alias for mappings, eg. query and headers."""
 
+_body_factory = Callable[[], Iterable[bytes]]
+"""Type alias for callables returning chunks of streamed request body."""
+
+_R = TypeVar("_R")
+"""Type of response, requests.Response or httpx.Response."""
+
 
 @dataclass
 class EcoMailOptions:
@@ -25,19 +72,209 @@ class EcoMailOptions:
     base_url: str
     api_key: str
     default_timeout: int = DEFAULT_TIMEOUT
+    pool_connections: int = DEFAULT_POOL_CONNECTIONS  # Number of pooled hosts.
+    pool_maxsize: int = DEFAULT_POOL_MAXSIZE  # Max connections per host, match to worker threads.
+    keep_alive: bool = True  # Reuse connections between calls.
+    rate_limit_calls: int | None = DEFAULT_RATE_LIMIT_CALLS  # None disables client-side rate limit.
+    rate_limit_period: float = DEFAULT_RATE_LIMIT_PERIOD
+    rate_limit_burst: int | None = None  # Calls made at once, tenth of `rate_limit_calls` by default.
+    retry_policy: RetryPolicy | None = field(default_factory=RetryPolicy)  # None disables retries.
+    # Response cache TTLs in seconds by cache group, eg. {"campaigns": 60}. Empty disables cache.
+    cache_ttls: dict[str, float] = field(default_factory=dict)
+    cache_max_size: int = DEFAULT_CACHE_MAX_SIZE
+    # Called with event of every request attempt, eg. MetricsCollector. Must be thread-safe.
+    observers: list[RequestObserver] = field(default_factory=list)
+    # Decode stats detail pages incrementally from response stream. Lowers peak memory of large pages,
+    # but decoding is slower than decoding whole body.
+    stream_stats_pages: bool = False
+
+
+class _BaseService:
+    """
+    Base of EcoMailService and AsyncEcoMailService. Holds state and logic that does not depend
+    on how requests are sent: rate limiter, response cache, observers and retry policy.
+    """
+    _options: EcoMailOptions
+    _rate_limiter: TokenBucket | None
+    _cache: ResponseCache
+
+    def __init__(self, options: EcoMailOptions) -> None:
+        self._options = options
+        self._rate_limiter = TokenBucket.for_quota(
+            calls=options.rate_limit_calls,
+            period=options.rate_limit_period,
+            burst=options.rate_limit_burst,
+        ) if options.rate_limit_calls else None
+        self._cache = ResponseCache(max_size=options.cache_max_size)
+
+    @property
+    def rate_limiter(self) -> TokenBucket | None:
+        """
+        Client-side rate limiter of service, None if rate limit is disabled.
+        Its wait_time is the current delay before next call.
+        """
+        return self._rate_limiter
+
+    def invalidate_cache(self) -> None:
+        """
+        Removes all cached responses.
+        """
+        self._cache.clear()
+
+    def _invalidate_subscriber_cache(self, list_id: int, subscriber_emails: Iterable[str]) -> None:
+        """
+        Removes cached details of subscribers changed by a call. Called even if the call failed,
+        as it might have been processed by API.
+        """
+        for email in subscriber_emails:
+            self._cache.invalidate(ResponseCache.make_key(f"lists/{list_id}/subscriber/{email}"))
+
+    def _cache_ttl(self, cache: str | None, stream: bool) -> float | None:
+        """
+        Returns TTL of GET response in given cache group, None if response is not cached.
+        Streamed responses are never cached.
+        """
+        if cache is None or stream:
+            return None
+        return self._options.cache_ttls.get(cache) or None
+
+    def _cache_response(self, key: str, ttl: float, entry: CacheEntry | None, response: _R) -> _R:
+        """
+        Stores GET response in cache. If expired `entry` was revalidated and API answered
+        304 Not Modified, cached response is valid for another TTL and it is returned instead.
+        """
+        if entry is not None and response.status_code == 304:
+            self._cache.set(key, entry.value, ttl, etag=entry.etag, last_modified=entry.last_modified)
+            return entry.value
+        self._cache.set(
+            key,
+            response,
+            ttl,
+            etag=response.headers.get("ETag"),
+            last_modified=response.headers.get("Last-Modified"),
+        )
+        return response
+
+    def _notify_attempt(
+        self,
+        method: str,
+        endpoint: str,
+        sent_at: float,
+        attempt: int,
+        throttle_wait: float,
+        request_bytes: int,
+        response: Any = None,
+        stream: bool = False,
+        error: str | None = None,
+    ) -> None:
+        """
+        Reports attempt of a call to observers. `response` is None if attempt failed on connection error.
+        Size of streamed response is taken from Content-Length header, as its body is not read yet.
+        """
+        if response is None:
+            response_bytes = 0
+        elif stream:
+            response_bytes = int(response.headers.get("Content-Length") or 0)
+        else:
+            response_bytes = len(response.content)
+        self._notify(RequestEvent(
+            method=method,
+            endpoint=endpoint,
+            status=response.status_code if response is not None else None,
+            duration=time.monotonic() - sent_at,
+            request_bytes=request_bytes,
+            response_bytes=response_bytes,
+            attempt=attempt,
+            throttle_wait=throttle_wait,
+            error=error,
+        ))
+
+    def _notify(self, event: RequestEvent) -> None:
+        """
+        Passes request event to every observer. Errors of observers are logged, they do not fail the call.
+        """
+        for observer in self._options.observers:
+            try:
+                observer(event)
+            except Exception:
+                logger.exception("Request observer %r failed.", observer)
+
+    def _retry_delay(
+        self,
+        attempt: int,
+        started_at: float,
+        status_code: int | None = None,
+        headers: Mapping[str, str] | None = None,
+    ) -> float | None:
+        """
+        Returns seconds to wait before retrying failed attempt, None if call must not be retried.
+        Status code and headers are given if attempt failed with error response.
+        """
+        policy = self._options.retry_policy
+        if policy is None:
+            return None
+        return policy.next_delay(
+            attempt,
+            elapsed=time.monotonic() - started_at,
+            status_code=status_code,
+            headers=headers,
+        )
 
 
-class EcoMailService:
+class EcoMailService(_BaseService):
     """
     Connection service for EcoMail API.
     Docs: https://ecomailappapiv2.docs.apiary.io/#
     API is rate-limited 1000 calls for an API key per minute.
     Other request will be throttled with 429 return code and a Retry-After header.
+
+    Service owns a connection pool shared by all threads using the service.
+    Call close() or use service as context manager to release pooled connections.
+    Calls are spaced out by client-side rate limiter to stay within the quota.
+    Throttled calls are retried after Retry-After delay, calls safe to repeat are also retried
+    on server and connection errors.
+    Responses of campaigns list and subscriber details can be cached, see EcoMailOptions.cache_ttls.
     """
-    _options: EcoMailOptions
+    _adapter: HTTPAdapter
+    _local: threading.local
+    _sessions: weakref.WeakSet[requests.Session]
+    _sessions_lock: threading.Lock
 
     def __init__(self, options: EcoMailOptions) -> None:
-        self._options = options
+        super().__init__(options)
+        # Adapter holds the connection pool, which is thread-safe and shared by all sessions.
+        self._adapter = HTTPAdapter(
+            pool_connections=options.pool_connections,
+            pool_maxsize=options.pool_maxsize,
+        )
+        # Sessions are not guaranteed to be thread-safe, so each thread gets its own.
+        # Session is held only by its thread, it is freed when the thread exits,
+        # eg. worker threads of per-call executors.
+        self._local = threading.local()
+        self._sessions = weakref.WeakSet()
+        self._sessions_lock = threading.Lock()
+
+    def __enter__(self) -> EcoMailService:
+        return self
+
+    def __exit__(
+        self,
+        exc_type: type[BaseException] | None,
+        exc_val: BaseException | None,
+        exc_tb: TracebackType | None,
+    ) -> None:
+        self.close()
+
+    def close(self) -> None:
+        """
+        Closes all pooled connections. Service can be used again, new connections will be opened.
+        """
+        with self._sessions_lock:
+            sessions, self._sessions = list(self._sessions), weakref.WeakSet()
+            for session in sessions:
+                session.close()
+            self._local = threading.local()
+        self._adapter.close()
 
     def add_new_list(
         self,
@@ -55,11 +292,7 @@ class EcoMailService:
             from_email=from_email,
             reply_to=reply_to or from_email,  # Reply to from_email by default.
         )
-        json_data: dict[str, Any] = response.json()
-        try:
-            return json_data["id"]
-        except KeyError as exc:
-            raise ApiConnectionError("List ID could not be retrieved.") from exc
+        return _created_id(response.json(), "List")
 
     def add_new_subscriber_to_list(
         self,
@@ -76,63 +309,288 @@ class EcoMailService:
             subscriber=subscriber,
             trigger_autoresponders=trigger_autoresponders
         )
-        json_data: dict[str, Any] = response.json()
-        try:
-            return json_data["id"]
-        except KeyError as exc:
-            raise ApiConnectionError("Subscriber ID could not be retrieved.") from exc
+        return _created_id(response.json(), "Subscriber")
 
     def add_bulk_subscribers_to_list(
         self,
         list_id: int,
         subscribers: list[Subscriber],
-    ) -> None:
+    ) -> BulkJob | None:
         """
         Adds new subscribers in bulk to given list. Updates existing subscribers.
         Bulk endpoint is limited to 3000 subscribers, subscribers over 3000 will be ignored.
+        Returns handle of import job processed by API in background, see wait_for_bulk_jobs().
+        None if API returned no job ID.
         """
-        if len(subscribers) > 3000:
+        _check_bulk_limit(len(subscribers))
+        response = self._call_add_bulk_subscribers_to_list(list_id, subscribers)
+        return BulkJob.from_body(list_id, len(subscribers), response.content)
+
+    def import_subscribers_to_list(
+        self,
+        list_id: int,
+        subscribers: Iterable[Subscriber],
+        max_workers: int = DEFAULT_MAX_WORKERS,
+        chunk_size: int = BULK_LIMIT,
+        on_chunk: Callable[[BulkChunkResult, list[Subscriber]], None] | None = None,
+        skip_chunk: Callable[[int, list[Subscriber]], BulkChunkResult | None] | None = None,
+    ) -> BulkImportResult:
+        """
+        Adds any number of subscribers to given list. Updates existing subscribers.
+        Subscribers are split into bulk calls of at most 3000 subscribers, up to `max_workers`
+        calls are sent at once. Iterable is consumed lazily, only chunks in flight are held in memory.
+        Failed chunks do not stop the import, they are reported in result.
+        `on_chunk` is called in the calling thread with result and subscribers of every finished chunk.
+        `skip_chunk` is called with index and subscribers of every chunk before it is sent. If it returns
+        result, eg. of chunk sent by interrupted import, chunk is not sent and the result is reported instead.
+        """
+        if not 0 < chunk_size <= BULK_LIMIT:
             raise ApiRequestError("Bulk endpoint is limited to 3000 subscribers.")
 
-        # Response status code is checked. Returns job ID. No need to pass anything to client.
-        _ = self._call_add_bulk_subscribers_to_list(list_id, subscribers)
+        results: list[BulkChunkResult] = []
+        pending: dict[Future[BulkChunkResult], list[Subscriber]] = {}
+
+        def collect(futures: Iterable[Future[BulkChunkResult]]) -> None:
+            for future in futures:
+                chunk = pending.pop(future)
+                results.append(result := future.result())
+                if on_chunk is not None:
+                    on_chunk(result, chunk)
+
+        with ThreadPoolExecutor(max_workers=max_workers) as executor:
+            for index, chunk in enumerate(chunked(subscribers, chunk_size)):
+                if skip_chunk is not None and (skipped := skip_chunk(index, chunk)) is not None:
+                    results.append(skipped)
+                    continue
+                if len(pending) >= max_workers:
+                    collect(wait(pending, return_when=FIRST_COMPLETED).done)
+                pending[executor.submit(self._import_chunk, list_id, index, chunk)] = chunk
+            collect(wait(pending).done)
+        return BulkImportResult(chunks=sorted(results, key=lambda _r: _r.index))
+
+    def refresh_bulk_job(self, job: BulkJob) -> BulkJob:
+        """
+        Updates status of bulk import job. Returns the same handle.
+        Note that job status endpoint is not part of documented API, its path `lists/{list_id}/subscribe-bulk/{job_id}`
+        and "status" field of response are assumed. If API does not provide it, ApiConnectionError is raised.
+        """
+        response = self._call_get_bulk_job_status(job.list_id, job.job_id)
+        return _update_bulk_job(job, response.content)
+
+    def wait_for_bulk_jobs(
+        self,
+        jobs: Iterable[BulkJob],
+        timeout: float = DEFAULT_WAIT_TIMEOUT,
+        poll_interval: float = DEFAULT_POLL_INTERVAL,
+        max_poll_interval: float = DEFAULT_MAX_POLL_INTERVAL,
+    ) -> list[BulkJob]:
+        """
+        Waits until given bulk import jobs are finished, or until timeout (1 hour by default).
+        Returns jobs still pending. Raises ApiConnectionError if status of a job cannot be read.
+        Job status endpoint is not part of documented API and may not be available, see refresh_bulk_job().
+        Jobs are polled in rounds. Jobs of a list are expected to be processed by API in order,
+        so only the oldest pending job of each list is polled, following ones after it finishes.
+        Wait between rounds starts at `poll_interval` and doubles up to `max_poll_interval`
+        while no job finishes.
+        """
+        queues = _bulk_job_queues(jobs)
+        deadline = time.monotonic() + timeout
+        interval = poll_interval
+        while queues:
+            delay = min(interval, deadline - time.monotonic())
+            if delay > 0:
+                time.sleep(delay)
+            finished = False
+            for list_id, queue in list(queues.items()):
+                while queue and self.refresh_bulk_job(queue[0]).finished:
+                    queue.popleft()
+                    finished = True
+                if not queue:
+                    del queues[list_id]
+            if time.monotonic() >= deadline:
+                break
+            interval = poll_interval if finished else min(max_poll_interval, interval * 2)
+        return [_j for _q in queues.values() for _j in _q]
 
     def get_campaigns_list(self) -> list[Campaign]:
         """
-        Returns list of campaigns.
+        Returns list of campaigns from all pages.
         """
-        response = self._call_get_campaigns_list_page()
-        json_data: list[dict[str, Any]] = response.json()
-        return [Campaign.from_dict(_c) for _c in json_data]
+        return list(self.iter_campaigns())
 
-    def get_campaigns_stats_detail(self, campaign_id: int) -> CampaignStatsDetail:
+    def iter_campaigns(
+        self,
+        since_id: int | None = None,
+        include_ids: Iterable[int] = (),
+    ) -> Iterator[Campaign]:
         """
-        Returns detailed statistics of campaign.
+        Yields campaigns page by page. Plain list returned by API is a single page.
+        With `since_id`, only campaigns with higher ID or with ID in `include_ids` are parsed
+        and yielded. If pages are ordered from the newest campaign, paging stops at page reaching
+        `since_id` and `include_ids` not seen yet are fetched one by one, deleted ones are skipped.
         """
+        pages = _CampaignPages(since_id, include_ids)
         page = 1
-        stats = CampaignStatsDetail(subscribers=[])
         while True:
-            response = self._call_get_campaigns_stats_detail_page(campaign_id, page)
-            json_data: dict[str, Any] = response.json()
-            stats.subscribers.extend([
-                CampaignStatsDetailSubscriber.from_dict(email=_e, data=_d)
-                for _e, _d in json_data["subscribers"].items()
-            ])
-
-            if (total := json_data.get("total")) is not None and len(stats.subscribers) >= total:
-                break
-            if not json_data.get("next_page_url"):
-                break
+            campaigns, next_page = pages.parse(self._call_get_campaigns_list_page(page).json())
+            yield from campaigns
+            if pages.stopped:
+                for campaign_id in sorted(pages.remaining):
+                    try:
+                        campaign = self.get_campaign(campaign_id)
+                    except ApiConnectionError as exc:
+                        if exc.status_code != 404:
+                            raise
+                        continue  # Campaign was deleted.
+                    yield campaign
+                return
+            if not next_page:
+                return
             page += 1
+
+    def get_campaign(self, campaign_id: int) -> Campaign:
+        """
+        Returns campaign with given ID.
+        """
+        response = self._call_get_campaign(campaign_id)
+        return _campaign_from_response(response.json())
+
+    def get_campaigns_stats_detail(self, campaign_id: int, max_workers: int = 1) -> CampaignStatsDetail:
+        """
+        Returns detailed statistics of campaign.
+        With `max_workers` over 1, total and page size are read from the first page
+        and remaining pages are fetched concurrently. Subscribers are returned in page order.
+        """
+        stats = CampaignStatsDetail(subscribers=[])
+        for page_subscribers in self.iter_campaign_stats_detail_pages(campaign_id, max_workers):
+            stats.subscribers.extend(page_subscribers)
         return stats
 
+    def get_campaign_stats_detail_columns(
+        self,
+        campaign_id: int,
+        max_workers: int = 1,
+    ) -> CampaignStatsDetailColumns:
+        """
+        Returns detailed statistics of campaign in compact columnar representation.
+        Pages are added to columns as they arrive, see iter_campaign_stats_detail_pages().
+        """
+        columns = CampaignStatsDetailColumns()
+        for page_subscribers in self.iter_campaign_stats_detail_pages(campaign_id, max_workers):
+            columns.extend(page_subscribers)
+        return columns
+
+    def iter_campaign_stats_detail(
+        self,
+        campaign_id: int,
+        max_workers: int = 1,
+    ) -> Iterator[CampaignStatsDetailSubscriber]:
+        """
+        Yields subscribers of detailed statistics of campaign as pages arrive.
+        Only pages being fetched or consumed are held in memory.
+        """
+        for page_subscribers in self.iter_campaign_stats_detail_pages(campaign_id, max_workers):
+            yield from page_subscribers
+
+    def iter_campaign_stats_detail_pages(
+        self,
+        campaign_id: int,
+        max_workers: int = 1,
+        start_page: int = 1,
+    ) -> Iterator[list[CampaignStatsDetailSubscriber]]:
+        """
+        Yields subscribers of detailed statistics of campaign page by page, in page order.
+        Pages are fetched concurrently if `max_workers` is over 1 and first page contains
+        total and page size. At most `max_workers` pages are fetched ahead of consumer,
+        so memory stays proportional to page size.
+        Pages before `start_page` are skipped, eg. to resume interrupted processing.
+        """
+        json_data, page_subscribers = self._get_campaign_stats_detail_page(campaign_id, start_page)
+        yield page_subscribers
+
+        pages = _StatsPages(json_data, start_page, len(page_subscribers))
+        if max_workers > 1 and pages.following is not None:
+            yield from self._prefetch_campaign_stats_detail_pages(campaign_id, pages.following, max_workers)
+            return
+
+        while (page := pages.next_page(json_data)) is not None:
+            json_data, page_subscribers = self._get_campaign_stats_detail_page(campaign_id, page)
+            pages.page_done(len(page_subscribers))
+            yield page_subscribers
+
+    def iter_campaigns_stats_detail(
+        self,
+        campaign_ids: Iterable[int] | None = None,
+        statuses: Iterable[CampaignStatus] | None = None,
+        max_workers: int = DEFAULT_MAX_WORKERS,
+    ) -> Iterator[CampaignStatsResult]:
+        """
+        Collects detailed statistics of many campaigns concurrently. Yields result of every campaign
+        as soon as all its pages are fetched. Campaigns are given by IDs, or selected from campaigns
+        list by status, all campaigns by default.
+        Up to `max_workers` pages of all campaigns are fetched at once under the shared rate limiter.
+        Campaigns with fewer recipients are fetched first, so their results arrive early, and pages
+        of started campaigns take precedence over first pages of following ones.
+        Failed campaign does not stop the others, its error is reported in result.
+        """
+        fan_out = _StatsFanOut(_campaigns_by_size(self.iter_campaigns(), campaign_ids, statuses))
+
+        executor = ThreadPoolExecutor(max_workers=max_workers)
+        pending: dict[Future[tuple[dict[str, Any], list[CampaignStatsDetailSubscriber]]], tuple[int, int]] = {}
+        try:
+            while True:
+                while len(pending) < max_workers and (item := fan_out.next_page()) is not None:
+                    pending[executor.submit(self._get_campaign_stats_detail_page, *item)] = item
+                if not pending:
+                    break
+                for future in wait(pending, return_when=FIRST_COMPLETED).done:
+                    campaign_id, page = pending.pop(future)
+                    try:
+                        result = fan_out.page_done(campaign_id, page, *future.result())
+                    except EcoMailError as exc:
+                        result = fan_out.page_failed(campaign_id, exc)
+                    if result is not None:
+                        yield result
+        finally:
+            # Do not fetch pages nobody will consume, eg. on error or closed iterator.
+            executor.shutdown(wait=True, cancel_futures=True)
+
     def get_subscriber_details(self, list_id: int, subscriber_email: str) -> Subscriber:
         """
         Returns details of subscriber from given list.
         """
         response = self._call_get_subscriber_details(list_id, subscriber_email)
-        json_data: dict[str, Any] = response.json()
-        return Subscriber.from_dict(json_data["subscriber"])
+        return _subscriber_from_response(response.json())
+
+    def get_subscribers_details(
+        self,
+        list_id: int,
+        emails: Iterable[str],
+        max_workers: int = DEFAULT_MAX_WORKERS,
+    ) -> SubscriberLookupResult:
+        """
+        Returns details of many subscribers from given list. Duplicate emails are looked up once.
+        Up to `max_workers` lookups are sent at once, all of them wait for rate limiter.
+        Missing subscribers and failed lookups do not stop the batch, they are reported in result.
+        """
+        lookup = _SubscriberLookup(emails)
+        pending: dict[Future[Subscriber], str] = {}
+
+        def collect(futures: Iterable[Future[Subscriber]]) -> None:
+            for future in futures:
+                email = pending.pop(future)
+                try:
+                    lookup.found(email, future.result())
+                except EcoMailError as exc:
+                    lookup.failed(email, exc)
+
+        with ThreadPoolExecutor(max_workers=max_workers) as executor:
+            for email in lookup.emails:
+                if len(pending) >= max_workers:
+                    collect(wait(pending, return_when=FIRST_COMPLETED).done)
+                pending[executor.submit(self.get_subscriber_details, list_id, email)] = email
+            collect(wait(pending).done)
+        return lookup.result()
 
     def update_subscriber(self, list_id: int, subscriber_email: str, data: dict[str, Any]) -> None:
         """
@@ -140,6 +598,66 @@ class EcoMailService:
         """
         _ = self._call_update_subscriber(list_id, subscriber_email, data)
 
+    def update_subscribers(self, list_id: int, updates: dict[str, dict[str, Any]]) -> None:
+        """
+        Updates data of subscribers in given list in single bulk call. Maps emails to data.
+        Bulk endpoint is limited to 3000 subscribers. Emails not in the list are subscribed.
+        """
+        _ = self._call_add_bulk_subscriber_data_to_list(list_id, _bulk_update_data(updates))
+
+    def _prefetch_campaign_stats_detail_pages(
+        self,
+        campaign_id: int,
+        pages: range,
+        max_workers: int,
+    ) -> Iterator[list[CampaignStatsDetailSubscriber]]:
+        """
+        Fetches given pages of campaign statistics concurrently. Yields them in page order.
+        """
+        def fetch_page(page: int) -> list[CampaignStatsDetailSubscriber]:
+            return self._get_campaign_stats_detail_page(campaign_id, page)[1]
+
+        executor = ThreadPoolExecutor(max_workers=max_workers)
+        pending: deque[Future[list[CampaignStatsDetailSubscriber]]] = deque()
+        try:
+            for page in pages:
+                pending.append(executor.submit(fetch_page, page))
+                if len(pending) >= max_workers:
+                    yield pending.popleft().result()
+            while pending:
+                yield pending.popleft().result()
+        finally:
+            # Do not fetch pages nobody will consume, eg. on error or closed iterator.
+            executor.shutdown(wait=True, cancel_futures=True)
+
+    def _get_campaign_stats_detail_page(
+        self,
+        campaign_id: int,
+        page: int,
+    ) -> tuple[dict[str, Any], list[CampaignStatsDetailSubscriber]]:
+        """
+        Returns fields and subscribers of page of campaign statistics. With `stream_stats_pages` option,
+        subscribers are decoded incrementally from response stream without building subscribers mapping.
+        Otherwise whole body is decoded at once, with orjson if installed.
+        """
+        if not self._options.stream_stats_pages:
+            return _stats_detail_page(self._call_get_campaigns_stats_detail_page(campaign_id, page).content)
+
+        subscribers: list[CampaignStatsDetailSubscriber] = []
+        with self._call_get_campaigns_stats_detail_page(campaign_id, page, stream=True) as response:
+            json_data = decode_stats_detail_page(response.iter_content(STREAM_CHUNK_SIZE), _collect_to(subscribers))
+        return json_data, subscribers
+
+    def _import_chunk(self, list_id: int, index: int, subscribers: list[Subscriber]) -> BulkChunkResult:
+        """
+        Sends single chunk of bulk import. Returns result instead of raising API errors.
+        """
+        try:
+            response = self._call_add_bulk_subscribers_to_list(list_id, subscribers)
+        except EcoMailError as exc:
+            return BulkChunkResult(index=index, count=len(subscribers), error=exc)
+        return _chunk_result(list_id, index, len(subscribers), response.content)
+
     # region Private methods to call API endpoints.
     def _call_add_new_list(
         self,
@@ -171,7 +689,8 @@ class EcoMailService:
         Calls "Lists/List subscribe/Add new subscriber to list" api endpoint.
         https://ecomailappapiv2.docs.apiary.io/#reference/lists/list-subscribe/add-new-subscriber-to-list
         """
-        endpoint_path = f"lists/{list_id}/subscribe"
+        endpoint_template = "lists/{list_id}/subscribe"
+        endpoint_path = endpoint_template.format(list_id=list_id)
         data = {
             "subscriber_data": subscriber.as_dict(),
             "update_existing": True,
@@ -182,7 +701,11 @@ class EcoMailService:
             "skip_confirmation": True,
             # trigger_notification  # (default: false) - Send subscribe notifications.
         }
-        return self._call_post(endpoint=endpoint_path, json=data)
+        try:
+            # Subscribe updates existing subscriber without resubscribe, it is safe to repeat.
+            return self._call_post(endpoint=endpoint_path, json=data, idempotent=True, template=endpoint_template)
+        finally:
+            self._invalidate_subscriber_cache(list_id, [subscriber.email])
 
     def _call_add_bulk_subscribers_to_list(
         self,
@@ -193,99 +716,616 @@ class EcoMailService:
         Calls "Lists/List subscribe bulk/Add bulk subscribers to list" api endpoint.
         https://ecomailappapiv2.docs.apiary.io/#reference/lists/list-subscribe-bulk/add-bulk-subscribers-to-list
         """
-        endpoint_path = f"lists/{list_id}/subscribe-bulk"
-        data = {
-            "subscriber_data": [_s.as_dict() for _s in subscribers],
-            "update_existing": True,
-        }
-        return self._call_post(endpoint=endpoint_path, json=data)
+        return self._call_subscribe_bulk(
+            list_id,
+            [_s.email for _s in subscribers],
+            lambda: (_s.as_dict() for _s in subscribers),
+        )
+
+    def _call_add_bulk_subscriber_data_to_list(
+        self,
+        list_id: int,
+        subscriber_data: list[dict[str, Any]],
+    ) -> requests.Response:
+        """
+        Calls "Lists/List subscribe bulk/Add bulk subscribers to list" api endpoint with raw
+        subscriber data. Every item must contain email, other fields are optional.
+        https://ecomailappapiv2.docs.apiary.io/#reference/lists/list-subscribe-bulk/add-bulk-subscribers-to-list
+        """
+        return self._call_subscribe_bulk(list_id, [_d["email"] for _d in subscriber_data], lambda: subscriber_data)
 
-    def _call_get_campaigns_list_page(self) -> requests.Response:
+    def _call_subscribe_bulk(
+        self,
+        list_id: int,
+        emails: list[str],
+        subscriber_data: Callable[[], Iterable[dict[str, Any]]],
+    ) -> requests.Response:
+        """
+        Calls "Lists/List subscribe bulk/Add bulk subscribers to list" api endpoint. Payload is encoded
+        incrementally from items returned by `subscriber_data` and streamed, so it is never held
+        in memory as a whole. `emails` are removed from cache.
+        """
+        endpoint_template = "lists/{list_id}/subscribe-bulk"
+        endpoint_path = endpoint_template.format(list_id=list_id)
+        try:
+            # Bulk subscribe updates existing subscribers, it is safe to repeat.
+            return self._call_post(
+                endpoint=endpoint_path,
+                idempotent=True,
+                template=endpoint_template,
+                body=lambda: iter_bulk_payload(subscriber_data()),
+            )
+        finally:
+            self._invalidate_subscriber_cache(list_id, emails)
+
+    def _call_get_bulk_job_status(self, list_id: int, job_id: int) -> requests.Response:
+        """
+        Calls bulk import job status endpoint.
+        Not part of documented API, path and "status" field of response are assumed.
+        """
+        endpoint_template = "lists/{list_id}/subscribe-bulk/{job_id}"
+        endpoint_path = endpoint_template.format(list_id=list_id, job_id=job_id)
+        return self._call_get(endpoint=endpoint_path, query={}, template=endpoint_template)
+
+    def _call_get_campaigns_list_page(self, page: int = 1) -> requests.Response:
         """
         Calls "Campaigns/List campaigns/List campaigns" api endpoint.
         https://ecomailappapiv2.docs.apiary.io/#reference/campaigns/campaigns-collection/list-all-campaigns
         """
         endpoint_path = "campaigns"
-        return self._call_get(endpoint=endpoint_path, query={})
+        query = {"page": page} if page > 1 else {}  # First page is cached under plain endpoint.
+        return self._call_get(endpoint=endpoint_path, query=query, cache=CACHE_CAMPAIGNS)
 
-    def _call_get_campaigns_stats_detail_page(self, campaign_id: int, page: int) -> requests.Response:
+    def _call_get_campaign(self, campaign_id: int) -> requests.Response:
+        """
+        Calls "Campaigns/Campaign detail" api endpoint.
+        https://ecomailappapiv2.docs.apiary.io/#reference/campaigns/campaign/campaign-detail
+        """
+        endpoint_template = "campaigns/{campaign_id}"
+        endpoint_path = endpoint_template.format(campaign_id=campaign_id)
+        return self._call_get(endpoint=endpoint_path, query={}, template=endpoint_template)
+
+    def _call_get_campaigns_stats_detail_page(
+        self,
+        campaign_id: int,
+        page: int,
+        stream: bool = False,
+    ) -> requests.Response:
         """
         Calls "Campaigns/Campaign stats/Get campaign stats" api endpoint.
         https://ecomailappapiv2.docs.apiary.io/#reference/campaigns/get-campaign-stats-detail/get-campaign-stats-detail
         """
-        endpoint_path = f"campaigns/{campaign_id}/stats-detail"
-        return self._call_get(endpoint=endpoint_path, query={"page": page})
+        endpoint_template = "campaigns/{campaign_id}/stats-detail"
+        endpoint_path = endpoint_template.format(campaign_id=campaign_id)
+        return self._call_get(endpoint=endpoint_path, query={"page": page}, template=endpoint_template, stream=stream)
 
     def _call_get_subscriber_details(self, list_id: int, subscriber_email: str) -> requests.Response:
         """
         Calls "Lists/List subscribers/Get subscriber" api endpoint.
         https://ecomailappapiv2.docs.apiary.io/#reference/lists/list-subscribe/get-subscriber
         """
-        endpoint_path = f"lists/{list_id}/subscriber/{subscriber_email}"
-        return self._call_get(endpoint=endpoint_path, query={})
+        endpoint_template = "lists/{list_id}/subscriber/{subscriber_email}"
+        endpoint_path = endpoint_template.format(list_id=list_id, subscriber_email=subscriber_email)
+        return self._call_get(
+            endpoint=endpoint_path,
+            query={},
+            cache=CACHE_SUBSCRIBER,
+            template=endpoint_template,
+        )
 
     def _call_update_subscriber(self, list_id: int, subscriber_email: str, data: dict[str, Any]) -> requests.Response:
         """
         Calls "Lists/List subscribers/Update subscriber" api endpoint.
         https://ecomailappapiv2.docs.apiary.io/#reference/lists/list-subscribe/update-subscriber
         """
-        endpoint_path = f"lists/{list_id}/update-subscriber"
+        endpoint_template = "lists/{list_id}/update-subscriber"
+        endpoint_path = endpoint_template.format(list_id=list_id)
         _d = {"email": subscriber_email, "subscriber_data": data}
-        return self._call_put(endpoint=endpoint_path, json=_d)
+        try:
+            return self._call_put(endpoint=endpoint_path, json=_d, template=endpoint_template)
+        finally:
+            self._invalidate_subscriber_cache(list_id, [subscriber_email])
     # endregion
 
     # region Generic API call methods.
-    def _call_get(self, endpoint: str, query: _mapping) -> requests.Response:
+    def _get_session(self) -> requests.Session:
+        """
+        Returns session of current thread. Sessions share connection pool of service.
+        """
+        session: requests.Session | None = getattr(self._local, "session", None)
+        if session is None:
+            session = requests.Session()
+            session.mount("https://", self._adapter)
+            session.mount("http://", self._adapter)
+            session.headers["key"] = self._options.api_key  # Authentication required.
+            if not self._options.keep_alive:
+                session.headers["Connection"] = "close"
+            with self._sessions_lock:
+                self._sessions.add(session)
+            self._local.session = session
+        return session
+
+    def _call_get(
+        self,
+        endpoint: str,
+        query: _mapping,
+        cache: str | None = None,
+        template: str | None = None,
+        stream: bool = False,
+    ) -> requests.Response:
         """
         Generic GET api call with provided parameters.
-        Parameters override query and header defaults.
-        """
-        base_url = self._options.base_url
-        response = requests.get(
-            urljoin(base_url, endpoint),
-            params=query,
-            headers={"key": self._options.api_key},  # Authentication required.
-            timeout=self._options.default_timeout,
+        Parameters override query and header defaults. `template` is reported to observers.
+        Response is cached if TTL of given cache group is configured. Expired response is
+        revalidated with conditional request if API returned ETag or Last-Modified header.
+        With `stream`, body is not read before returning response and response is not cached.
+        """
+        ttl = self._cache_ttl(cache, stream)
+        if ttl is None:
+            return self._call_api(
+                "GET",
+                endpoint=endpoint,
+                query=query,
+                idempotent=True,
+                template=template,
+                stream=stream,
+            )
+
+        key = ResponseCache.make_key(endpoint, query)
+        entry, fresh = self._cache.get(key)
+        if entry is not None and fresh:
+            return entry.value
+        response = self._call_api(
+            "GET",
+            endpoint=endpoint,
+            query=query,
+            headers=entry.conditional_headers() if entry is not None else None,
+            idempotent=True,
+            template=template,
         )
-        try:
-            response.raise_for_status()  # Raise exception if response status is not OK.
-        except requests.HTTPError as exc:
-            raise ApiConnectionError(response.text) from exc
-        return response
+        return self._cache_response(key, ttl, entry, response)
 
-    def _call_post(self, endpoint: str, json: _mapping) -> requests.Response:
+    def _call_post(
+        self,
+        endpoint: str,
+        json: _mapping | None = None,
+        idempotent: bool = False,
+        template: str | None = None,
+        body: _body_factory | None = None,
+    ) -> requests.Response:
         """
         Generic POST api call with provided parameters.
-        Parameters override query and header defaults.
-        """
-        base_url = self._options.base_url
-        response = requests.post(
-            urljoin(base_url, endpoint),
-            json=json,  # Data must be sent as JSON.
-            headers={"key": self._options.api_key},  # Authentication required.
-            timeout=self._options.default_timeout,
+        Parameters override query and header defaults. `template` is reported to observers.
+        POST is retried on errors only if caller marks it as idempotent.
+        Instead of `json`, encoded JSON can be streamed from chunks returned by `body`.
+        """
+        # Data must be sent as JSON.
+        return self._call_api(
+            "POST",
+            endpoint=endpoint,
+            json=json,
+            headers={"Content-Type": "application/json"} if body is not None else None,
+            idempotent=idempotent,
+            template=template,
+            body=body,
         )
-        try:
-            response.raise_for_status()  # Raise exception if response status is not OK.
-        except requests.HTTPError as exc:
-            raise ApiConnectionError(response.text) from exc
-        return response
 
-    def _call_put(self, endpoint: str, json: _mapping) -> requests.Response:
+    def _call_put(self, endpoint: str, json: _mapping, template: str | None = None) -> requests.Response:
         """
         Generic PUT api call with provided parameters.
-        Parameters override query and header defaults.
-        """
-        base_url = self._options.base_url
-        response = requests.put(
-            urljoin(base_url, endpoint),
-            json=json,  # Data must be sent
-            headers={"key": self._options.api_key},  # Authentication required.
-            timeout=self._options.default_timeout,
-        )
-        try:
-            response.raise_for_status()  # Raise exception if response status is not OK.
-        except requests.HTTPError as exc:
-            raise ApiConnectionError(response.text) from exc
-        return response
+        Parameters override query and header defaults. `template` is reported to observers.
+        """
+        # Data must be sent as JSON.
+        return self._call_api("PUT", endpoint=endpoint, json=json, idempotent=True, template=template)
+
+    def _call_api(
+        self,
+        method: str,
+        endpoint: str,
+        query: _mapping | None = None,
+        json: _mapping | None = None,
+        headers: _mapping | None = None,
+        idempotent: bool = False,
+        template: str | None = None,
+        body: _body_factory | None = None,
+        stream: bool = False,
+    ) -> requests.Response:
+        """
+        Generic api call with provided parameters. Uses pooled session of current thread.
+        Waits for rate limiter before every attempt. Retries according to retry policy:
+        throttled (429) calls are always retried, as they were not processed by API.
+        Server and connection errors are retried only if call is idempotent.
+        Every attempt is reported to observers with endpoint `template`, endpoint itself by default.
+        Chunks of body returned by `body` are sent with chunked transfer encoding,
+        `body` is called again for every attempt.
+        With `stream`, body of successful response is not read, caller must read or close it.
+        Its size is reported to observers from Content-Length header.
+        Raises ApiConnectionError if response status is not OK.
+        """
+        started_at = time.monotonic()
+        attempt = 1
+        while True:
+            throttle_wait = self._rate_limiter.acquire() if self._rate_limiter is not None else 0.0
+            sent_at = time.monotonic()
+            streamed = [0]  # Bytes of streamed body.
+            try:
+                response = self._get_session().request(
+                    method,
+                    urljoin(self._options.base_url, endpoint),
+                    params=query,
+                    json=json,
+                    data=_counted(body(), streamed) if body is not None else None,
+                    headers=headers,
+                    timeout=self._options.default_timeout,
+                    stream=stream,
+                )
+            except (requests.ConnectionError, requests.Timeout) as exc:
+                if self._options.observers:
+                    self._notify_attempt(
+                        method,
+                        template or endpoint,
+                        sent_at,
+                        attempt,
+                        throttle_wait,
+                        request_bytes=(
+                            streamed[0] if body is not None
+                            else _body_size(exc.request.body if exc.request is not None else None)
+                        ),
+                        error=str(exc),
+                    )
+                # Call might have reached API, repeat only if it is safe.
+                delay = self._retry_delay(attempt, started_at) if idempotent else None
+                if delay is None:
+                    raise ApiConnectionError(str(exc)) from exc
+            else:
+                if self._options.observers:
+                    self._notify_attempt(
+                        method,
+                        template or endpoint,
+                        sent_at,
+                        attempt,
+                        throttle_wait,
+                        request_bytes=(
+                            streamed[0] if body is not None
+                            else _body_size(response.request.body if response.request is not None else None)
+                        ),
+                        response=response,
+                        stream=stream,
+                    )
+                try:
+                    response.raise_for_status()  # Raise exception if response status is not OK.
+                    return response
+                except requests.HTTPError as exc:
+                    delay = None
+                    if idempotent or response.status_code == 429:
+                        delay = self._retry_delay(attempt, started_at, response.status_code, response.headers)
+                    if delay is None:
+                        raise ApiConnectionError(response.text, status_code=response.status_code) from exc
+                response.close()  # Release connection back to pool.
+            time.sleep(delay)
+            attempt += 1
     # endregion
+
+
+class _StatsFanOut:
+    """
+    Schedules pages of detailed statistics of many campaigns and assembles fetched pages.
+    Campaigns are started in given order. Pages are queued by priority of their campaign,
+    so following pages of started campaign are fetched before first page of next campaign.
+    """
+    _queue: list[tuple[int, int, int]]  # Heap of priority, page and campaign ID.
+    _priority: dict[int, int]
+    _pages: dict[int, dict[int, list[CampaignStatsDetailSubscriber]]]  # Fetched pages of unfinished campaigns.
+    _last_page: dict[int, int | None]  # None while number of pages is not known.
+    _count: dict[int, int]  # Fetched subscribers.
+    _failed: set[int]
+
+    def __init__(self, campaign_ids: list[int]) -> None:
+        self._priority = {_c: _i for _i, _c in enumerate(campaign_ids)}
+        self._queue = [(_i, 1, _c) for _c, _i in self._priority.items()]  # Sorted list is a heap.
+        self._pages = {}
+        self._last_page = {}
+        self._count = {}
+        self._failed = set()
+
+    def next_page(self) -> tuple[int, int] | None:
+        """
+        Returns campaign ID and number of next page to fetch. None if no page is queued now.
+        """
+        while self._queue:
+            _, page, campaign_id = heapq.heappop(self._queue)
+            if campaign_id not in self._failed:
+                return campaign_id, page
+        return None
+
+    def page_done(
+        self,
+        campaign_id: int,
+        page: int,
+        json_data: dict[str, Any],
+        subscribers: list[CampaignStatsDetailSubscriber],
+    ) -> CampaignStatsResult | None:
+        """
+        Stores fetched page and queues following pages. Returns result if campaign is complete.
+        """
+        if campaign_id in self._failed:
+            return None
+        pages = self._pages.setdefault(campaign_id, {})
+        pages[page] = subscribers
+        self._last_page.setdefault(campaign_id, None)
+        self._count[campaign_id] = count = self._count.get(campaign_id, 0) + len(pages[page])
+
+        total, per_page = json_data.get("total"), json_data.get("per_page")
+        if page == 1 and total and per_page:
+            # All pages are known, queue them at once.
+            self._last_page[campaign_id] = math.ceil(total / per_page)
+            for next_page in range(2, self._last_page[campaign_id] + 1):
+                heapq.heappush(self._queue, (self._priority[campaign_id], next_page, campaign_id))
+        elif self._last_page[campaign_id] is None:
+            # Pages are followed one by one.
+            if json_data.get("next_page_url") and (total is None or count < total):
+                heapq.heappush(self._queue, (self._priority[campaign_id], page + 1, campaign_id))
+            else:
+                self._last_page[campaign_id] = page
+
+        last_page = self._last_page[campaign_id]
+        if last_page is None or len(pages) < last_page:
+            return None
+        del self._pages[campaign_id]
+        subscribers = [_s for _p in sorted(pages) for _s in pages[_p]]
+        return CampaignStatsResult(campaign_id=campaign_id, stats=CampaignStatsDetail(subscribers=subscribers))
+
+    def page_failed(self, campaign_id: int, error: EcoMailError) -> CampaignStatsResult | None:
+        """
+        Drops pages of campaign. Returns result with error, None if campaign already failed.
+        """
+        if campaign_id in self._failed:
+            return None
+        self._failed.add(campaign_id)
+        self._pages.pop(campaign_id, None)
+        return CampaignStatsResult(campaign_id=campaign_id, error=error)
+
+
+class _CampaignPages:
+    """
+    Parses pages of campaigns list for iter_campaigns. Filters campaigns newer than `since_id`
+    or included by ID and detects when following pages contain only older campaigns.
+    """
+    since_id: int | None
+    remaining: set[int]  # Included campaigns not found yet.
+    stopped: bool  # Following pages contain only older campaigns.
+
+    def __init__(self, since_id: int | None, include_ids: Iterable[int]) -> None:
+        self.since_id = since_id
+        self.remaining = set(include_ids)
+        self.stopped = False
+
+    def parse(self, json_data: list[_mapping] | _mapping) -> tuple[list[Campaign], bool]:
+        """
+        Returns campaigns of page to yield and whether next page exists.
+        """
+        if isinstance(json_data, list):
+            page_data, next_page_url = json_data, None
+        else:
+            page_data, next_page_url = json_data["data"], json_data.get("next_page_url")
+        page_ids = [int(_c["id"]) for _c in page_data]
+        campaigns: list[Campaign] = []
+        for campaign_id, data in zip(page_ids, page_data):
+            if self.since_id is None or campaign_id > self.since_id or campaign_id in self.remaining:
+                self.remaining.discard(campaign_id)
+                campaigns.append(Campaign.from_trusted_dict(data))
+
+        newest_first = all(_a > _b for _a, _b in zip(page_ids, page_ids[1:]))
+        self.stopped = self.since_id is not None and bool(page_ids) and newest_first and page_ids[-1] <= self.since_id
+        return campaigns, bool(next_page_url)
+
+
+class _StatsPages:
+    """
+    Follows pages of detailed statistics of single campaign fetched one by one.
+    """
+    following: range | None  # Pages after start page, None if number of pages is not known.
+    _total: int | None
+    _page: int  # Last fetched page.
+    _count: int  # Subscribers up to last fetched page.
+
+    def __init__(self, json_data: _mapping, start_page: int, count: int) -> None:
+        self._total, per_page = json_data.get("total"), json_data.get("per_page")
+        self.following = None
+        if self._total and per_page:
+            self.following = range(start_page + 1, math.ceil(self._total / per_page) + 1)
+        self._page = start_page
+        self._count = (start_page - 1) * (per_page or 0) + count
+
+    def next_page(self, json_data: _mapping) -> int | None:
+        """
+        Returns number of page following the last fetched one, None if it was the last page.
+        """
+        self._total = json_data.get("total")
+        if self._total is not None and self._count >= self._total:
+            return None
+        if not json_data.get("next_page_url"):
+            return None
+        self._page += 1
+        return self._page
+
+    def page_done(self, count: int) -> None:
+        """
+        Counts subscribers of fetched page.
+        """
+        self._count += count
+
+
+class _SubscriberLookup:
+    """
+    Collects results of looking up subscribers by email for get_subscribers_details.
+    """
+    emails: list[str]
+    _found: dict[str, Subscriber]
+    _not_found: set[str]
+    _failed: dict[str, EcoMailError]
+
+    def __init__(self, emails: Iterable[str]) -> None:
+        self.emails = list(dict.fromkeys(emails))  # Without duplicates, in input order.
+        self._found = {}
+        self._not_found = set()
+        self._failed = {}
+
+    def found(self, email: str, subscriber: Subscriber) -> None:
+        """
+        Stores subscriber found by lookup.
+        """
+        self._found[email] = subscriber
+
+    def failed(self, email: str, error: EcoMailError) -> None:
+        """
+        Stores failed lookup. Subscriber not in the list is reported as not found, not as failure.
+        """
+        if _is_not_found(error):
+            self._not_found.add(email)
+        else:
+            self._failed[email] = error
+
+    def result(self) -> SubscriberLookupResult:
+        """
+        Returns result in input order of emails.
+        """
+        return SubscriberLookupResult(
+            found={_e: self._found[_e] for _e in self.emails if _e in self._found},
+            not_found=[_e for _e in self.emails if _e in self._not_found],
+            failed={_e: self._failed[_e] for _e in self.emails if _e in self._failed},
+        )
+
+
+
+def _campaigns_by_size(
+    campaigns: Iterable[Campaign],
+    campaign_ids: Iterable[int] | None,
+    statuses: Iterable[CampaignStatus] | None,
+) -> list[int]:
+    """
+    Returns IDs of given campaigns, or of listed campaigns in given statuses, from the fewest recipients.
+    Given campaigns missing in campaigns list come last.
+    """
+    statuses = set(statuses) if statuses is not None else None
+    recipients = {_c.id: _c.recipients for _c in campaigns if statuses is None or _c.status in statuses}
+    if campaign_ids is None:
+        campaign_ids = recipients
+    elif statuses is not None:
+        campaign_ids = [_i for _i in campaign_ids if _i in recipients]
+    return sorted(dict.fromkeys(campaign_ids), key=lambda _i: recipients.get(_i, math.inf))
+
+
+def _counted(chunks: Iterable[bytes], counter: list[int]) -> Iterator[bytes]:
+    """
+    Yields chunks of streamed body, adding their size to counter.
+    """
+    for chunk in chunks:
+        counter[0] += len(chunk)
+        yield chunk
+
+
+def _body_size(body: str | bytes | None) -> int:
+    """
+    Returns size of request body in bytes.
+    """
+    if body is None:
+        return 0
+    return len(body.encode() if isinstance(body, str) else body)
+
+
+def _is_not_found(exc: EcoMailError) -> bool:
+    """
+    Checks if subscriber lookup failed because subscriber is not in the list.
+    """
+    return isinstance(exc, ApiRequestError) or (isinstance(exc, ApiConnectionError) and exc.status_code == 404)
+
+
+def _created_id(json_data: _mapping, name: str) -> int:
+    """
+    Returns ID of created list or subscriber.
+    """
+    try:
+        return json_data["id"]
+    except KeyError as exc:
+        raise ApiConnectionError(f"{name} ID could not be retrieved.") from exc
+
+
+def _check_bulk_limit(count: int) -> None:
+    """
+    Checks number of subscribers sent to bulk endpoint in single call.
+    """
+    if count > BULK_LIMIT:
+        raise ApiRequestError("Bulk endpoint is limited to 3000 subscribers.")
+
+
+def _bulk_update_data(updates: dict[str, _mapping]) -> list[_mapping]:
+    """
+    Returns subscriber data of bulk update, keyed by email.
+    """
+    _check_bulk_limit(len(updates))
+    return [{**_d, "email": _e} for _e, _d in updates.items()]
+
+
+def _chunk_result(list_id: int, index: int, count: int, content: bytes) -> BulkChunkResult:
+    """
+    Returns result of imported chunk from response body of bulk endpoint.
+    """
+    job = BulkJob.from_body(list_id, count, content)
+    return BulkChunkResult(index=index, count=count, job_id=job.job_id if job is not None else None, job=job)
+
+
+def _update_bulk_job(job: BulkJob, content: bytes) -> BulkJob:
+    """
+    Updates status of bulk job from response body of job status endpoint.
+    """
+    try:
+        json_data: _mapping = loads(content)
+        job.status = BulkJobStatus.from_api(json_data.get("status"))
+    except (ValueError, AttributeError) as exc:
+        raise ApiConnectionError(f"Status of bulk job {job.job_id} could not be retrieved.") from exc
+    return job
+
+
+def _bulk_job_queues(jobs: Iterable[BulkJob]) -> dict[int, deque[BulkJob]]:
+    """
+    Returns unfinished jobs queued by list, oldest first. Only the first job of each list is polled.
+    """
+    queues: dict[int, deque[BulkJob]] = {}
+    for job in sorted(jobs, key=lambda _j: _j.job_id):
+        if not job.finished:
+            queues.setdefault(job.list_id, deque()).append(job)
+    return queues
+
+
+def _campaign_from_response(json_data: _mapping) -> Campaign:
+    """
+    Returns campaign from response body of campaign detail endpoint.
+    """
+    return Campaign.from_trusted_dict(json_data.get("campaign", json_data))
+
+
+def _subscriber_from_response(json_data: _mapping) -> Subscriber:
+    """
+    Returns subscriber from response body of subscriber detail endpoint.
+    """
+    try:
+        return Subscriber.from_trusted_dict(json_data["subscriber"])
+    except KeyError as exc:
+        raise ApiRequestError("Subscriber not found.") from exc
+
+
+def _stats_detail_page(content: bytes) -> tuple[_mapping, list[CampaignStatsDetailSubscriber]]:
+    """
+    Returns page of detailed campaign statistics and its subscribers from whole response body.
+    """
+    json_data: _mapping = loads(content)
+    return json_data, CampaignStatsDetailSubscriber.list_from_dict(json_data["subscribers"])
+
+
+def _collect_to(subscribers: list[CampaignStatsDetailSubscriber]) -> Callable[[str, _mapping], None]:
+    """
+    Returns callback of streamed page decoder appending subscribers to given list.
+    """
+    from_trusted_dict = CampaignStatsDetailSubscriber.from_trusted_dict
+    return lambda _e, _d: subscribers.append(from_trusted_dict(_e, _d))
@@ -2,12 +2,12 @@ from __future__ import annotations
 
 from dataclasses import dataclass
 
-from ecomail.exceptions import SubscriberError
-from ecomail.utils import is_empty_or_whitespace
+from ecomail.exceptions import EcoMailError, SubscriberError
+from ecomail.utils import is_empty_or_whitespace, slot_setters
 
 
-# Require keyword arguments and make objects frozen.
-@dataclass(kw_only=True, frozen=True)
+# Require keyword arguments and make objects frozen. Slots reduce memory and attribute access time.
+@dataclass(kw_only=True, frozen=True, slots=True)
 class Subscriber:
     """
     Subscriber contact data. Requires keyword arguments. Frozen class (values cannot be reassigned).
@@ -56,3 +56,40 @@ class Subscriber:
             country=data.get("country"),
             tags=data.get("tags"),
         )
+
+    @classmethod
+    def from_trusted_dict(cls, data: dict[str, str | list[str]]) -> Subscriber:
+        """
+        Creates Subscriber object from dict returned by API.
+        Fast path, skips dataclass __init__ and validation. Use only for valid data.
+        """
+        obj = object.__new__(cls)
+        set_name, set_surname, set_email, set_phone, set_country, set_tags = _SUBSCRIBER_SETTERS
+        set_name(obj, data["name"])
+        set_surname(obj, data["surname"])
+        set_email(obj, data["email"])
+        set_phone(obj, data.get("phone"))
+        set_country(obj, data.get("country"))
+        set_tags(obj, data.get("tags"))
+        return obj
+
+
+_SUBSCRIBER_SETTERS = slot_setters(Subscriber, "name", "surname", "email", "phone", "country", "tags")
+
+
+@dataclass(kw_only=True, frozen=True)
+class SubscriberLookupResult:
+    """
+    Result of lookup of many subscribers. Requires keyword arguments. Frozen class (values cannot be reassigned).
+    Emails are in input order, without duplicates.
+    """
+    found: dict[str, Subscriber]  # Maps emails to subscriber details.
+    not_found: list[str]  # Emails not in the list.
+    failed: dict[str, EcoMailError]  # Maps emails to errors of lookups that could not be completed.
+
+    @property
+    def ok(self) -> bool:
+        """
+        True if every lookup was completed, found or not.
+        """
+        return not self.failed
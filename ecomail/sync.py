@@ -0,0 +1,233 @@
+from __future__ import annotations
+
+import dataclasses
+import hashlib
+import json
+import os
+import sqlite3
+import time
+from types import TracebackType
+from typing import Any, Iterable, Iterator
+
+from ecomail.bulk import BulkChunkResult, BulkImportResult
+from ecomail.campaign import Campaign
+from ecomail.service import DEFAULT_MAX_WORKERS, EcoMailService
+from ecomail.subscriber import Subscriber
+from ecomail.utils import chunked, write_json_atomic
+
+
+LOOKUP_BATCH_SIZE = 500  # Emails looked up in single query, below SQLite variable limit.
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS subscriber_state (
+    list_id INTEGER NOT NULL,
+    email TEXT NOT NULL,
+    fingerprint TEXT NOT NULL,
+    synced_at REAL NOT NULL,
+    PRIMARY KEY (list_id, email)
+) WITHOUT ROWID
+"""
+
+
+def subscriber_fingerprint(subscriber: Subscriber) -> str:
+    """
+    Returns fingerprint of subscriber data sent to API. Equal data has equal fingerprint.
+    """
+    data = json.dumps(subscriber.as_dict(), sort_keys=True, separators=(",", ":"))
+    return hashlib.sha1(data.encode(), usedforsecurity=False).hexdigest()
+
+
+@dataclasses.dataclass(kw_only=True, frozen=True)
+class SyncResult:
+    """
+    Result of subscriber sync. Requires keyword arguments. Frozen class (values cannot be reassigned).
+    """
+    unchanged: int  # Subscribers skipped, API already has their data.
+    import_result: BulkImportResult  # Import of new and changed subscribers.
+
+    @property
+    def sent(self) -> int:
+        """
+        Number of new and changed subscribers sent to API.
+        """
+        return self.import_result.total
+
+    @property
+    def failed(self) -> int:
+        """
+        Number of subscribers in chunks rejected by API. They are sent again on next sync.
+        """
+        return self.import_result.total - self.import_result.imported
+
+
+class SubscriberSync:
+    """
+    Syncs subscribers to lists, sending only new or changed subscribers.
+    Fingerprint of data of every subscriber acknowledged by API is kept per list in local SQLite
+    database. Subscribers with unchanged fingerprint are skipped on next sync.
+    State is only updated by the sync, changes made elsewhere (eg. in Ecomail app) are not detected,
+    call forget() to send subscribers again.
+    """
+    _service: EcoMailService
+    _connection: sqlite3.Connection
+    _max_workers: int
+
+    def __init__(
+        self,
+        service: EcoMailService,
+        db_path: str | os.PathLike[str],
+        max_workers: int = DEFAULT_MAX_WORKERS,
+    ) -> None:
+        self._service = service
+        self._max_workers = max_workers
+        self._connection = sqlite3.connect(db_path)
+        self._connection.execute(_SCHEMA)
+        self._connection.commit()
+
+    def __enter__(self) -> SubscriberSync:
+        return self
+
+    def __exit__(
+        self,
+        exc_type: type[BaseException] | None,
+        exc_val: BaseException | None,
+        exc_tb: TracebackType | None,
+    ) -> None:
+        self.close()
+
+    def close(self) -> None:
+        """
+        Closes state database.
+        """
+        self._connection.close()
+
+    def sync(self, list_id: int, subscribers: Iterable[Subscriber]) -> SyncResult:
+        """
+        Sends new and changed subscribers to given list in bulk. Records subscribers of chunks
+        acknowledged by API. Iterable is consumed lazily.
+        """
+        unchanged = [0]
+
+        def changed_subscribers() -> Iterator[Subscriber]:
+            for batch in chunked(subscribers, LOOKUP_BATCH_SIZE):
+                stored = self._get_fingerprints(list_id, [_s.email for _s in batch])
+                for subscriber in batch:
+                    if stored.get(subscriber.email) == subscriber_fingerprint(subscriber):
+                        unchanged[0] += 1
+                    else:
+                        yield subscriber
+
+        def record_chunk(result: BulkChunkResult, chunk: list[Subscriber]) -> None:
+            if result.ok:
+                self._set_fingerprints(list_id, chunk)
+
+        import_result = self._service.import_subscribers_to_list(
+            list_id,
+            changed_subscribers(),
+            max_workers=self._max_workers,
+            on_chunk=record_chunk,
+        )
+        return SyncResult(unchanged=unchanged[0], import_result=import_result)
+
+    def forget(self, list_id: int, emails: Iterable[str] | None = None) -> None:
+        """
+        Removes state of given emails, or of whole list. They are sent again on next sync.
+        """
+        with self._connection:
+            if emails is None:
+                self._connection.execute("DELETE FROM subscriber_state WHERE list_id = ?", (list_id,))
+            else:
+                self._connection.executemany(
+                    "DELETE FROM subscriber_state WHERE list_id = ? AND email = ?",
+                    ((list_id, _e) for _e in emails),
+                )
+
+    def _get_fingerprints(self, list_id: int, emails: list[str]) -> dict[str, str]:
+        """
+        Returns stored fingerprints of given emails in list.
+        """
+        placeholders = ",".join("?" * len(emails))
+        rows = self._connection.execute(
+            f"SELECT email, fingerprint FROM subscriber_state WHERE list_id = ? AND email IN ({placeholders})",
+            (list_id, *emails),
+        )
+        return dict(rows)
+
+    def _set_fingerprints(self, list_id: int, subscribers: list[Subscriber]) -> None:
+        """
+        Stores fingerprints of subscribers acknowledged by API.
+        """
+        synced_at = time.time()
+        with self._connection:
+            self._connection.executemany(
+                "INSERT OR REPLACE INTO subscriber_state (list_id, email, fingerprint, synced_at) VALUES (?, ?, ?, ?)",
+                ((list_id, _s.email, subscriber_fingerprint(_s), synced_at) for _s in subscribers),
+            )
+
+
+@dataclasses.dataclass(kw_only=True, frozen=True)
+class CampaignSyncState:
+    """
+    State of campaign sync. Requires keyword arguments. Frozen class (values cannot be reassigned).
+    """
+    high_water_id: int | None = None  # Highest campaign ID seen, None before first sync.
+    open_ids: frozenset[int] = frozenset()  # Campaigns seen in status that may still change.
+
+    @classmethod
+    def from_dict(cls, data: dict[str, Any]) -> CampaignSyncState:
+        """
+        Creates CampaignSyncState object from dict.
+        """
+        return cls(
+            high_water_id=data["high_water_id"],
+            open_ids=frozenset(data["open_ids"]),
+        )
+
+    def as_dict(self) -> dict[str, Any]:
+        """
+        Returns state as JSON serializable dict, see from_dict().
+        """
+        return {
+            "high_water_id": self.high_water_id,
+            "open_ids": sorted(self.open_ids),
+        }
+
+
+class CampaignSync:
+    """
+    Syncs campaign list incrementally. High-water mark (highest campaign ID)
+    and IDs of campaigns in status that may still change are kept in local JSON file.
+    Following syncs only parse new campaigns and campaigns that were not final yet,
+    campaigns already sent or errored are skipped. If API returns campaigns from the newest,
+    paging stops at the first page of already synced campaigns.
+    """
+    _service: EcoMailService
+    _state_path: str
+    state: CampaignSyncState
+
+    def __init__(self, service: EcoMailService, state_path: str | os.PathLike[str]) -> None:
+        self._service = service
+        self._state_path = os.fspath(state_path)
+        self.state = CampaignSyncState()
+        if os.path.exists(self._state_path):
+            with open(self._state_path, encoding="utf-8") as f:
+                self.state = CampaignSyncState.from_dict(json.load(f))
+
+    def sync(self) -> list[Campaign]:
+        """
+        Returns new campaigns and campaigns whose status may have changed since last sync.
+        Returns all campaigns on first sync. State is saved after all pages are fetched.
+        """
+        state = self.state
+        campaigns = list(self._service.iter_campaigns(since_id=state.high_water_id, include_ids=state.open_ids))
+
+        high_water_id = state.high_water_id
+        for campaign in campaigns:
+            if high_water_id is None or campaign.id > high_water_id:
+                high_water_id = campaign.id
+        self.state = CampaignSyncState(
+            high_water_id=high_water_id,
+            open_ids=frozenset(_c.id for _c in campaigns if not _c.status.is_final),
+        )
+        write_json_atomic(self._state_path, self.state.as_dict())
+        return campaigns
@@ -0,0 +1,459 @@
+"""
+Local stand-in of Ecomail API for integration and load tests.
+Implements endpoints called by EcoMailService, generates campaign stats at configurable scale,
+enforces bulk limit and rate limit, and injects latency and errors on demand.
+
+Run in-process with `with FakeEcoMailServer() as server: ...` and point service to `server.url`,
+or as subprocess with `python -m ecomail.testing --port 8000`.
+"""
+from __future__ import annotations
+
+import argparse
+import collections
+import dataclasses
+import datetime
+import json
+import math
+import random
+import re
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from types import TracebackType
+from typing import Any, Callable
+from urllib.parse import parse_qs, unquote, urlsplit
+
+from ecomail.bulk import BULK_LIMIT
+
+
+_response = tuple[int, Any, dict[str, str]]  # Status code, JSON body and headers.
+
+
+@dataclasses.dataclass(kw_only=True, frozen=True)
+class FakeServerOptions:
+    """
+    Behavior of fake server. Requires keyword arguments. Frozen class (values cannot be reassigned).
+    """
+    campaigns: int = 10  # Campaigns returned by campaigns list, IDs start with 1.
+    campaigns_per_page: int | None = None  # Paginates campaigns list from the newest, None returns plain list.
+    stats_subscribers: int = 1000  # Subscribers in stats detail of every campaign.
+    stats_per_page: int = 100
+    bulk_job_duration: float = 0  # Seconds until bulk import job is done.
+    rate_limit_calls: int | None = 1000  # Calls per API key in period, None disables limit.
+    rate_limit_period: float = 60  # 60s.
+    latency: float = 0  # Seconds added to every response.
+    latency_jitter: float = 0  # Up to given seconds added randomly to latency.
+    error_rate: float = 0  # Probability of error response, between 0 and 1.
+    error_status: int = 500
+    seed: int | None = None  # Seed of random latency and errors.
+
+
+class FakeEcoMailServer:
+    """
+    Threaded HTTP server emulating Ecomail API. Keeps lists and subscribers in memory.
+    Every request is counted against rate limit of its API key, throttled requests get
+    429 response with Retry-After header. Supports keep-alive connections.
+    """
+    _options: FakeServerOptions
+    _server: ThreadingHTTPServer
+    _thread: threading.Thread | None
+    _lock: threading.Lock
+    _random: random.Random
+    _clock: Callable[[], float]
+    _windows: dict[str, collections.deque[float]]
+    _forced_errors: collections.deque[int]
+    _lists: dict[int, dict[str, dict[str, Any]]]
+    _jobs: dict[int, tuple[int, float]]  # Bulk job IDs mapped to list ID and time when job is done.
+    _next_id: int
+    _request_count: int
+
+    def __init__(
+        self,
+        options: FakeServerOptions | None = None,
+        host: str = "127.0.0.1",
+        port: int = 0,  # Random free port.
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        self._options = options or FakeServerOptions()
+        self._thread = None
+        self._lock = threading.Lock()
+        self._random = random.Random(self._options.seed)
+        self._clock = clock
+        self._windows = {}
+        self._forced_errors = collections.deque()
+        self._lists = {}
+        self._jobs = {}
+        self._next_id = 1
+        self._request_count = 0
+        self._server = ThreadingHTTPServer((host, port), _make_handler(self))
+        self._server.daemon_threads = True
+
+    def __enter__(self) -> FakeEcoMailServer:
+        self.start()
+        return self
+
+    def __exit__(
+        self,
+        exc_type: type[BaseException] | None,
+        exc_val: BaseException | None,
+        exc_tb: TracebackType | None,
+    ) -> None:
+        self.stop()
+
+    @property
+    def options(self) -> FakeServerOptions:
+        """
+        Behavior of server.
+        """
+        return self._options
+
+    @property
+    def url(self) -> str:
+        """
+        Base URL of server, to be used as base_url of service options.
+        """
+        host, port = self._server.server_address[:2]
+        return f"http://{host}:{port}/"
+
+    @property
+    def request_count(self) -> int:
+        """
+        Number of handled requests, throttled ones included.
+        """
+        return self._request_count
+
+    def start(self) -> None:
+        """
+        Serves requests in background thread.
+        """
+        self._thread = threading.Thread(target=self._server.serve_forever, args=(0.05,), daemon=True)
+        self._thread.start()
+
+    def stop(self) -> None:
+        """
+        Stops serving and closes server socket.
+        """
+        if self._thread is not None:
+            self._server.shutdown()
+            self._thread.join()
+            self._thread = None
+        self._server.server_close()
+
+    def serve_forever(self) -> None:
+        """
+        Serves requests in current thread until interrupted.
+        """
+        try:
+            self._server.serve_forever()
+        finally:
+            self._server.server_close()
+
+    def fail_next(self, count: int = 1, status: int = 500) -> None:
+        """
+        Makes next `count` requests fail with given status, regardless of error rate.
+        """
+        with self._lock:
+            self._forced_errors.extend([status] * count)
+
+    def subscribers(self, list_id: int) -> dict[str, dict[str, Any]]:
+        """
+        Returns copy of subscriber data of list, mapping emails to data.
+        """
+        with self._lock:
+            return {_e: dict(_d) for _e, _d in self._lists.get(list_id, {}).items()}
+
+    def handle(self, method: str, path: str, query: dict[str, str], headers: Any, body: Any) -> _response:
+        """
+        Returns response to request. Applies authentication, rate limit and injected errors
+        before routing request to endpoint.
+        """
+        with self._lock:
+            self._request_count += 1
+        api_key = headers.get("key")
+        if not api_key:
+            return 401, {"message": "Missing API key."}, {}
+        retry_after = self._throttle(api_key)
+        if retry_after is not None:
+            return 429, {"message": "Too Many Attempts."}, {"Retry-After": str(retry_after)}
+        if error := self._error():
+            return error, {"message": "Injected error."}, {}
+
+        for route_method, pattern, handler in _ROUTES:
+            if method == route_method and (match := pattern.fullmatch(path)):
+                return handler(self, *match.groups(), query=query, body=body)
+        return 404, {"message": "Not found."}, {}
+
+    def _throttle(self, api_key: str) -> int | None:
+        """
+        Counts request in sliding window of API key. Returns seconds to wait if limit is exceeded.
+        """
+        calls, period = self._options.rate_limit_calls, self._options.rate_limit_period
+        if calls is None:
+            return None
+        now = self._clock()
+        with self._lock:
+            window = self._windows.setdefault(api_key, collections.deque())
+            while window and window[0] <= now - period:
+                window.popleft()
+            if len(window) >= calls:
+                return max(1, math.ceil(window[0] + period - now))
+            window.append(now)
+            return None
+
+    def _error(self) -> int | None:
+        """
+        Returns status of injected error, None if request should succeed.
+        Also sleeps for configured latency.
+        """
+        with self._lock:
+            latency = self._options.latency + self._random.uniform(0, self._options.latency_jitter)
+            if self._forced_errors:
+                error = self._forced_errors.popleft()
+            elif self._random.random() < self._options.error_rate:
+                error = self._options.error_status
+            else:
+                error = None
+        if latency:
+            time.sleep(latency)
+        return error
+
+    def _new_id(self) -> int:
+        with self._lock:
+            self._next_id += 1
+            return self._next_id - 1
+
+    # region Endpoints.
+    # noinspection PyUnusedLocal
+    def _add_new_list(self, query: dict[str, str], body: Any) -> _response:
+        list_id = self._new_id()
+        with self._lock:
+            self._lists[list_id] = {}
+        return 201, {"id": list_id, "name": body["name"]}, {}
+
+    # noinspection PyUnusedLocal
+    def _subscribe(self, list_id: str, query: dict[str, str], body: Any) -> _response:
+        data = body["subscriber_data"]
+        with self._lock:
+            self._lists.setdefault(int(list_id), {}).setdefault(data["email"], {}).update(data)
+        return 200, {"id": self._new_id(), **data}, {}
+
+    # noinspection PyUnusedLocal
+    def _subscribe_bulk(self, list_id: str, query: dict[str, str], body: Any) -> _response:
+        subscriber_data = body["subscriber_data"]
+        if len(subscriber_data) > BULK_LIMIT:
+            return 422, {"message": f"Maximum of {BULK_LIMIT} subscribers is allowed."}, {}
+        with self._lock:
+            subscribers = self._lists.setdefault(int(list_id), {})
+            for data in subscriber_data:
+                subscribers.setdefault(data["email"], {}).update(data)
+        job_id = self._new_id()
+        with self._lock:
+            self._jobs[job_id] = (int(list_id), self._clock() + self._options.bulk_job_duration)
+        return 200, {"job_id": job_id, "inserts": len(subscriber_data)}, {}
+
+    # noinspection PyUnusedLocal
+    def _get_bulk_job(self, list_id: str, job_id: str, query: dict[str, str], body: Any) -> _response:
+        with self._lock:
+            job = self._jobs.get(int(job_id))
+        if job is None or job[0] != int(list_id):
+            return 404, {"message": "Job not found."}, {}
+        return 200, {"id": int(job_id), "status": "done" if self._clock() >= job[1] else "pending"}, {}
+
+    # noinspection PyUnusedLocal
+    def _get_subscriber(self, list_id: str, email: str, query: dict[str, str], body: Any) -> _response:
+        with self._lock:
+            data = self._lists.get(int(list_id), {}).get(unquote(email))
+        if data is None:
+            return 404, {"message": "Subscriber not found."}, {}
+        return 200, {"subscriber": {"name": "", "surname": "", **data}}, {}
+
+    # noinspection PyUnusedLocal
+    def _update_subscriber(self, list_id: str, query: dict[str, str], body: Any) -> _response:
+        with self._lock:
+            data = self._lists.get(int(list_id), {}).get(body["email"])
+            if data is not None:
+                data.update(body["subscriber_data"])
+        if data is None:
+            return 404, {"message": "Subscriber not found."}, {}
+        return 200, {"email": body["email"]}, {}
+
+    # noinspection PyUnusedLocal
+    def _get_campaigns(self, query: dict[str, str], body: Any) -> _response:
+        total, per_page = self._options.campaigns, self._options.campaigns_per_page
+        if per_page is None:
+            return 200, [self._campaign(_i) for _i in range(1, total + 1)], {}
+        page = int(query.get("page", 1))
+        last_page = max(1, math.ceil(total / per_page))
+        start = total - (page - 1) * per_page
+        return 200, {
+            "current_page": page,
+            "last_page": last_page,
+            "per_page": per_page,
+            "total": total,
+            "next_page_url": f"{self.url}campaigns?page={page + 1}" if page < last_page else None,
+            "prev_page_url": f"{self.url}campaigns?page={page - 1}" if page > 1 else None,
+            "data": [self._campaign(_i) for _i in range(start, max(0, start - per_page), -1)],
+        }, {}
+
+    # noinspection PyUnusedLocal
+    def _get_campaign(self, campaign_id: str, query: dict[str, str], body: Any) -> _response:
+        if not 1 <= int(campaign_id) <= self._options.campaigns:
+            return 404, {"message": "Campaign not found."}, {}
+        return 200, self._campaign(int(campaign_id)), {}
+
+    # noinspection PyUnusedLocal
+    def _get_stats_detail(self, campaign_id: str, query: dict[str, str], body: Any) -> _response:
+        total, per_page = self._options.stats_subscribers, self._options.stats_per_page
+        page = int(query.get("page", 1))
+        last_page = max(1, math.ceil(total / per_page))
+        start = (page - 1) * per_page
+        subscribers = {
+            f"subscriber{_i}@example.com": {"open": _i % 3, "send": 1, "click": _i % 7 // 5}
+            for _i in range(start, min(start + per_page, total))
+        }
+        path = f"campaigns/{campaign_id}/stats-detail"
+        return 200, {
+            "current_page": page,
+            "last_page": last_page,
+            "per_page": per_page,
+            "total": total,
+            "next_page_url": f"{self.url}{path}?page={page + 1}" if page < last_page else None,
+            "prev_page_url": f"{self.url}{path}?page={page - 1}" if page > 1 else None,
+            "subscribers": subscribers,
+        }, {}
+    # endregion
+
+    def _campaign(self, campaign_id: int) -> dict[str, Any]:
+        """
+        Returns data of generated campaign.
+        """
+        sent_at = datetime.datetime(2024, 1, 1) + datetime.timedelta(days=campaign_id)
+        return {
+            "id": campaign_id,
+            "from_name": "Example from name",
+            "from_email": "sender@example.com",
+            "reply_to": "replyto@example.com",
+            "title": f"Campaign {campaign_id}",
+            "subject": f"Subject {campaign_id}",
+            "sent_at": sent_at.strftime("%Y-%m-%d %H:%M:%S"),
+            "recipients": self._options.stats_subscribers,
+            "status": 3,
+        }
+
+
+_ROUTES: list[tuple[str, re.Pattern[str], Callable[..., _response]]] = [
+    ("POST", re.compile(r"lists"), FakeEcoMailServer._add_new_list),
+    ("POST", re.compile(r"lists/(\d+)/subscribe"), FakeEcoMailServer._subscribe),
+    ("POST", re.compile(r"lists/(\d+)/subscribe-bulk"), FakeEcoMailServer._subscribe_bulk),
+    ("GET", re.compile(r"lists/(\d+)/subscribe-bulk/(\d+)"), FakeEcoMailServer._get_bulk_job),
+    ("GET", re.compile(r"lists/(\d+)/subscriber/([^/]+)"), FakeEcoMailServer._get_subscriber),
+    ("PUT", re.compile(r"lists/(\d+)/update-subscriber"), FakeEcoMailServer._update_subscriber),
+    ("GET", re.compile(r"campaigns"), FakeEcoMailServer._get_campaigns),
+    ("GET", re.compile(r"campaigns/(\d+)"), FakeEcoMailServer._get_campaign),
+    ("GET", re.compile(r"campaigns/(\d+)/stats-detail"), FakeEcoMailServer._get_stats_detail),
+]
+
+
+def _make_handler(server: FakeEcoMailServer) -> type[BaseHTTPRequestHandler]:
+    """
+    Returns request handler class bound to fake server.
+    """
+
+    class Handler(BaseHTTPRequestHandler):
+        protocol_version = "HTTP/1.1"  # Keep-alive.
+        disable_nagle_algorithm = True  # Headers and body are written separately.
+
+        def do_GET(self) -> None:
+            self._respond()
+
+        def do_POST(self) -> None:
+            self._respond()
+
+        def do_PUT(self) -> None:
+            self._respond()
+
+        # noinspection PyShadowingBuiltins
+        def log_message(self, format: str, *args: Any) -> None:
+            pass  # Requests are not logged.
+
+        def _respond(self) -> None:
+            url = urlsplit(self.path)
+            query = {_k: _v[-1] for _k, _v in parse_qs(url.query).items()}
+            try:
+                data = self._read_body()
+                body = json.loads(data) if data else None
+                status, data, headers = server.handle(self.command, url.path.strip("/"), query, self.headers, body)
+            except (ValueError, KeyError, TypeError):
+                status, data, headers = 400, {"message": "Invalid request."}, {}
+            payload = json.dumps(data).encode()
+            self.send_response(status)
+            self.send_header("Content-Type", "application/json")
+            self.send_header("Content-Length", str(len(payload)))
+            for name, value in headers.items():
+                self.send_header(name, value)
+            self.end_headers()
+            self.wfile.write(payload)
+
+        def _read_body(self) -> bytes:
+            """
+            Reads request body sent with Content-Length or chunked transfer encoding.
+            """
+            if self.headers.get("Transfer-Encoding", "").lower() != "chunked":
+                return self.rfile.read(int(self.headers.get("Content-Length") or 0))
+            chunks = []
+            while size := int(self.rfile.readline().split(b";")[0], 16):
+                chunks.append(self.rfile.read(size))
+                self.rfile.readline()  # CRLF after chunk.
+            while self.rfile.readline() not in (b"\r\n", b"\n", b""):
+                pass  # Trailer.
+            return b"".join(chunks)
+
+    return Handler
+
+
+def main(argv: list[str] | None = None) -> None:
+    """
+    Runs fake server until interrupted.
+    """
+    defaults = FakeServerOptions()
+    parser = argparse.ArgumentParser(description="Local stand-in of Ecomail API.")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8000)
+    parser.add_argument("--campaigns", type=int, default=defaults.campaigns)
+    parser.add_argument("--campaigns-per-page", type=int, default=None, help="paginates campaigns list")
+    parser.add_argument("--stats-subscribers", type=int, default=defaults.stats_subscribers)
+    parser.add_argument("--stats-per-page", type=int, default=defaults.stats_per_page)
+    parser.add_argument("--bulk-job-duration", type=float, default=defaults.bulk_job_duration)
+    parser.add_argument("--rate-limit-calls", type=int, default=defaults.rate_limit_calls, help="0 disables limit")
+    parser.add_argument("--rate-limit-period", type=float, default=defaults.rate_limit_period)
+    parser.add_argument("--latency", type=float, default=defaults.latency)
+    parser.add_argument("--latency-jitter", type=float, default=defaults.latency_jitter)
+    parser.add_argument("--error-rate", type=float, default=defaults.error_rate)
+    parser.add_argument("--error-status", type=int, default=defaults.error_status)
+    parser.add_argument("--seed", type=int, default=None)
+    args = parser.parse_args(argv)
+
+    options = FakeServerOptions(
+        campaigns=args.campaigns,
+        campaigns_per_page=args.campaigns_per_page,
+        stats_subscribers=args.stats_subscribers,
+        stats_per_page=args.stats_per_page,
+        bulk_job_duration=args.bulk_job_duration,
+        rate_limit_calls=args.rate_limit_calls or None,
+        rate_limit_period=args.rate_limit_period,
+        latency=args.latency,
+        latency_jitter=args.latency_jitter,
+        error_rate=args.error_rate,
+        error_status=args.error_status,
+        seed=args.seed,
+    )
+    server = FakeEcoMailServer(options, host=args.host, port=args.port)
+    print(f"Serving fake Ecomail API on {server.url}", flush=True)
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+
+
+if __name__ == "__main__":
+    main()
@@ -1,5 +1,45 @@
+from __future__ import annotations
+
+import itertools
+import json
+import os
+from typing import Any, Callable, Iterable, Iterator, TypeVar
+
+
+_T = TypeVar("_T")
+
+
 def is_empty_or_whitespace(string: str | None) -> bool:
     """
     Checks if provided string is None, empty or whitespace.
     """
     return (string is None) or string.isspace() or (len(string) == 0)
+
+
+def chunked(iterable: Iterable[_T], size: int) -> Iterator[list[_T]]:
+    """
+    Splits iterable into lists of at most given size. Consumes iterable lazily.
+    """
+    if size < 1:
+        raise ValueError("Chunk size must be at least 1.")
+    iterator = iter(iterable)
+    while chunk := list(itertools.islice(iterator, size)):
+        yield chunk
+
+
+def slot_setters(cls: type, *names: str) -> tuple[Callable[[Any, Any], None], ...]:
+    """
+    Returns raw setters of given slots of class. Setters bypass __setattr__, so they can fill
+    frozen dataclass objects created by object.__new__ without running __init__.
+    """
+    return tuple(getattr(cls, _n).__set__ for _n in names)
+
+
+def write_json_atomic(path: str | os.PathLike[str], data: Any) -> None:
+    """
+    Writes data as JSON to file. File is replaced atomically, so it is never partially written.
+    """
+    temporary_path = os.fspath(path) + ".tmp"
+    with open(temporary_path, "w", encoding="utf-8") as f:
+        json.dump(data, f)
+    os.replace(temporary_path, path)
@@ -1,28 +1,45 @@
-import os
+import json
+import time
 
 import pytest
 
+from ecomail.exceptions import ApiConnectionError
+from ecomail.observer import MetricsCollector
+from ecomail.retry import RetryPolicy
 from ecomail.service import EcoMailOptions, EcoMailService
+from ecomail.subscriber import Subscriber
+from ecomail.sync import CampaignSync
+from ecomail.testing import FakeEcoMailServer, FakeServerOptions
 
 
-@pytest.mark.skip("Mock server not available!")
 class TestIntegration:
 
     @pytest.fixture
-    def service(self) -> EcoMailService:
+    def server(self) -> FakeEcoMailServer:
         """
-        Dummy service with test values.
+        Local fake server of Ecomail API.
         """
-        api_key = os.getenv("ECOMAIL_API_KEY")
-        if api_key is None:
-            raise ValueError(f"Missing configuration key: ECOMAIL_API_KEY.")
+        options = FakeServerOptions(
+            stats_subscribers=250,
+            stats_per_page=20,
+            rate_limit_calls=None,
+            bulk_job_duration=0.02,
+        )
+        with FakeEcoMailServer(options) as server:
+            yield server
 
+    @pytest.fixture
+    def service(self, server) -> EcoMailService:
+        """
+        Service calling fake server.
+        """
         options = EcoMailOptions(
-            # Debug proxy server provided by EcoMail.
-            base_url="http://private-anon-ee165f5762-ecomailappapiv2.apiary-proxy.com/",
-            api_key=api_key,
+            base_url=server.url,
+            api_key="123_mock_key",
+            retry_policy=RetryPolicy(backoff_factor=0.01),
         )
-        return EcoMailService(options=options)
+        with EcoMailService(options=options) as service:
+            yield service
 
     def test_add_new_list(self, service):
         list_id = service.add_new_list(
@@ -35,8 +52,120 @@ class TestIntegration:
     def test_add_new_subscriber_to_list(self, service, subscriber):
         subscriber_id = service.add_new_subscriber_to_list(list_id=1, subscriber=subscriber)
         assert isinstance(subscriber_id, int)
+        assert service.get_subscriber_details(list_id=1, subscriber_email=subscriber.email) == subscriber
 
-    def test_add_bulk_subscribers_to_list(self, service, subscriber):
+    def test_add_bulk_subscribers_to_list(self, server, service, subscriber):
         subscribers = [subscriber for _ in range(100)]
-        # Does not return anything.
-        service.add_bulk_subscribers_to_list(list_id=1, subscribers=subscribers)
+        job = service.add_bulk_subscribers_to_list(list_id=1, subscribers=subscribers)
+        assert not service.refresh_bulk_job(job).finished
+        assert service.wait_for_bulk_jobs([job], poll_interval=0.01) == []
+        assert list(server.subscribers(1)) == [subscriber.email]
+
+    def test_import_subscribers_to_list(self, server, service):
+        subscribers = [Subscriber(name="John", surname="Doe", email=f"user{_i}@example.com") for _i in range(7000)]
+        result = service.import_subscribers_to_list(list_id=1, subscribers=subscribers)
+        assert result.ok
+        assert len(result.job_ids) == 3
+        assert len(server.subscribers(1)) == 7000
+
+    def test_wait_for_bulk_jobs(self, service):
+        subscribers = [Subscriber(name="John", surname="Doe", email=f"user{_i}@example.com") for _i in range(7000)]
+        result = service.import_subscribers_to_list(list_id=1, subscribers=subscribers)
+        assert service.wait_for_bulk_jobs(result.jobs, poll_interval=0.01) == []
+        assert all(_j.finished for _j in result.jobs)
+
+    def test_bulk_limit(self, server, service, subscriber):
+        subscriber_data = [{"email": f"user{_i}@example.com"} for _i in range(3001)]
+        with pytest.raises(ApiConnectionError):
+            service._call_add_bulk_subscriber_data_to_list(1, subscriber_data)
+        assert server.subscribers(1) == {}
+
+    def test_update_subscriber(self, service, subscriber):
+        service.add_new_subscriber_to_list(list_id=1, subscriber=subscriber)
+        service.update_subscriber(list_id=1, subscriber_email=subscriber.email, data={"name": "Jane"})
+        assert service.get_subscriber_details(list_id=1, subscriber_email=subscriber.email).name == "Jane"
+
+    def test_get_subscriber_details__not_found(self, service):
+        with pytest.raises(ApiConnectionError):
+            service.get_subscriber_details(list_id=1, subscriber_email="missing@example.com")
+
+    def test_get_campaigns_list(self, server, service):
+        campaigns = service.get_campaigns_list()
+        assert [_c.id for _c in campaigns] == list(range(1, server.options.campaigns + 1))
+
+    @pytest.mark.parametrize("stream_stats_pages", [False, True])
+    @pytest.mark.parametrize("max_workers", [1, 4])
+    def test_get_campaigns_stats_detail(self, service, max_workers, stream_stats_pages):
+        service._options.stream_stats_pages = stream_stats_pages
+        stats = service.get_campaigns_stats_detail(campaign_id=1, max_workers=max_workers)
+        assert [_s.email for _s in stats.subscribers] == [f"subscriber{_i}@example.com" for _i in range(250)]
+
+    def test_metrics_collector(self, service):
+        collector = MetricsCollector()
+        service._options.observers = [collector]
+        service.get_campaigns_stats_detail(campaign_id=1, max_workers=4)
+
+        report = collector.report()["GET campaigns/{campaign_id}/stats-detail"]
+        assert (report["count"], report["errors"]) == (13, 0)
+        assert 0 < report["p50"] <= report["p95"] <= report["p99"]
+
+    def test_injected_errors_are_retried(self, server, service):
+        server.fail_next(2, status=503)
+        assert len(service.get_campaigns_list()) == server.options.campaigns
+        assert server.request_count == 3
+
+    def test_injected_errors__post_is_not_retried(self, server, service):
+        server.fail_next(1, status=500)
+        with pytest.raises(ApiConnectionError):
+            service.add_new_list(name="Test list", from_name="My Organisation", from_email="org@example.com")
+
+    def test_campaign_sync__deleted_open_campaign(self, tmp_path):
+        state_path = tmp_path / "campaigns.json"
+        state_path.write_text(json.dumps({"high_water_id": 5, "open_ids": [99]}))
+
+        with FakeEcoMailServer(FakeServerOptions(campaigns=5, campaigns_per_page=3, rate_limit_calls=None)) as server:
+            with EcoMailService(options=EcoMailOptions(base_url=server.url, api_key="123_mock_key")) as service:
+                for _ in range(2):
+                    assert CampaignSync(service, state_path).sync() == []
+
+        assert CampaignSync(service, state_path).state.open_ids == frozenset()  # Deleted campaign is forgotten.
+
+
+class TestIntegrationRateLimit:
+
+    @pytest.fixture
+    def server(self) -> FakeEcoMailServer:
+        """
+        Local fake server of Ecomail API allowing 3 calls per second.
+        """
+        with FakeEcoMailServer(FakeServerOptions(rate_limit_calls=3, rate_limit_period=1)) as server:
+            yield server
+
+    def test_throttled(self, server):
+        options = EcoMailOptions(base_url=server.url, api_key="123_mock_key", rate_limit_calls=None, retry_policy=None)
+        with EcoMailService(options=options) as service:
+            for _ in range(3):
+                service.get_campaigns_list()
+            with pytest.raises(ApiConnectionError, match="Too Many Attempts"):
+                service.get_campaigns_list()
+
+    def test_throttled__retried_after_delay(self, server):
+        options = EcoMailOptions(
+            base_url=server.url,
+            api_key="123_mock_key",
+            rate_limit_calls=None,
+            retry_policy=RetryPolicy(max_retries=1),
+        )
+        started_at = time.monotonic()
+        with EcoMailService(options=options) as service:
+            for _ in range(4):
+                service.get_campaigns_list()
+        assert server.request_count == 5
+        assert time.monotonic() - started_at >= 0.5  # Waited for Retry-After.
+
+    def test_rate_limit_is_per_api_key(self, server):
+        for api_key in ["key_1", "key_2"]:
+            options = EcoMailOptions(base_url=server.url, api_key=api_key, retry_policy=None)
+            with EcoMailService(options=options) as service:
+                for _ in range(3):
+                    service.get_campaigns_list()
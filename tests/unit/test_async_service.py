@@ -0,0 +1,383 @@
+import asyncio
+import json
+
+import pytest
+
+from ecomail.async_service import AsyncEcoMailService
+from ecomail.bulk import BulkJob
+from ecomail.exceptions import ApiConnectionError, ApiRequestError
+from ecomail.service import EcoMailOptions
+from tests.conftest import subscriber
+
+httpx = pytest.importorskip("httpx")  # Optional dependency.
+
+
+async def aiter_chunks(chunks: list[bytes]):
+    """
+    Streamed response body.
+    """
+    for chunk in chunks:
+        yield chunk
+
+
+class TestAsyncEcoMailService:
+
+    @pytest.fixture
+    def service(self) -> AsyncEcoMailService:
+        """
+        Dummy service with test values.
+        """
+        options = EcoMailOptions(
+            base_url="https://example.com/",
+            api_key="123_mock_key",
+        )
+        return AsyncEcoMailService(options=options)
+
+    @staticmethod
+    def mock_transport(service: AsyncEcoMailService, handler) -> list[httpx.Request]:
+        """
+        Routes requests of service to given handler. Returns list of sent requests.
+        """
+        requests_ = []
+
+        def _handler(request: httpx.Request) -> httpx.Response:
+            requests_.append(request)
+            return handler(request)
+
+        service._client = httpx.AsyncClient(
+            headers=service._client.headers,
+            transport=httpx.MockTransport(_handler),
+        )
+        return requests_
+
+    def test_add_new_list(self, service):
+        requests_ = self.mock_transport(service, lambda _r: httpx.Response(201, json={"id": 123}))
+
+        list_id = asyncio.run(service.add_new_list(
+            name="Test list",
+            from_name="My Organisation",
+            from_email="organsation@example.com",
+        ))
+
+        assert list_id == 123
+        assert requests_[0].method == "POST"
+        assert str(requests_[0].url) == "https://example.com/lists"
+        assert requests_[0].headers["key"] == "123_mock_key"
+        assert json.loads(requests_[0].content)["reply_to"] == "organsation@example.com"
+
+    def test_get_subscriber_details(self, service):
+        self.mock_transport(service, lambda _r: httpx.Response(200, json={
+            "subscriber": {"name": "Jan", "surname": "Novak", "email": "user@example.com"},
+        }))
+
+        subscriber = asyncio.run(service.get_subscriber_details(list_id=1, subscriber_email="user@example.com"))
+
+        assert subscriber.email == "user@example.com"
+
+    def test_get_subscriber_details__concurrent(self, service):
+        self.mock_transport(service, lambda _r: httpx.Response(200, json={
+            "subscriber": {"name": "Jan", "surname": "Novak", "email": _r.url.path.rsplit("/", 1)[-1]},
+        }))
+
+        async def lookup_all():
+            emails = [f"user{_i}@example.com" for _i in range(50)]
+            return await asyncio.gather(*(service.get_subscriber_details(1, _e) for _e in emails))
+
+        subscribers = asyncio.run(lookup_all())
+
+        assert [_s.email for _s in subscribers] == [f"user{_i}@example.com" for _i in range(50)]
+
+    def test_get_subscriber_details__not_found(self, service):
+        self.mock_transport(service, lambda _r: httpx.Response(200, json={}))
+        with pytest.raises(ApiRequestError):
+            _ = asyncio.run(service.get_subscriber_details(list_id=1, subscriber_email="user@example.com"))
+
+    def test_get_subscribers_details(self, service):
+        def handler(request: httpx.Request) -> httpx.Response:
+            email = request.url.path.rsplit("/", 1)[1]
+            if email.startswith("missing"):
+                return httpx.Response(200, json={})
+            return httpx.Response(200, json={"subscriber": {"name": "Jan", "surname": "Novak", "email": email}})
+
+        requests_ = self.mock_transport(service, handler)
+        emails = ["a@example.com", "missing@example.com", "a@example.com", "b@example.com"]
+
+        result = asyncio.run(service.get_subscribers_details(list_id=1, emails=emails, max_workers=2))
+
+        assert len(requests_) == 3
+        assert list(result.found) == ["a@example.com", "b@example.com"]
+        assert (result.not_found, result.failed) == (["missing@example.com"], {})
+
+    def test_get_campaigns_stats_detail__pages(self, service):
+        def handler(request: httpx.Request) -> httpx.Response:
+            page = int(request.url.params["page"])
+            return httpx.Response(200, json={
+                "total": 2,
+                "next_page_url": "next" if page == 1 else None,
+                "subscribers": {f"foo{page}@bar.com": {"open": page, "send": 1, "click": 0}},
+            })
+
+        self.mock_transport(service, handler)
+
+        stats = asyncio.run(service.get_campaigns_stats_detail(campaign_id=1))
+
+        assert [_s.email for _s in stats.subscribers] == ["foo1@bar.com", "foo2@bar.com"]
+
+    def test_get_campaigns_stats_detail__parallel(self, service):
+        def handler(request: httpx.Request) -> httpx.Response:
+            page = int(request.url.params["page"])
+            return httpx.Response(200, json={
+                "total": 5,
+                "per_page": 2,
+                "next_page_url": "next" if page < 3 else None,
+                "subscribers": {
+                    f"foo{_i}@bar.com": {"open": _i, "send": 1, "click": 0}
+                    for _i in range((page - 1) * 2, min(page * 2, 5))
+                },
+            })
+
+        requests_ = self.mock_transport(service, handler)
+
+        stats = asyncio.run(service.get_campaigns_stats_detail(campaign_id=1, max_workers=3))
+
+        assert len(requests_) == 3
+        assert [_s.open for _s in stats.subscribers] == list(range(5))
+
+    def test_get_campaigns_stats_detail__streamed(self, service):
+        def handler(request: httpx.Request) -> httpx.Response:
+            page = int(request.url.params["page"])
+            body = json.dumps({
+                "total": 2,
+                "next_page_url": "next" if page == 1 else None,
+                "subscribers": {f"foo{page}@bar.com": {"open": page, "send": 1, "click": 0}},
+            }).encode()
+            return httpx.Response(200, content=aiter_chunks([body[_i:_i + 5] for _i in range(0, len(body), 5)]))
+
+        self.mock_transport(service, handler)
+        service._options.stream_stats_pages = True
+
+        stats = asyncio.run(service.get_campaigns_stats_detail(campaign_id=1))
+
+        assert [_s.email for _s in stats.subscribers] == ["foo1@bar.com", "foo2@bar.com"]
+
+    def test_get_campaigns_stats_detail__streamed_error(self, service):
+        self.mock_transport(service, lambda _r: httpx.Response(400, content=aiter_chunks([b"Bad ", b"request."])))
+        service._options.stream_stats_pages = True
+
+        with pytest.raises(ApiConnectionError, match="Bad request."):
+            asyncio.run(service.get_campaigns_stats_detail(campaign_id=1))
+
+    def test_iter_campaigns_stats_detail(self, service):
+        def handler(request: httpx.Request) -> httpx.Response:
+            if request.url.path == "/campaigns":
+                return httpx.Response(200, json=[
+                    {
+                        "id": _i, "from_name": "", "from_email": "", "reply_to": "", "title": "", "subject": "",
+                        "sent_at": None, "recipients": 10 - _i, "status": 3,
+                    }
+                    for _i in (1, 2)
+                ])
+            page = int(request.url.params["page"])
+            return httpx.Response(200, json={
+                "total": 4,
+                "per_page": 2,
+                "subscribers": {f"foo{page}-{_i}@bar.com": {"open": 0, "send": 1, "click": 0} for _i in range(2)},
+            })
+
+        requests_ = self.mock_transport(service, handler)
+
+        async def collect():
+            return [_r async for _r in service.iter_campaigns_stats_detail(max_workers=1)]
+
+        results = asyncio.run(collect())
+
+        assert [_r.campaign_id for _r in results] == [2, 1]  # Fewer recipients first.
+        assert len(requests_) == 5
+        assert [_s.email for _s in results[0].stats.subscribers][::2] == ["foo1-0@bar.com", "foo2-0@bar.com"]
+
+    def test_iter_campaign_stats_detail(self, service):
+        self.mock_transport(service, lambda _r: httpx.Response(200, json={
+            "total": 4,
+            "next_page_url": "next",
+            "subscribers": {
+                f"foo{_r.url.params['page']}-{_i}@bar.com": {"open": 0, "send": 1, "click": 0} for _i in range(2)
+            },
+        }))
+
+        async def collect():
+            return [_s.email async for _s in service.iter_campaign_stats_detail(campaign_id=1)]
+
+        assert asyncio.run(collect()) == ["foo1-0@bar.com", "foo1-1@bar.com", "foo2-0@bar.com", "foo2-1@bar.com"]
+
+    def test_import_subscribers_to_list(self, service, subscriber):
+        self.mock_transport(service, lambda _r: httpx.Response(200, json={"job_id": 1}))
+
+        result = asyncio.run(service.import_subscribers_to_list(
+            list_id=1,
+            subscribers=(subscriber for _ in range(25)),
+            chunk_size=10,
+        ))
+
+        assert [_c.count for _c in result.chunks] == [10, 10, 5]
+        assert result.job_ids == [1, 1, 1]
+
+    def test_import_subscribers_to_list__not_json_response(self, service, subscriber):
+        self.mock_transport(service, lambda _r: httpx.Response(200, content=b"OK"))
+
+        result = asyncio.run(service.import_subscribers_to_list(list_id=1, subscribers=[subscriber], chunk_size=1))
+
+        assert result.ok
+        assert result.job_ids == []
+
+    def test_refresh_bulk_job__unknown_status(self, service):
+        self.mock_transport(service, lambda _r: httpx.Response(200, json={"state": "done"}))
+
+        with pytest.raises(ApiConnectionError):
+            asyncio.run(service.refresh_bulk_job(BulkJob(list_id=1, job_id=1, count=10)))
+
+    def test_add_bulk_subscribers_to_list__no_job_id(self, service, subscriber):
+        self.mock_transport(service, lambda _r: httpx.Response(200, content=b"OK"))
+
+        assert asyncio.run(service.add_bulk_subscribers_to_list(list_id=1, subscribers=[subscriber])) is None
+
+    def test_add_bulk_subscribers_to_list__streamed(self, service, subscriber):
+        requests_ = self.mock_transport(service, lambda _r: httpx.Response(200, json={"job_id": 1}))
+
+        job = asyncio.run(service.add_bulk_subscribers_to_list(list_id=1, subscribers=[subscriber] * 3))
+
+        assert job.count == 3
+        assert requests_[0].headers["Transfer-Encoding"] == "chunked"
+        data = json.loads(requests_[0].content)
+        assert data == {"subscriber_data": [subscriber.as_dict()] * 3, "update_existing": True}
+
+    def test_update_subscribers(self, service):
+        requests_ = self.mock_transport(service, lambda _r: httpx.Response(200, json={"job_id": 1}))
+
+        asyncio.run(service.update_subscribers(list_id=1, updates={"a@example.com": {"name": "A"}}))
+
+        assert str(requests_[0].url) == "https://example.com/lists/1/subscribe-bulk"
+        assert requests_[0].headers["Transfer-Encoding"] == "chunked"
+        data = json.loads(requests_[0].content)
+        assert data == {"subscriber_data": [{"name": "A", "email": "a@example.com"}], "update_existing": True}
+
+    def test_update_subscribers__limit(self, service):
+        with pytest.raises(ApiRequestError):
+            asyncio.run(service.update_subscribers(list_id=1, updates={f"{_i}@example.com": {} for _i in range(3001)}))
+
+    def test_call_api__retry(self, monkeypatch, service):
+        responses = [httpx.Response(503), httpx.Response(200, json=[])]
+        requests_ = self.mock_transport(service, lambda _r: responses.pop(0))
+
+        async def no_sleep(_s):
+            pass
+
+        monkeypatch.setattr(asyncio, "sleep", no_sleep)
+
+        campaigns = asyncio.run(service.get_campaigns_list())
+
+        assert campaigns == []
+        assert len(requests_) == 2
+
+    def test_call_api__not_idempotent(self, service):
+        requests_ = self.mock_transport(service, lambda _r: httpx.Response(503))
+        with pytest.raises(ApiConnectionError):
+            _ = asyncio.run(service.add_new_list(name="Test list", from_name="Org", from_email="org@example.com"))
+        assert len(requests_) == 1
+
+    def test_iter_campaigns__since_id(self, service):
+        def campaign(campaign_id: int) -> dict:
+            return {
+                "id": campaign_id, "from_name": "", "from_email": "", "reply_to": "", "title": "", "subject": "",
+                "sent_at": None, "recipients": 0, "status": 1,
+            }
+
+        def handler(request: httpx.Request) -> httpx.Response:
+            if request.url.path == "/campaigns/1":
+                return httpx.Response(200, json=campaign(1))
+            page = int(request.url.params.get("page", 1))
+            ids = [[4, 3], [2, 1]][page - 1]
+            return httpx.Response(200, json={"data": [campaign(_i) for _i in ids], "next_page_url": "next"})
+
+        requests_ = self.mock_transport(service, handler)
+
+        async def collect():
+            return [_c.id async for _c in service.iter_campaigns(since_id=3, include_ids=[1])]
+
+        assert asyncio.run(collect()) == [4, 1]
+        assert [_r.url.path for _r in requests_] == ["/campaigns", "/campaigns/1"]
+
+    def test_get_campaigns_list__revalidated(self, service):
+        service._options.cache_ttls = {"campaigns": 60}
+        responses = [httpx.Response(200, json=[], headers={"ETag": '"v1"'}), httpx.Response(304)]
+        requests_ = self.mock_transport(service, lambda _r: responses.pop(0))
+
+        async def list_twice():
+            await service.get_campaigns_list()
+            service._cache.set("campaigns", service._cache.get("campaigns")[0].value, ttl=0, etag='"v1"')
+            return await service.get_campaigns_list()
+
+        assert asyncio.run(list_twice()) == []
+        assert requests_[1].headers["If-None-Match"] == '"v1"'
+
+    def test_close__context_manager(self, service):
+        async def use_service():
+            async with service as _s:
+                pass
+            return _s._client.is_closed
+
+        assert asyncio.run(use_service())
+
+    def test_call_api__observers(self, service):
+        events = []
+        service._options.observers = [events.append]
+        self.mock_transport(service, lambda _r: httpx.Response(200, json={"subscriber": {
+            "name": "John",
+            "surname": "Doe",
+            "email": "user@example.com",
+        }}))
+
+        _ = asyncio.run(service.get_subscriber_details(list_id=1, subscriber_email="user@example.com"))
+
+        assert len(events) == 1
+        assert events[0].endpoint == "lists/{list_id}/subscriber/{subscriber_email}"
+        assert (events[0].method, events[0].status, events[0].request_bytes) == ("GET", 200, 0)
+        assert events[0].response_bytes > 0
+
+    def test_call_api__observer_error(self, service):
+        # noinspection PyUnusedLocal
+        def broken_observer(event):
+            raise RuntimeError("Observer error")
+
+        events = []
+        service._options.observers = [broken_observer, events.append]
+        self.mock_transport(service, lambda _r: httpx.Response(201, json={"id": 123}))
+
+        list_id = asyncio.run(service.add_new_list(name="Test list", from_name="Org", from_email="org@example.com"))
+
+        assert list_id == 123
+        assert len(events) == 1
+
+    def test_wait_for_bulk_jobs(self, monkeypatch, service, subscriber):
+        statuses = ["pending", "done"]
+
+        def handler(request: httpx.Request) -> httpx.Response:
+            if request.method == "POST":
+                return httpx.Response(200, json={"job_id": 5})
+            assert request.url.path == "/lists/1/subscribe-bulk/5"
+            return httpx.Response(200, json={"status": statuses.pop(0)})
+
+        self.mock_transport(service, handler)
+
+        async def no_sleep(_s):
+            pass
+
+        monkeypatch.setattr(asyncio, "sleep", no_sleep)
+
+        async def import_and_wait():
+            job = await service.add_bulk_subscribers_to_list(list_id=1, subscribers=[subscriber])
+            return job, await service.wait_for_bulk_jobs([job])
+
+        job, pending = asyncio.run(import_and_wait())
+
+        assert pending == []
+        assert job.status.value == "done"
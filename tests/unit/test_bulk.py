@@ -0,0 +1,67 @@
+import json
+
+import pytest
+
+from ecomail.bulk import BulkChunkResult, BulkImportResult, BulkJob, BulkJobStatus, iter_bulk_payload
+from ecomail.exceptions import ApiConnectionError
+
+
+class TestBulkImportResult:
+
+    def test_summary(self):
+        result = BulkImportResult(chunks=[
+            BulkChunkResult(index=0, count=3000, job_id=1),
+            BulkChunkResult(index=1, count=3000, error=ApiConnectionError("Server error")),
+            BulkChunkResult(index=2, count=10, job_id=3),
+        ])
+
+        assert not result.ok
+        assert result.total == 6010
+        assert result.imported == 3010
+        assert [_c.index for _c in result.failed_chunks] == [1]
+        assert result.job_ids == [1, 3]
+
+    def test_jobs(self):
+        job = BulkJob(list_id=1, job_id=1, count=3000)
+        result = BulkImportResult(chunks=[
+            BulkChunkResult(index=0, count=3000, job_id=1, job=job),
+            BulkChunkResult(index=1, count=3000, error=ApiConnectionError("Server error")),
+        ])
+        assert result.jobs == [job]
+
+
+class TestBulkJob:
+
+    def test_from_response(self):
+        job = BulkJob.from_response(list_id=1, count=10, data={"job_id": "5"})
+        assert (job.list_id, job.job_id, job.count, job.finished) == (1, 5, 10, False)
+        assert BulkJob.from_response(list_id=1, count=10, data={}) is None
+
+    @pytest.mark.parametrize("body", [b"OK", b"[1]", b"", b'{"job_id": "abc"}', b'{"status": "queued"}'])
+    def test_from_body__no_job_id(self, body):
+        assert BulkJob.from_body(list_id=1, count=10, body=body) is None
+
+    def test_from_body(self):
+        assert BulkJob.from_body(list_id=1, count=10, body=b'{"job_id": 5}').job_id == 5
+
+    @pytest.mark.parametrize("value, status", [
+        ("done", BulkJobStatus.DONE),
+        ("Finished", BulkJobStatus.DONE),
+        ("failed", BulkJobStatus.FAILED),
+        ("processing", BulkJobStatus.PENDING),
+    ])
+    def test_status_from_api(self, value, status):
+        assert BulkJobStatus.from_api(value) == status
+
+    @pytest.mark.parametrize("value", [None, "", "unknown", 1])
+    def test_status_from_api__unknown(self, value):
+        with pytest.raises(ValueError):
+            BulkJobStatus.from_api(value)
+
+
+@pytest.mark.parametrize("count", [0, 1, 5, 6])
+def test_iter_bulk_payload(count):
+    subscriber_data = [{"email": f"user{_i}@example.com", "tags": ["a", "ř"]} for _i in range(count)]
+    chunks = list(iter_bulk_payload(iter(subscriber_data), update_existing=False, batch_size=5))
+    assert len(chunks) == 2 + -(-count // 5)
+    assert json.loads(b"".join(chunks)) == {"subscriber_data": subscriber_data, "update_existing": False}
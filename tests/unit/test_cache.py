@@ -0,0 +1,71 @@
+from ecomail.cache import CacheEntry, ResponseCache
+
+
+class FakeClock:
+    """
+    Manually advanced clock.
+    """
+    now = 0.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+class TestResponseCache:
+
+    def test_get__fresh_and_expired(self):
+        clock = FakeClock()
+        cache = ResponseCache(clock=clock)
+        cache.set("a", "value", ttl=10)
+
+        entry, fresh = cache.get("a")
+        assert entry.value == "value"
+        assert fresh
+
+        clock.now = 11
+        assert cache.get("a") == (None, False)  # Expired entry without validators is dropped.
+        assert len(cache) == 0
+
+    def test_get__expired_with_validators(self):
+        clock = FakeClock()
+        cache = ResponseCache(clock=clock)
+        cache.set("a", "value", ttl=10, etag='"v1"')
+
+        clock.now = 11
+        entry, fresh = cache.get("a")
+
+        assert not fresh
+        assert entry.conditional_headers() == {"If-None-Match": '"v1"'}
+
+    def test_set__lru_eviction(self):
+        cache = ResponseCache(max_size=2)
+        cache.set("a", 1, ttl=10)
+        cache.set("b", 2, ttl=10)
+        _ = cache.get("a")  # "b" is now least recently used.
+        cache.set("c", 3, ttl=10)
+
+        assert cache.get("b") == (None, False)
+        assert cache.get("a")[0].value == 1
+        assert cache.get("c")[0].value == 3
+
+    def test_invalidate(self):
+        cache = ResponseCache()
+        cache.set("a", 1, ttl=10)
+        cache.set("b", 2, ttl=10)
+
+        cache.invalidate("a")
+        assert cache.get("a") == (None, False)
+        cache.clear()
+        assert len(cache) == 0
+
+    def test_make_key(self):
+        assert ResponseCache.make_key("campaigns") == "campaigns"
+        assert ResponseCache.make_key("stats", {"page": 2, "a": 1}) == "stats?a=1&page=2"
+
+
+def test_cache_entry__conditional_headers():
+    entry = CacheEntry(value=None, expires_at=0, etag='"v1"', last_modified="Wed, 21 Oct 2015 07:28:00 GMT")
+    assert entry.conditional_headers() == {
+        "If-None-Match": '"v1"',
+        "If-Modified-Since": "Wed, 21 Oct 2015 07:28:00 GMT",
+    }
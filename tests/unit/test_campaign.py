@@ -37,3 +37,21 @@ class TestCampaign:
         assert campaign.sent_at == datetime.datetime(2024, 10, 1, 17, 2, 21)
         assert campaign.recipients == 401
         assert campaign.status == CampaignStatus.SENT
+
+    def test_from_trusted_dict(self):
+        _d = {
+            "id": 53,
+            "from_name": "Example from name",
+            "from_email": "sender@example.com",
+            "reply_to": "reply@example.com",
+            "title": "Trusted campaign",
+            "subject": "Hello",
+            "sent_at": "2024-10-02 08:30:00",
+            "recipients": 12,
+            "status": 3,
+        }
+
+        campaign = Campaign.from_trusted_dict(_d)
+
+        assert campaign == Campaign.from_dict(_d)
+        assert not hasattr(campaign, "__dict__")  # Slotted class.
@@ -1,4 +1,10 @@
-from ecomail.campaign_stats_detail import CampaignStatsDetailSubscriber
+import pytest
+
+from ecomail.campaign_stats_detail import (
+    CampaignStatsDetail,
+    CampaignStatsDetailColumns,
+    CampaignStatsDetailSubscriber,
+)
 
 
 class TestCampaignStatsDetailSubscriber:
@@ -23,3 +29,63 @@ class TestCampaignStatsDetailSubscriber:
         assert subscriber.open == 2
         assert subscriber.send == 1
         assert subscriber.click == 0
+
+    def test_from_trusted_dict(self):
+        _d = {"open": 2, "send": 1, "click": 0, "unsub": 0}
+
+        subscriber = CampaignStatsDetailSubscriber.from_trusted_dict("email@example.com", _d)
+
+        assert subscriber == CampaignStatsDetailSubscriber.from_dict("email@example.com", _d)
+        assert not hasattr(subscriber, "__dict__")  # Slotted class.
+        with pytest.raises(AttributeError):
+            subscriber.open = 3  # Object created on fast path is still frozen.
+
+    def test_list_from_dict(self):
+        _d = {
+            "foo@bar.com": {"open": 2, "send": 1, "click": 1},
+            "foo2@bar.com": {"open": 0, "send": 1, "click": 0},
+        }
+
+        subscribers = CampaignStatsDetailSubscriber.list_from_dict(_d)
+
+        assert [_s.email for _s in subscribers] == ["foo@bar.com", "foo2@bar.com"]
+        assert subscribers[0].open == 2
+
+
+class TestCampaignStatsDetailColumns:
+
+    @pytest.fixture
+    def columns(self) -> CampaignStatsDetailColumns:
+        return CampaignStatsDetailColumns.from_subscribers([
+            CampaignStatsDetailSubscriber(email="a@example.com", open=2, send=1, click=1),
+            CampaignStatsDetailSubscriber(email="b@example.com", open=0, send=1, click=0),
+            CampaignStatsDetailSubscriber(email="c@example.com", open=5, send=1, click=4),
+            CampaignStatsDetailSubscriber(email="d@example.com", open=1, send=1, click=0),
+        ])
+
+    def test_rows(self, columns):
+        assert len(columns) == 4
+        assert columns[2] == CampaignStatsDetailSubscriber(email="c@example.com", open=5, send=1, click=4)
+        assert [_s.email for _s in columns] == ["a@example.com", "b@example.com", "c@example.com", "d@example.com"]
+
+    def test_aggregates(self, columns):
+        assert columns.total_opens == 8
+        assert columns.total_sends == 4
+        assert columns.total_clicks == 5
+        assert columns.open_rate == 0.75
+        assert columns.click_rate == 0.5
+
+    def test_rates__nothing_sent(self):
+        assert CampaignStatsDetailColumns().open_rate == 0
+
+    def test_top_clickers(self, columns):
+        assert [_s.email for _s in columns.top_clickers(2)] == ["c@example.com", "a@example.com"]
+
+    def test_filter(self, columns):
+        filtered = columns.filter(min_open=1, min_click=1)
+        assert filtered.emails == ["a@example.com", "c@example.com"]
+        assert list(filtered.clicks) == [1, 4]
+
+    def test_to_columns(self, columns):
+        stats = CampaignStatsDetail(subscribers=list(columns))
+        assert stats.to_columns() == columns
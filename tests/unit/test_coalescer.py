@@ -0,0 +1,106 @@
+import datetime
+import threading
+
+import pytest
+
+from ecomail.coalescer import UpdateCoalescer
+from ecomail.exceptions import ApiConnectionError
+from ecomail.service import EcoMailOptions, EcoMailService
+
+
+class TestUpdateCoalescer:
+
+    @pytest.fixture
+    def service(self) -> EcoMailService:
+        """
+        Dummy service with test values.
+        """
+        options = EcoMailOptions(base_url="https://example.com", api_key="123_mock_key")
+        return EcoMailService(options=options)
+
+    @pytest.fixture
+    def bulk_calls(self, monkeypatch, service) -> list:
+        """
+        Records bulk update calls of service.
+        """
+        calls = []
+        monkeypatch.setattr(service, "update_subscribers", lambda list_id, updates: calls.append((list_id, updates)))
+        return calls
+
+    def test_flush__merges_updates(self, service, bulk_calls):
+        coalescer = UpdateCoalescer(service, max_delay=None)
+        coalescer.update(1, "a@example.com", {"name": "A"})
+        coalescer.update(1, "a@example.com", {"name": "AA", "surname": "B"})
+        coalescer.update(1, "b@example.com", {"name": "B"})
+        coalescer.update(2, "a@example.com", {"name": "C"})
+        assert coalescer.pending == 3
+
+        results = coalescer.flush()
+
+        assert bulk_calls == [
+            (1, {"a@example.com": {"name": "AA", "surname": "B"}, "b@example.com": {"name": "B"}}),
+            (2, {"a@example.com": {"name": "C"}}),
+        ]
+        assert [(_r.list_id, _r.email, _r.ok) for _r in results] == [
+            (1, "a@example.com", True),
+            (1, "b@example.com", True),
+            (2, "a@example.com", True),
+        ]
+        assert coalescer.pending == 0
+
+    def test_update__max_batch_size(self, service, bulk_calls):
+        flushed = []
+        coalescer = UpdateCoalescer(service, max_batch_size=2, max_delay=None, on_flush=flushed.append)
+        coalescer.update(1, "a@example.com", {"name": "A"})
+        assert bulk_calls == []
+        coalescer.update(1, "b@example.com", {"name": "B"})
+
+        assert len(bulk_calls) == 1
+        assert [_r.email for _r in flushed[0]] == ["a@example.com", "b@example.com"]
+
+    def test_update__max_delay(self, service, bulk_calls):
+        flushed = threading.Event()
+        coalescer = UpdateCoalescer(service, max_delay=0.01, on_flush=lambda _r: flushed.set())
+        coalescer.update(1, "a@example.com", {"name": "A"})
+
+        assert flushed.wait(timeout=5)
+        assert bulk_calls == [(1, {"a@example.com": {"name": "A"}})]
+
+    def test_flush__error(self, monkeypatch, service):
+        # noinspection PyUnusedLocal
+        def raise_error(list_id, updates):
+            raise ApiConnectionError("Server error")
+
+        monkeypatch.setattr(service, "update_subscribers", raise_error)
+
+        with UpdateCoalescer(service, max_delay=None) as coalescer:
+            coalescer.update(1, "a@example.com", {"name": "A"})
+            results = coalescer.flush()
+
+        assert not results[0].ok
+        assert isinstance(results[0].error, ApiConnectionError)
+
+    def test_flush__unexpected_error(self, monkeypatch, service):
+        # Bulk body is encoded by real service, date is not JSON serializable.
+        sent = []
+        monkeypatch.setattr(service, "_call_post", lambda *args, body=None, **kwargs: sent.append(b"".join(body())))
+
+        # noinspection PyUnusedLocal
+        def on_flush(results):
+            raise RuntimeError("Callback error")
+
+        coalescer = UpdateCoalescer(service, max_delay=None, on_flush=on_flush)
+        coalescer.update(1, "a@example.com", {"born": datetime.date(2000, 1, 1)})
+        coalescer.update(2, "b@example.com", {"name": "B"})
+
+        results = coalescer.flush()
+
+        assert [(_r.list_id, _r.ok) for _r in results] == [(1, False), (2, True)]
+        assert isinstance(results[0].error, TypeError)
+        assert len(sent) == 1  # Other lists are still sent.
+        assert coalescer.pending == 0
+
+    def test_close__flushes(self, service, bulk_calls):
+        with UpdateCoalescer(service) as coalescer:
+            coalescer.update(1, "a@example.com", {"name": "A"})
+        assert len(bulk_calls) == 1
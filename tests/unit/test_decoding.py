@@ -0,0 +1,55 @@
+import json
+
+import pytest
+
+from ecomail.decoding import decode_stats_detail_page, loads
+
+
+PAGE = {
+    "total": 3,
+    "per_page": 2,
+    "subscribers": {
+        "foo@bar.com": {"open": 1, "send": 1, "click": 0},
+        "ř@bar.com": {"open": "2", "send": "1", "click": "1"},
+    },
+    "next_page_url": "https://example.com/?page=2",
+}
+
+
+def split(data: bytes, size: int) -> list[bytes]:
+    return [data[_i:_i + size] for _i in range(0, len(data), size)]
+
+
+class TestStatsDetailPageDecoder:
+
+    @pytest.mark.parametrize("indent", [None, 2])
+    @pytest.mark.parametrize("chunk_size", [1, 3, 7, 1024])
+    def test_decode(self, indent, chunk_size):
+        subscribers = []
+        data = json.dumps(PAGE, indent=indent, ensure_ascii=False).encode()
+
+        fields = decode_stats_detail_page(split(data, chunk_size), lambda _e, _d: subscribers.append((_e, _d)))
+
+        assert fields == {_k: _v for _k, _v in PAGE.items() if _k != "subscribers"}
+        assert subscribers == list(PAGE["subscribers"].items())
+
+    @pytest.mark.parametrize("data", [b'{}', b' { "subscribers" : { } } ', b'{"subscribers": []}'])
+    def test_decode__empty(self, data):
+        subscribers = []
+        decode_stats_detail_page([data], subscribers.append)
+        assert subscribers == []
+
+    @pytest.mark.parametrize("data", [
+        b"",
+        b'{"total": 1',
+        b'{"total": 1, "subscribers": {"foo@bar.com": {"open": 1}',
+        b'{"total": 1} trailing',
+        b'[]',
+    ])
+    def test_decode__invalid(self, data):
+        with pytest.raises(ValueError):
+            decode_stats_detail_page(split(data, 4), lambda _e, _d: None)
+
+
+def test_loads():
+    assert loads(b'{"a": [1, "\xc5\x99"]}') == {"a": [1, "ř"]}
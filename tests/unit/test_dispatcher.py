@@ -0,0 +1,157 @@
+import datetime
+import threading
+
+import pytest
+
+from ecomail.dispatcher import BACKPRESSURE_RAISE, WriteBehindDispatcher
+from ecomail.exceptions import ApiConnectionError, QueueFullError
+from ecomail.service import EcoMailOptions, EcoMailService
+from ecomail.subscriber import Subscriber
+
+
+class TestWriteBehindDispatcher:
+
+    @pytest.fixture
+    def service(self) -> EcoMailService:
+        """
+        Dummy service with test values.
+        """
+        options = EcoMailOptions(base_url="https://example.com", api_key="123_mock_key")
+        return EcoMailService(options=options)
+
+    @pytest.fixture
+    def bulk_calls(self, monkeypatch, service) -> list:
+        """
+        Records bulk update calls of service.
+        """
+        calls = []
+        monkeypatch.setattr(service, "update_subscribers", lambda list_id, updates: calls.append((list_id, updates)))
+        return calls
+
+    @pytest.fixture
+    def blocked(self, monkeypatch, service) -> threading.Event:
+        """
+        Blocks bulk calls of service until returned event is set.
+        """
+        release = threading.Event()
+        # noinspection PyUnusedLocal
+        monkeypatch.setattr(service, "update_subscribers", lambda list_id, updates: release.wait(timeout=5))
+        return release
+
+    def test_flush__merges_operations(self, service, bulk_calls):
+        with WriteBehindDispatcher(service, max_workers=1, max_delay=60) as dispatcher:
+            dispatcher.subscribe(1, Subscriber(name="A", surname="B", email="a@example.com"))
+            dispatcher.update(1, "a@example.com", {"name": "AA"})
+            dispatcher.update(2, "a@example.com", {"name": "C"})
+            assert bulk_calls == []  # Waiting for batch to fill.
+
+            assert dispatcher.flush(timeout=5)
+
+        assert bulk_calls == [
+            (1, {"a@example.com": {"name": "AA", "surname": "B", "email": "a@example.com"}}),
+            (2, {"a@example.com": {"name": "C"}}),
+        ]
+        assert dispatcher.pending == 0
+
+    def test_max_batch_size(self, service, bulk_calls):
+        with WriteBehindDispatcher(service, max_workers=1, max_batch_size=2, max_delay=60) as dispatcher:
+            for i in range(5):
+                dispatcher.update(1, f"user{i}@example.com", {"name": "A"})
+            dispatcher.flush(timeout=5)
+
+        assert [len(_u) for _, _u in bulk_calls] == [2, 2, 1]
+
+    def test_max_delay(self, monkeypatch, service):
+        sent = threading.Event()
+        # noinspection PyUnusedLocal
+        monkeypatch.setattr(service, "update_subscribers", lambda list_id, updates: sent.set())
+
+        with WriteBehindDispatcher(service, max_delay=0.01) as dispatcher:
+            dispatcher.update(1, "a@example.com", {"name": "A"})
+            assert sent.wait(timeout=5)
+
+    def test_same_email_is_sent_in_order(self, service, bulk_calls):
+        with WriteBehindDispatcher(service, max_workers=4, max_batch_size=1, max_delay=0) as dispatcher:
+            for i in range(20):
+                dispatcher.update(1, "a@example.com", {"name": str(i)})
+
+        assert [_u["a@example.com"]["name"] for _, _u in bulk_calls] == [str(_i) for _i in range(20)]
+
+    def test_on_error(self, monkeypatch, service):
+        # noinspection PyUnusedLocal
+        def raise_error(list_id, updates):
+            raise ApiConnectionError("Server error")
+
+        monkeypatch.setattr(service, "update_subscribers", raise_error)
+        failed = []
+
+        with WriteBehindDispatcher(service, on_error=failed.extend) as dispatcher:
+            dispatcher.update(1, "a@example.com", {"name": "A"})
+
+        assert [(_r.list_id, _r.email) for _r in failed] == [(1, "a@example.com")]
+        assert isinstance(failed[0].error, ApiConnectionError)
+
+    def test_on_error__unexpected_error(self, monkeypatch, service):
+        # Bulk body is encoded by real service, date is not JSON serializable.
+        monkeypatch.setattr(service, "_call_post", lambda *args, body=None, **kwargs: b"".join(body()))
+        failed = []
+
+        def on_error(results):
+            failed.extend(results)
+            raise RuntimeError("Callback error")
+
+        with WriteBehindDispatcher(service, max_workers=1, on_error=on_error) as dispatcher:
+            dispatcher.update(1, "a@example.com", {"born": datetime.date(2000, 1, 1)})
+            assert dispatcher.flush(timeout=5)
+            dispatcher.update(1, "b@example.com", {"born": datetime.date(2000, 1, 1)})
+            assert dispatcher.flush(timeout=5)  # Worker is still running.
+
+        assert [_r.email for _r in failed] == ["a@example.com", "b@example.com"]
+        assert isinstance(failed[0].error, TypeError)
+
+    def test_backpressure__raise(self, service, blocked):
+        dispatcher = WriteBehindDispatcher(
+            service,
+            max_workers=1,
+            max_queue_size=1,
+            backpressure=BACKPRESSURE_RAISE,
+            max_batch_size=1,
+            max_delay=0,
+        )
+        dispatcher.update(1, "a@example.com", {})
+        assert dispatcher.flush(timeout=0.05) is False  # First operation is being sent.
+        dispatcher.update(1, "b@example.com", {})
+
+        with pytest.raises(QueueFullError):
+            dispatcher.update(1, "c@example.com", {})
+
+        blocked.set()
+        dispatcher.close()
+        assert dispatcher.pending == 0
+
+    def test_backpressure__block_timeout(self, service, blocked):
+        dispatcher = WriteBehindDispatcher(service, max_workers=1, max_queue_size=1, timeout=0.01, max_delay=60)
+        dispatcher.update(1, "a@example.com", {})
+
+        with pytest.raises(QueueFullError):
+            dispatcher.update(1, "b@example.com", {})
+
+        blocked.set()
+        dispatcher.close()
+
+    def test_backpressure__block(self, service, bulk_calls):
+        dispatcher = WriteBehindDispatcher(service, max_workers=2, max_queue_size=3, max_batch_size=2, max_delay=0)
+        with dispatcher:
+            for i in range(50):
+                dispatcher.update(1, f"user{i}@example.com", {})
+
+        assert sorted(_e for _, _u in bulk_calls for _e in _u) == sorted(f"user{_i}@example.com" for _i in range(50))
+
+    def test_close(self, service, bulk_calls):
+        dispatcher = WriteBehindDispatcher(service, max_delay=60)
+        dispatcher.update(1, "a@example.com", {"name": "A"})
+        dispatcher.close()
+
+        assert len(bulk_calls) == 1
+        with pytest.raises(RuntimeError):
+            dispatcher.update(1, "a@example.com", {"name": "A"})
@@ -0,0 +1,127 @@
+import csv
+import gzip
+import json
+
+import pytest
+
+from ecomail.exceptions import ApiConnectionError
+from ecomail.export import export_campaign_stats
+from ecomail.service import EcoMailOptions, EcoMailService
+
+
+class MockResponse:
+    """
+    Mock response with given JSON data.
+    """
+
+    def __init__(self, data):
+        self._val = data
+
+    # noinspection PyUnusedLocal
+    def json(self, *args, **kwargs):
+        return self._val
+
+    @property
+    def content(self):
+        return json.dumps(self._val).encode()
+
+
+def stats_detail_page(campaign_id: int, page: int, total: int = 5, per_page: int = 2) -> MockResponse:
+    """
+    Mock response with given page of campaign statistics.
+    """
+    return MockResponse({
+        "total": total,
+        "per_page": per_page,
+        "next_page_url": "next" if page * per_page < total else None,
+        "subscribers": {
+            f"user{campaign_id}_{_i}@example.com": {"open": _i, "send": 1, "click": 0}
+            for _i in range((page - 1) * per_page, min(page * per_page, total))
+        },
+    })
+
+
+class TestExportCampaignStats:
+
+    @pytest.fixture
+    def service(self) -> EcoMailService:
+        """
+        Dummy service with test values.
+        """
+        options = EcoMailOptions(base_url="https://example.com", api_key="123_mock_key")
+        return EcoMailService(options=options)
+
+    @pytest.fixture
+    def pages(self, monkeypatch, service) -> list[tuple[int, int]]:
+        """
+        Mocks stats detail pages of campaigns. Returns list of called campaign IDs and pages.
+        """
+        pages = []
+
+        def call_page(campaign_id, page):
+            pages.append((campaign_id, page))
+            return stats_detail_page(campaign_id, page)
+
+        monkeypatch.setattr(service, "_call_get_campaigns_stats_detail_page", call_page)
+        return pages
+
+    def test_export__csv(self, tmp_path, service, pages):
+        path = tmp_path / "stats.csv"
+        result = export_campaign_stats(service, [1, 2], path)
+
+        with open(path, newline="") as f:
+            rows = list(csv.reader(f))
+        assert rows[0] == ["campaign_id", "email", "open", "send", "click"]
+        assert rows[1] == ["1", "user1_0@example.com", "0", "1", "0"]
+        assert len(rows) == 11
+        assert (result.campaigns, result.rows, result.resumed) == (2, 10, False)
+        assert not (tmp_path / "stats.csv.checkpoint").exists()
+
+    def test_export__ndjson_gzip(self, tmp_path, service, pages):
+        path = tmp_path / "stats.ndjson.gz"
+        export_campaign_stats(service, [1], path)
+
+        with gzip.open(path, "rt") as f:
+            rows = [json.loads(_l) for _l in f]
+        assert rows[0] == {"campaign_id": 1, "email": "user1_0@example.com", "open": 0, "send": 1, "click": 0}
+        assert len(rows) == 5
+
+    @pytest.mark.parametrize("file_name", ["stats.csv", "stats.csv.gz", "stats.ndjson"])
+    def test_export__resume(self, monkeypatch, tmp_path, service, pages, file_name):
+        expected_path = tmp_path / f"expected_{file_name}"
+        export_campaign_stats(service, [1, 2, 3], expected_path)
+
+        def fail_page(campaign_id, page):
+            if (campaign_id, page) == (2, 2):
+                raise ApiConnectionError("Server error")
+            pages.append((campaign_id, page))
+            return stats_detail_page(campaign_id, page)
+
+        path = tmp_path / file_name
+        monkeypatch.setattr(service, "_call_get_campaigns_stats_detail_page", fail_page)
+        with pytest.raises(ApiConnectionError):
+            export_campaign_stats(service, [1, 2, 3], path)
+
+        with open(path, "ab") as f:
+            f.write(b"partially written page")
+        monkeypatch.setattr(service, "_call_get_campaigns_stats_detail_page", lambda *args: stats_detail_page(*args))
+        pages.clear()
+        result = export_campaign_stats(service, [1, 2, 3], path, resume=True)
+
+        read = gzip.open if file_name.endswith(".gz") else open
+        with read(expected_path, "rb") as expected, read(path, "rb") as actual:
+            assert actual.read() == expected.read()
+        assert (result.rows, result.resumed) == (15, True)
+
+    def test_export__resume_other_campaigns(self, monkeypatch, tmp_path, service, pages):
+        path = tmp_path / "stats.csv"
+        monkeypatch.setattr(service, "_call_get_campaigns_stats_detail_page", lambda *args: 1 / 0)
+        with pytest.raises(ZeroDivisionError):
+            export_campaign_stats(service, [1, 2], path)
+
+        with pytest.raises(ValueError):
+            export_campaign_stats(service, [1, 3], path, resume=True)
+
+    def test_export__invalid_format(self, tmp_path, service):
+        with pytest.raises(ValueError):
+            export_campaign_stats(service, [1], tmp_path / "stats.csv", export_format="xml")
@@ -0,0 +1,129 @@
+import json
+
+import pytest
+
+from ecomail.exceptions import ApiConnectionError
+from ecomail.importer import import_subscribers_to_list
+from ecomail.service import EcoMailOptions, EcoMailService
+from ecomail.subscriber import Subscriber
+
+
+class MockResponse:
+    """
+    Mock response with given job ID.
+    """
+
+    def __init__(self, job_id):
+        self._job_id = job_id
+
+    # noinspection PyUnusedLocal
+    def json(self, *args, **kwargs):
+        return {"job_id": self._job_id}
+
+    @property
+    def content(self) -> bytes:
+        return json.dumps(self.json()).encode()
+
+
+def make_subscriber(email: str) -> Subscriber:
+    return Subscriber(name="John", surname="Doe", email=email)
+
+
+def make_subscribers(count: int) -> list[Subscriber]:
+    return [make_subscriber(f"user{_i}@example.com") for _i in range(count)]
+
+
+class TestImportSubscribersToList:
+
+    @pytest.fixture
+    def service(self) -> EcoMailService:
+        """
+        Dummy service with test values.
+        """
+        options = EcoMailOptions(base_url="https://example.com", api_key="123_mock_key")
+        return EcoMailService(options=options)
+
+    @pytest.fixture
+    def sent(self, monkeypatch, service) -> list[str]:
+        """
+        Records first emails of chunks sent in bulk calls of service. Job ID is number of the call.
+        Sending chunk starting with "crash" raises error which is not handled by import.
+        """
+        sent = []
+
+        def call_bulk(list_id, subscribers):
+            if subscribers[0].email.startswith("crash"):
+                raise RuntimeError("Process killed")
+            if subscribers[0].email.startswith("fail"):
+                raise ApiConnectionError("Server error")
+            sent.append(subscribers[0].email)
+            return MockResponse(len(sent))
+
+        monkeypatch.setattr(service, "_call_add_bulk_subscribers_to_list", call_bulk)
+        return sent
+
+    def test_import(self, tmp_path, service, sent):
+        path = tmp_path / "import.checkpoint"
+        result = import_subscribers_to_list(service, 1, make_subscribers(25), path, chunk_size=10)
+
+        assert result.ok
+        assert result.job_ids == [1, 2, 3]
+        assert not path.exists()
+
+    def test_import__resume(self, tmp_path, service, sent):
+        path = tmp_path / "import.checkpoint"
+        subscribers = make_subscribers(50)
+        crashed = subscribers.copy()
+        crashed[30] = make_subscriber("crash@example.com")
+
+        with pytest.raises(RuntimeError):
+            import_subscribers_to_list(service, 1, crashed, path, max_workers=1, chunk_size=10)
+        assert [_c["index"] for _c in json.loads(path.read_text())["chunks"]] == [0, 1, 2]
+
+        sent.clear()
+        result = import_subscribers_to_list(service, 1, subscribers, path, resume=True, max_workers=1, chunk_size=10)
+
+        assert sent == ["user30@example.com", "user40@example.com"]
+        assert [_c.index for _c in result.chunks] == [0, 1, 2, 3, 4]
+        assert result.job_ids == [1, 2, 3, 1, 2]
+        assert [_j.job_id for _j in result.jobs] == result.job_ids
+        assert result.total == 50
+        assert not path.exists()
+
+    def test_import__resume_failed_chunks(self, tmp_path, service, sent):
+        path = tmp_path / "import.checkpoint"
+        subscribers = make_subscribers(30)
+        failing = subscribers.copy()
+        failing[10] = make_subscriber("fail@example.com")
+
+        result = import_subscribers_to_list(service, 1, failing, path, chunk_size=10)
+        assert [_c.index for _c in result.failed_chunks] == [1]
+        assert path.exists()
+
+        sent.clear()
+        result = import_subscribers_to_list(service, 1, subscribers, path, resume=True, chunk_size=10)
+
+        assert sent == ["user10@example.com"]
+        assert result.ok
+
+    def test_import__resume_changed_subscribers(self, tmp_path, service, sent):
+        path = tmp_path / "import.checkpoint"
+        crashed = [*make_subscribers(20), make_subscriber("crash@example.com")]
+        with pytest.raises(RuntimeError):
+            import_subscribers_to_list(service, 1, crashed, path, max_workers=1, chunk_size=10)
+
+        sent.clear()
+        shifted = make_subscribers(25)[5:]
+        import_subscribers_to_list(service, 1, shifted, path, resume=True, max_workers=1, chunk_size=10)
+
+        assert sent == ["user5@example.com", "user15@example.com"]  # Chunks differ from journaled ones.
+
+    def test_import__resume_other_list(self, tmp_path, service, sent):
+        path = tmp_path / "import.checkpoint"
+        with pytest.raises(RuntimeError):
+            import_subscribers_to_list(service, 1, [make_subscriber("crash@example.com")], path)
+
+        with pytest.raises(ValueError):
+            import_subscribers_to_list(service, 2, make_subscribers(10), path, resume=True)
+        result = import_subscribers_to_list(service, 2, make_subscribers(10), path)
+        assert result.ok
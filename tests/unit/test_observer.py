@@ -0,0 +1,62 @@
+import pytest
+
+from ecomail.observer import Histogram, MetricsCollector, RequestEvent
+
+
+def make_event(duration: float = 0.1, status: int | None = 200, attempt: int = 1) -> RequestEvent:
+    return RequestEvent(
+        method="GET",
+        endpoint="campaigns/{campaign_id}/stats-detail",
+        status=status,
+        duration=duration,
+        request_bytes=0,
+        response_bytes=100,
+        attempt=attempt,
+        throttle_wait=0.5,
+    )
+
+
+class TestHistogram:
+
+    def test_percentile(self):
+        histogram = Histogram()
+        for value in range(1, 1001):
+            histogram.record(value / 1000)
+
+        assert len(histogram) == 1000
+        assert histogram.percentile(50) == pytest.approx(0.5, rel=0.02)
+        assert histogram.percentile(95) == pytest.approx(0.95, rel=0.02)
+        assert histogram.percentile(99) == pytest.approx(0.99, rel=0.02)
+        assert histogram.percentile(100) == 1
+        assert histogram.mean == pytest.approx(0.5005)
+
+    def test_percentile__empty(self):
+        assert Histogram().percentile(50) == 0
+
+    def test_percentile__single_value(self):
+        histogram = Histogram()
+        histogram.record(0)
+        assert histogram.percentile(99) == 0
+
+
+class TestMetricsCollector:
+
+    def test_report(self):
+        collector = MetricsCollector()
+        collector(make_event(duration=0.1))
+        collector(make_event(duration=0.2, status=429))
+        collector(make_event(duration=0.3, status=None, attempt=2))
+
+        report = collector.report()["GET campaigns/{campaign_id}/stats-detail"]
+
+        assert (report["count"], report["errors"], report["throttled"], report["retries"]) == (3, 2, 1, 1)
+        assert report["p50"] == pytest.approx(0.2, rel=0.02)
+        assert report["p99"] == pytest.approx(0.3, rel=0.02)
+        assert report["response_bytes"] == 300
+        assert report["throttle_wait"] == pytest.approx(1.5)
+
+    def test_clear(self):
+        collector = MetricsCollector()
+        collector(make_event())
+        collector.clear()
+        assert collector.report() == {}
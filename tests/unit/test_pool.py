@@ -0,0 +1,116 @@
+import threading
+
+import pytest
+
+from ecomail.pool import ServicePool
+from ecomail.rate_limiter import TokenBucket
+from ecomail.service import EcoMailOptions
+
+
+class FakeClock:
+    """
+    Manually advanced clock.
+    """
+    now = 0.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+def make_options(api_key: str) -> EcoMailOptions:
+    return EcoMailOptions(base_url="https://example.com", api_key=api_key)
+
+
+class TestServicePool:
+
+    @pytest.fixture
+    def pool(self) -> ServicePool:
+        """
+        Pool with single worker and accounts "noisy" and "quiet".
+        """
+        pool = ServicePool(max_workers=1)
+        pool.add_account("noisy", make_options("noisy_key"))
+        pool.add_account("quiet", make_options("quiet_key"))
+        yield pool
+        pool.close(cancel_pending=True)
+
+    @staticmethod
+    def block(pool: ServicePool) -> threading.Event:
+        """
+        Occupies the worker until returned event is set.
+        """
+        pool.add_account("blocker", make_options("blocker_key"))
+        gate = threading.Event()
+        pool.submit("blocker", lambda _s: gate.wait())
+        return gate
+
+    def test_submit(self, pool):
+        future = pool.submit("quiet", lambda service: service._options.api_key)
+        assert future.result(timeout=5) == "quiet_key"
+
+    def test_submit__round_robin(self, pool):
+        order = []
+        gate = self.block(pool)
+        futures = [pool.submit("noisy", lambda _s, _i=_i: order.append(f"noisy{_i}")) for _i in range(4)]
+        futures += [pool.submit("quiet", lambda _s, _i=_i: order.append(f"quiet{_i}")) for _i in range(2)]
+        gate.set()
+        for future in futures:
+            future.result(timeout=5)
+
+        assert order == ["noisy0", "quiet0", "noisy1", "quiet1", "noisy2", "noisy3"]
+
+    def test_submit__throttled_account_skipped(self, pool):
+        clock = FakeClock()
+        noisy = pool.service("noisy")
+        noisy._rate_limiter = TokenBucket(rate=1, capacity=1, clock=clock)
+        noisy.rate_limiter.reserve()  # Bucket is empty.
+        order = []
+        gate = self.block(pool)
+        noisy_future = pool.submit("noisy", lambda _s: order.append("noisy"))
+        quiet_future = pool.submit("quiet", lambda _s: order.append("quiet"))
+        gate.set()
+
+        quiet_future.result(timeout=5)
+        assert order == ["quiet"]
+        clock.now = 1  # Token is available.
+        noisy_future.result(timeout=5)
+        assert order == ["quiet", "noisy"]
+
+    def test_submit__max_in_flight(self):
+        running, peak, lock = [0], [0], threading.Lock()
+        barrier = threading.Event()
+
+        def operation(_s):
+            with lock:
+                running[0] += 1
+                peak[0] = max(peak[0], running[0])
+            barrier.wait(0.05)
+            with lock:
+                running[0] -= 1
+
+        with ServicePool(max_workers=4, max_in_flight=2) as pool:
+            pool.add_account("noisy", make_options("noisy_key"))
+            futures = [pool.submit("noisy", operation) for _ in range(6)]
+            for future in futures:
+                future.result(timeout=5)
+
+        assert peak[0] == 2
+
+    def test_submit__exception(self, pool):
+        future = pool.submit("quiet", lambda _s: 1 / 0)
+        with pytest.raises(ZeroDivisionError):
+            future.result(timeout=5)
+
+    def test_close__cancel_pending(self, pool):
+        gate = self.block(pool)
+        future = pool.submit("quiet", lambda _s: None)
+        threading.Timer(0.05, gate.set).start()
+        pool.close(cancel_pending=True)
+
+        assert future.cancelled()
+        with pytest.raises(RuntimeError):
+            pool.submit("quiet", lambda _s: None)
+
+    def test_add_account__duplicate(self, pool):
+        with pytest.raises(ValueError):
+            pool.add_account("quiet", make_options("other_key"))
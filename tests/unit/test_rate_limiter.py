@@ -0,0 +1,69 @@
+import threading
+
+import pytest
+
+from ecomail.rate_limiter import TokenBucket
+
+
+class FakeClock:
+    """
+    Manually advanced clock.
+    """
+    now = 0.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+class TestTokenBucket:
+
+    @pytest.fixture
+    def clock(self) -> FakeClock:
+        return FakeClock()
+
+    def test_reserve__burst(self, clock):
+        bucket = TokenBucket(rate=1, capacity=3, clock=clock)
+
+        assert [bucket.reserve() for _ in range(3)] == [0, 0, 0]
+        assert bucket.reserve() == pytest.approx(1)
+        assert bucket.reserve() == pytest.approx(2)  # Callers are queued.
+
+    def test_wait_time__refill(self, clock):
+        bucket = TokenBucket(rate=2, capacity=1, clock=clock)
+        bucket.reserve()
+
+        assert bucket.wait_time == pytest.approx(0.5)
+        clock.now = 0.25
+        assert bucket.wait_time == pytest.approx(0.25)
+        clock.now = 10
+        assert bucket.wait_time == 0
+        assert bucket.reserve() == 0
+        assert bucket.wait_time == pytest.approx(0.5)  # Bucket is not refilled over capacity.
+
+    def test_for_quota(self):
+        bucket = TokenBucket.for_quota(calls=1000, period=60, burst=100)
+
+        assert bucket.capacity == 100
+        # Burst plus refill over period never exceeds quota.
+        assert bucket.capacity + bucket.rate * 60 == pytest.approx(1000)
+
+    @pytest.mark.parametrize("calls,burst", [(1000, 100), (100, 10), (10, 1), (2, 1)])
+    def test_for_quota__default_burst(self, calls, burst):
+        bucket = TokenBucket.for_quota(calls=calls, period=60)
+
+        assert bucket.capacity == burst
+        assert bucket.capacity + bucket.rate * 60 == pytest.approx(calls)
+
+    def test_for_quota__invalid_burst(self):
+        with pytest.raises(ValueError):
+            _ = TokenBucket.for_quota(calls=10, period=60, burst=10)
+
+    def test_acquire__thread_safe(self, clock):
+        bucket = TokenBucket(rate=1, capacity=50, clock=clock)
+        threads = [threading.Thread(target=bucket.acquire) for _ in range(50)]
+        for _t in threads:
+            _t.start()
+        for _t in threads:
+            _t.join()
+
+        assert bucket.wait_time == pytest.approx(1)  # Every thread took exactly one token.
@@ -0,0 +1,54 @@
+import datetime
+from email.utils import format_datetime
+
+import pytest
+
+from ecomail.retry import RetryPolicy, parse_retry_after
+
+
+class TestRetryPolicy:
+
+    def test_backoff__jitter_and_cap(self):
+        policy = RetryPolicy(backoff_factor=1, max_backoff=5)
+        for _ in range(100):
+            assert 0 <= policy.backoff(1) <= 1
+            assert 0 <= policy.backoff(10) <= 5
+
+    def test_next_delay__retry_after(self):
+        policy = RetryPolicy()
+        assert policy.next_delay(attempt=1, elapsed=0, headers={"Retry-After": "7"}) == 7
+
+    def test_next_delay__status_code(self):
+        policy = RetryPolicy()
+        assert policy.next_delay(attempt=1, elapsed=0, status_code=503) is not None
+        assert policy.next_delay(attempt=1, elapsed=0, status_code=404) is None
+
+    def test_next_delay__max_retries(self):
+        policy = RetryPolicy(max_retries=2)
+        assert policy.next_delay(attempt=2, elapsed=0) is not None
+        assert policy.next_delay(attempt=3, elapsed=0) is None
+
+    def test_next_delay__max_retry_time(self):
+        policy = RetryPolicy(max_retry_time=10)
+        assert policy.next_delay(attempt=1, elapsed=5, headers={"Retry-After": "5"}) == 5
+        assert policy.next_delay(attempt=1, elapsed=5, headers={"Retry-After": "6"}) is None
+
+
+@pytest.mark.parametrize(
+    "value, expected_output",
+    [
+        (None, None),
+        ("", None),
+        ("120", 120),
+        ("-1", 0),
+        ("invalid", None),
+        ("Wed, 21 Oct 2015 07:28:00 GMT", 0),  # Date in the past.
+    ]
+)
+def test_parse_retry_after(value, expected_output):
+    assert parse_retry_after(value) == expected_output
+
+
+def test_parse_retry_after__future_date():
+    retry_at = datetime.datetime.now(datetime.timezone.utc) + datetime.timedelta(seconds=60)
+    assert parse_retry_after(format_datetime(retry_at, usegmt=True)) == pytest.approx(60, abs=2)
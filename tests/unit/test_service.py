@@ -1,11 +1,19 @@
 import datetime
+import io
+import json
+import threading
+import time
 from typing import Any
 
 import pytest
+import requests
 
+from ecomail.bulk import BulkJob, BulkJobStatus
 from ecomail.campaign import CampaignStatus
 from ecomail.exceptions import ApiConnectionError, ApiRequestError
+from ecomail.retry import RetryPolicy
 from ecomail.service import EcoMailOptions, EcoMailService
+from ecomail.subscriber import Subscriber
 from tests.conftest import subscriber
 
 
@@ -19,6 +27,10 @@ class MockResponse:
     def json(self, *args, **kwargs) -> dict[str, Any]:
         return self._val
 
+    @property
+    def content(self) -> bytes:
+        return json.dumps(self._val).encode()
+
 
 class TestEcoMailService:
 
@@ -119,8 +131,18 @@ class TestEcoMailService:
         )
 
         subscribers = [subscriber for _ in range(100)]
-        # Does not return anything.
-        service.add_bulk_subscribers_to_list(list_id=123, subscribers=subscribers)
+        # Response contains no job ID.
+        assert service.add_bulk_subscribers_to_list(list_id=123, subscribers=subscribers) is None
+
+    def test_add_bulk_subscribers_to_list__job(self, monkeypatch, service, subscriber):
+        class BulkJobMockResponse(MockResponse):
+            _val = {"job_id": 7}
+
+        monkeypatch.setattr(service, "_call_add_bulk_subscribers_to_list", lambda *args: BulkJobMockResponse())
+
+        job = service.add_bulk_subscribers_to_list(list_id=123, subscribers=[subscriber])
+
+        assert (job.list_id, job.job_id, job.count, job.status) == (123, 7, 1, BulkJobStatus.PENDING)
 
     def test_add_bulk_subscribers_to_list__too_many_subscribers(self, monkeypatch, service, subscriber):
         # noinspection PyUnusedLocal
@@ -276,3 +298,715 @@ class TestEcoMailService:
         monkeypatch.setattr(service, "_call_api", lambda *args, **kwargs: MockResponse())
         with pytest.raises(ApiRequestError):
             _ = service.get_subscriber_details(subscriber_email="user@example.com", list_id=123)
+
+    def test_get_subscribers_details(self, monkeypatch, service):
+        requested = []
+
+        # noinspection PyUnusedLocal
+        def request(session, method, url, **kwargs):
+            email = url.rsplit("/", 1)[1]
+            requested.append(email)
+            if email.startswith("missing"):
+                return self.make_response(404)
+            if email.startswith("forbidden"):
+                return self.make_response(403)
+            return self.make_json_response(200, {"subscriber": {"name": "Jan", "surname": "Novak", "email": email}})
+
+        monkeypatch.setattr(requests.Session, "request", request)
+        emails = ["b@example.com", "missing@example.com", "a@example.com", "forbidden@example.com", "b@example.com"]
+
+        result = service.get_subscribers_details(list_id=1, emails=emails, max_workers=3)
+
+        assert sorted(requested) == sorted(set(emails))  # Duplicates are looked up once.
+        assert list(result.found) == ["b@example.com", "a@example.com"]
+        assert result.found["a@example.com"].email == "a@example.com"
+        assert result.not_found == ["missing@example.com"]
+        assert list(result.failed) == ["forbidden@example.com"]
+        assert result.failed["forbidden@example.com"].status_code == 403
+        assert not result.ok
+
+    def test_call_api__uses_pooled_session(self, monkeypatch, service):
+        calls = []
+
+        class OkMockResponse(MockResponse):
+            def raise_for_status(self) -> None:
+                pass
+
+        # noinspection PyUnusedLocal
+        def request(session, method, url, **kwargs):
+            calls.append((session, method, url, kwargs))
+            return OkMockResponse()
+
+        monkeypatch.setattr(requests.Session, "request", request)
+
+        service._call_get(endpoint="campaigns", query={})
+        service._call_post(endpoint="lists", json={"name": "Test list"})
+
+        assert [_c[1] for _c in calls] == ["GET", "POST"]
+        assert calls[0][0] is calls[1][0]  # Session is reused.
+        assert calls[0][0].headers["key"] == "123_mock_key"
+        assert calls[0][0].get_adapter("https://example.com") is service._adapter
+        assert calls[1][3]["json"] == {"name": "Test list"}
+
+    def test_get_session__one_session_per_thread(self, service):
+        sessions = []
+        thread = threading.Thread(target=lambda: sessions.append(service._get_session()))
+        thread.start()
+        thread.join()
+        sessions.append(service._get_session())
+
+        assert sessions[0] is not sessions[1]
+        assert sessions[0].get_adapter("https://example.com") is sessions[1].get_adapter("https://example.com")
+
+    def test_get_session__sessions_of_finished_threads_are_freed(self, monkeypatch, service):
+        # noinspection PyUnusedLocal
+        def request(session, method, url, params=None, **kwargs):
+            return self.make_json_response(200, self.stats_detail_page(params["page"]).json())
+
+        monkeypatch.setattr(requests.Session, "request", request)
+        monkeypatch.setattr(service, "_rate_limiter", None)
+
+        for _ in range(50):
+            service.get_campaigns_stats_detail(campaign_id=123, max_workers=4)
+
+        assert len(service._sessions) <= 5  # Calling thread and at most one executor still being released.
+
+    def test_close__context_manager(self, monkeypatch, service):
+        closed = []
+        monkeypatch.setattr(service._adapter, "close", lambda: closed.append(True))
+
+        with service as _s:
+            session = _s._get_session()
+
+        assert closed
+        assert service._get_session() is not session  # New session is opened after close.
+
+    def test_call_api__rate_limited(self, monkeypatch, service):
+        acquired = []
+        monkeypatch.setattr(service.rate_limiter, "acquire", lambda: acquired.append(True))
+        monkeypatch.setattr(requests.Session, "request", lambda *args, **kwargs: MockResponse())
+        monkeypatch.setattr(MockResponse, "raise_for_status", lambda _self: None, raising=False)
+
+        service._call_get(endpoint="campaigns", query={})
+
+        assert acquired == [True]
+
+    def test_rate_limiter__disabled(self):
+        options = EcoMailOptions(base_url="https://example.com", api_key="123_mock_key", rate_limit_calls=None)
+        assert EcoMailService(options=options).rate_limiter is None
+
+    @pytest.mark.parametrize("calls", [100, 50, 2])
+    def test_rate_limiter__small_quota(self, calls):
+        options = EcoMailOptions(base_url="https://example.com", api_key="123_mock_key", rate_limit_calls=calls)
+        rate_limiter = EcoMailService(options=options).rate_limiter
+
+        assert rate_limiter.capacity < calls  # Default burst fits into the quota.
+
+    @staticmethod
+    def mock_session_responses(monkeypatch, responses: list) -> list:
+        """
+        Mocks session requests with given responses or exceptions. Returns list of called methods.
+        """
+        calls = []
+
+        # noinspection PyUnusedLocal
+        def request(session, method, url, **kwargs):
+            calls.append(method)
+            response = responses.pop(0)
+            if isinstance(response, Exception):
+                raise response
+            return response
+
+        monkeypatch.setattr(requests.Session, "request", request)
+        monkeypatch.setattr(time, "sleep", lambda _s: None)
+        return calls
+
+    @staticmethod
+    def make_response(status_code: int, headers: dict[str, str] | None = None) -> requests.Response:
+        response = requests.Response()
+        response.status_code = status_code
+        response.headers.update(headers or {})
+        response._content = b"{}"
+        response.raw = io.BytesIO()
+        return response
+
+    @staticmethod
+    def make_json_response(status_code: int, data: Any, headers: dict[str, str] | None = None) -> requests.Response:
+        response = TestEcoMailService.make_response(status_code, headers)
+        response._content = json.dumps(data).encode()
+        return response
+
+    def test_call_api__retry_after(self, monkeypatch, service):
+        delays = []
+        calls = self.mock_session_responses(monkeypatch, [
+            self.make_response(429, {"Retry-After": "3"}),
+            self.make_response(200),
+        ])
+        monkeypatch.setattr(time, "sleep", delays.append)
+
+        response = service._call_post(endpoint="lists", json={})
+
+        assert response.status_code == 200
+        assert calls == ["POST", "POST"]  # Throttled calls are retried even if not idempotent.
+        assert delays == [3]
+
+    def test_call_api__server_error_idempotent(self, monkeypatch, service):
+        calls = self.mock_session_responses(monkeypatch, [
+            self.make_response(503),
+            requests.ConnectionError("Connection reset by peer"),
+            self.make_response(200),
+        ])
+
+        response = service._call_get(endpoint="campaigns", query={})
+
+        assert response.status_code == 200
+        assert calls == ["GET", "GET", "GET"]
+
+    def test_call_api__server_error_not_idempotent(self, monkeypatch, service):
+        calls = self.mock_session_responses(monkeypatch, [self.make_response(503)])
+        with pytest.raises(ApiConnectionError):
+            _ = service._call_post(endpoint="lists", json={})
+        assert calls == ["POST"]
+
+    def test_call_api__connection_error_not_idempotent(self, monkeypatch, service):
+        calls = self.mock_session_responses(monkeypatch, [requests.ConnectionError()])
+        with pytest.raises(ApiConnectionError):
+            _ = service._call_post(endpoint="lists", json={})
+        assert calls == ["POST"]
+
+    def test_call_api__client_error_not_retried(self, monkeypatch, service):
+        calls = self.mock_session_responses(monkeypatch, [self.make_response(400)])
+        with pytest.raises(ApiConnectionError):
+            _ = service._call_get(endpoint="campaigns", query={})
+        assert calls == ["GET"]
+
+    def test_call_api__retries_exhausted(self, monkeypatch, service):
+        service._options.retry_policy = RetryPolicy(max_retries=2)
+        calls = self.mock_session_responses(monkeypatch, [self.make_response(500) for _ in range(3)])
+        with pytest.raises(ApiConnectionError):
+            _ = service._call_put(endpoint="lists/1/update-subscriber", json={})
+        assert calls == ["PUT", "PUT", "PUT"]
+
+    def test_call_api__subscribe_idempotent(self, monkeypatch, service, subscriber):
+        calls = self.mock_session_responses(monkeypatch, [self.make_response(502), self.make_response(200)])
+        _ = service._call_add_new_subscriber_to_list(list_id=1, subscriber=subscriber, trigger_autoresponders=False)
+        assert calls == ["POST", "POST"]
+
+    def test_import_subscribers_to_list(self, monkeypatch, service, subscriber):
+        chunk_sizes = []
+
+        class BulkJobMockResponse(MockResponse):
+            """
+            Mock response with job ID.
+            """
+            _val = {"job_id": 7}
+
+        def call_bulk(list_id, subscribers):
+            chunk_sizes.append(len(subscribers))
+            if len(chunk_sizes) == 2:
+                raise ApiConnectionError("Server error")
+            return BulkJobMockResponse()
+
+        monkeypatch.setattr(service, "_call_add_bulk_subscribers_to_list", call_bulk)
+
+        result = service.import_subscribers_to_list(
+            list_id=123,
+            subscribers=(subscriber for _ in range(7001)),
+            max_workers=1,
+        )
+
+        assert chunk_sizes == [3000, 3000, 1001]
+        assert [_c.index for _c in result.chunks] == [0, 1, 2]
+        assert result.total == 7001
+        assert result.imported == 4001
+        assert result.job_ids == [7, 7]
+        assert isinstance(result.failed_chunks[0].error, ApiConnectionError)
+
+    def test_import_subscribers_to_list__concurrent(self, monkeypatch, service, subscriber):
+        lock = threading.Lock()
+        in_flight = [0]
+        max_in_flight = [0]
+
+        def call_bulk(*args, **kwargs):
+            with lock:
+                in_flight[0] += 1
+                max_in_flight[0] = max(max_in_flight[0], in_flight[0])
+            time.sleep(0.01)
+            with lock:
+                in_flight[0] -= 1
+            return MockResponse()
+
+        monkeypatch.setattr(service, "_call_add_bulk_subscribers_to_list", call_bulk)
+
+        result = service.import_subscribers_to_list(
+            list_id=123,
+            subscribers=[subscriber for _ in range(100)],
+            max_workers=3,
+            chunk_size=10,
+        )
+
+        assert result.ok
+        assert len(result.chunks) == 10
+        assert 1 < max_in_flight[0] <= 3
+
+    @staticmethod
+    def stats_detail_page(page: int, total: int = 10, per_page: int = 2, with_per_page: bool = True) -> MockResponse:
+        """
+        Mock response with given page of campaign statistics.
+        """
+        class StatsDetailPageMockResponse(MockResponse):
+            _val = {
+                "total": total,
+                "next_page_url": "next" if page * per_page < total else None,
+                "subscribers": {
+                    f"foo{_i}@bar.com": {"open": _i, "send": 1, "click": 0}
+                    for _i in range((page - 1) * per_page, min(page * per_page, total))
+                },
+            }
+            if with_per_page:
+                _val["per_page"] = per_page
+
+        return StatsDetailPageMockResponse()
+
+    def test_get_campaigns_stats_detail__pages(self, monkeypatch, service):
+        pages = []
+
+        def call_page(campaign_id, page):
+            pages.append(page)
+            return self.stats_detail_page(page)
+
+        monkeypatch.setattr(service, "_call_get_campaigns_stats_detail_page", call_page)
+
+        stats = service.get_campaigns_stats_detail(campaign_id=123)
+
+        assert pages == [1, 2, 3, 4, 5]
+        assert [_s.open for _s in stats.subscribers] == list(range(10))
+
+    def test_get_campaigns_stats_detail__parallel(self, monkeypatch, service):
+        pages = []
+
+        def call_page(campaign_id, page):
+            time.sleep(0.01 * (5 - page))  # Later pages arrive first.
+            pages.append(page)
+            return self.stats_detail_page(page, total=9)
+
+        monkeypatch.setattr(service, "_call_get_campaigns_stats_detail_page", call_page)
+
+        stats = service.get_campaigns_stats_detail(campaign_id=123, max_workers=4)
+
+        assert sorted(pages) == [1, 2, 3, 4, 5]
+        assert pages != [1, 2, 3, 4, 5]  # Pages were fetched concurrently.
+        assert [_s.open for _s in stats.subscribers] == list(range(9))  # Deterministic order.
+
+    def test_get_campaigns_stats_detail__streamed(self, monkeypatch, service):
+        responses = []
+        for page in (1, 2):
+            response = self.make_response(200)
+            response._content = False  # Body is read from raw stream.
+            response.raw = io.BytesIO(json.dumps(self.stats_detail_page(page, total=3).json()).encode())
+            responses.append(response)
+        self.mock_session_responses(monkeypatch, responses)
+        service._options.stream_stats_pages = True
+
+        stats = service.get_campaigns_stats_detail(campaign_id=123)
+
+        assert [_s.open for _s in stats.subscribers] == [0, 1, 2]
+        assert all(_r.raw.closed for _r in responses)
+
+    def test_iter_campaigns_stats_detail(self, monkeypatch, service):
+        campaigns = [
+            {**self.campaign_data(1), "recipients": 6},
+            {**self.campaign_data(2), "recipients": 2},
+            {**self.campaign_data(3), "recipients": 4},
+            {**self.campaign_data(4, status=0), "recipients": 0},
+        ]
+
+        class CampaignsListMockResponse(MockResponse):
+            _val = campaigns
+
+        requested = []
+
+        def call_page(campaign_id, page):
+            requested.append((campaign_id, page))
+            if campaign_id == 3:
+                raise ApiConnectionError("Server error.", status_code=500)
+            return self.stats_detail_page(page, total=campaigns[campaign_id - 1]["recipients"])
+
+        monkeypatch.setattr(service, "_call_get_campaigns_list_page", lambda page=1: CampaignsListMockResponse())
+        monkeypatch.setattr(service, "_call_get_campaigns_stats_detail_page", call_page)
+
+        results = list(service.iter_campaigns_stats_detail(statuses=[CampaignStatus.SENT], max_workers=1))
+
+        assert [(_r.campaign_id, _r.ok) for _r in results] == [(2, True), (3, False), (1, True)]
+        assert requested == [(2, 1), (3, 1), (1, 1), (1, 2), (1, 3)]  # Smallest campaigns first.
+        assert [_s.open for _s in results[2].stats.subscribers] == list(range(6))
+        assert results[1].error.status_code == 500
+
+    def test_iter_campaigns_stats_detail__parallel(self, monkeypatch, service):
+        class CampaignsListMockResponse(MockResponse):
+            _val = [{**self.campaign_data(_i), "recipients": 10 * _i} for _i in (1, 2, 3)]
+
+        requested = []
+
+        def call_page(campaign_id, page):
+            requested.append((campaign_id, page))
+            time.sleep(0.005 * (6 - page))  # Later pages arrive first.
+            return self.stats_detail_page(page, total=10 * campaign_id if campaign_id < 9 else 5, per_page=5)
+
+        monkeypatch.setattr(service, "_call_get_campaigns_list_page", lambda page=1: CampaignsListMockResponse())
+        monkeypatch.setattr(service, "_call_get_campaigns_stats_detail_page", call_page)
+
+        results = {_r.campaign_id: _r for _r in service.iter_campaigns_stats_detail(campaign_ids=[3, 1, 9, 1])}
+
+        assert set(requested[:3]) == {(1, 1), (3, 1), (9, 1)}  # Duplicate ID is fetched once.
+        assert sorted(requested) == [(1, 1), (1, 2), (3, 1), (3, 2), (3, 3), (3, 4), (3, 5), (3, 6), (9, 1)]
+        assert [_s.open for _s in results[3].stats.subscribers] == list(range(30))  # Page order is kept.
+        assert len(results[9].stats.subscribers) == 5
+
+    def test_iter_campaigns_stats_detail__without_per_page(self, monkeypatch, service):
+        requested = []
+
+        def call_page(campaign_id, page):
+            requested.append((campaign_id, page))
+            return self.stats_detail_page(page, total=2 * campaign_id, with_per_page=False)
+
+        class CampaignsListMockResponse(MockResponse):
+            _val = []
+
+        monkeypatch.setattr(service, "_call_get_campaigns_list_page", lambda page=1: CampaignsListMockResponse())
+        monkeypatch.setattr(service, "_call_get_campaigns_stats_detail_page", call_page)
+
+        results = {_r.campaign_id: _r for _r in service.iter_campaigns_stats_detail(campaign_ids=[1, 2])}
+
+        assert sorted(requested) == [(1, 1), (2, 1), (2, 2)]  # Pages are followed one by one.
+        assert [_s.open for _s in results[2].stats.subscribers] == [0, 1, 2, 3]
+        assert all(_r.ok for _r in results.values())
+
+    def test_iter_campaign_stats_detail__lazy(self, monkeypatch, service):
+        pages = []
+
+        def call_page(campaign_id, page):
+            pages.append(page)
+            return self.stats_detail_page(page)
+
+        monkeypatch.setattr(service, "_call_get_campaigns_stats_detail_page", call_page)
+
+        subscribers = service.iter_campaign_stats_detail(campaign_id=123)
+        first = [next(subscribers) for _ in range(3)]
+
+        assert [_s.open for _s in first] == [0, 1, 2]
+        assert pages == [1, 2]  # Next pages are fetched only when consumed.
+
+    def test_iter_campaign_stats_detail_pages__parallel_bounded(self, monkeypatch, service):
+        pages = []
+        monkeypatch.setattr(
+            service,
+            "_call_get_campaigns_stats_detail_page",
+            lambda campaign_id, page: pages.append(page) or self.stats_detail_page(page, total=20),
+        )
+
+        iterator = service.iter_campaign_stats_detail_pages(campaign_id=123, max_workers=3)
+        assert len(next(iterator)) == 2
+        assert len(next(iterator)) == 2
+        iterator.close()
+
+        assert len(pages) <= 4  # First page and at most 3 prefetched pages.
+
+    def test_get_campaign_stats_detail_columns(self, monkeypatch, service):
+        monkeypatch.setattr(
+            service,
+            "_call_get_campaigns_stats_detail_page",
+            lambda campaign_id, page: self.stats_detail_page(page),
+        )
+
+        columns = service.get_campaign_stats_detail_columns(campaign_id=123, max_workers=2)
+
+        assert len(columns) == 10
+        assert columns.total_opens == sum(range(10))
+
+    def test_get_subscriber_details__cached(self, monkeypatch, service):
+        service._options.cache_ttls = {"subscriber": 60}
+        _d = {"subscriber": {"name": "Jan", "surname": "Novak", "email": "user@example.com"}}
+        calls = self.mock_session_responses(monkeypatch, [
+            self.make_json_response(200, _d),
+            self.make_json_response(200, _d),
+        ])
+
+        _ = service.get_subscriber_details(list_id=1, subscriber_email="user@example.com")
+        _ = service.get_subscriber_details(list_id=1, subscriber_email="user@example.com")
+        assert calls == ["GET"]
+
+        self.mock_session_responses(monkeypatch, [self.make_json_response(200, {})])
+        service.update_subscriber(list_id=1, subscriber_email="user@example.com", data={"name": "Jana"})
+        calls = self.mock_session_responses(monkeypatch, [self.make_json_response(200, _d)])
+        _ = service.get_subscriber_details(list_id=1, subscriber_email="user@example.com")
+        assert calls == ["GET"]  # Cache was invalidated by update.
+
+    def test_get_campaigns_list__revalidated(self, monkeypatch, service):
+        service._options.cache_ttls = {"campaigns": 0.01}
+        requests_ = []
+        responses = [
+            self.make_json_response(200, [], headers={"ETag": '"v1"'}),
+            self.make_response(304),
+        ]
+
+        # noinspection PyUnusedLocal
+        def request(session, method, url, **kwargs):
+            requests_.append(kwargs)
+            return responses.pop(0)
+
+        monkeypatch.setattr(requests.Session, "request", request)
+
+        assert service.get_campaigns_list() == []
+        time.sleep(0.02)
+        assert service.get_campaigns_list() == []  # Cached response is used after 304.
+        assert requests_[1]["headers"] == {"If-None-Match": '"v1"'}
+
+    def test_get_campaigns_list__cache_disabled(self, monkeypatch, service):
+        calls = self.mock_session_responses(monkeypatch, [
+            self.make_json_response(200, []),
+            self.make_json_response(200, []),
+        ])
+        _ = service.get_campaigns_list()
+        _ = service.get_campaigns_list()
+        assert calls == ["GET", "GET"]
+
+    @staticmethod
+    def campaign_data(campaign_id: int, status: int = 3) -> dict[str, Any]:
+        return {
+            "id": campaign_id,
+            "from_name": "From name",
+            "from_email": "from@foo.cz",
+            "reply_to": "reply@bar.cz",
+            "title": f"Campaign {campaign_id}",
+            "subject": "Hello",
+            "sent_at": None if status == 0 else "2014-09-08 22:04:03",
+            "recipients": 1,
+            "status": status,
+        }
+
+    def mock_campaign_pages(self, monkeypatch, service, pages: list[list[int]]) -> list[int]:
+        """
+        Mocks paginated campaigns list with given IDs on every page. Returns list of requested pages.
+        """
+        requested = []
+
+        def call_page(page=1):
+            requested.append(page)
+
+            class CampaignsPageMockResponse(MockResponse):
+                _val = {
+                    "data": [self.campaign_data(_i) for _i in pages[page - 1]],
+                    "next_page_url": "next" if page < len(pages) else None,
+                }
+
+            return CampaignsPageMockResponse()
+
+        monkeypatch.setattr(service, "_call_get_campaigns_list_page", call_page)
+        return requested
+
+    def test_get_campaigns_list__pages(self, monkeypatch, service):
+        requested = self.mock_campaign_pages(monkeypatch, service, [[5, 4], [3, 2], [1]])
+        assert [_c.id for _c in service.get_campaigns_list()] == [5, 4, 3, 2, 1]
+        assert requested == [1, 2, 3]
+
+    def test_iter_campaigns__since_id(self, monkeypatch, service):
+        requested = self.mock_campaign_pages(monkeypatch, service, [[7, 6, 5], [4, 3, 2], [1]])
+        fetched = []
+
+        def call_campaign(campaign_id):
+            fetched.append(campaign_id)
+
+            class CampaignMockResponse(MockResponse):
+                _val = {"campaign": self.campaign_data(campaign_id, status=2)}
+
+            return CampaignMockResponse()
+
+        monkeypatch.setattr(service, "_call_get_campaign", call_campaign)
+
+        campaigns = list(service.iter_campaigns(since_id=4, include_ids=[5, 3, 1]))
+
+        assert [_c.id for _c in campaigns] == [7, 6, 5, 3, 1]
+        assert requested == [1, 2]  # Paging stopped at page with already synced campaigns.
+        assert fetched == [1]
+        assert campaigns[-1].status == CampaignStatus.SENDING
+
+    def test_iter_campaigns__since_id_deleted(self, monkeypatch, service):
+        self.mock_campaign_pages(monkeypatch, service, [[3, 2], [1]])
+        self.mock_session_responses(monkeypatch, [self.make_response(404)])
+
+        assert [_c.id for _c in service.iter_campaigns(since_id=2, include_ids=[1])] == [3]
+
+    def test_iter_campaigns__since_id_unordered(self, monkeypatch, service):
+        requested = self.mock_campaign_pages(monkeypatch, service, [[1, 2], [3, 4]])
+        assert [_c.id for _c in service.iter_campaigns(since_id=2)] == [3, 4]
+        assert requested == [1, 2]  # Order of pages is unknown, all pages are fetched.
+
+    def test_update_subscribers(self, monkeypatch, service):
+        calls = []
+        monkeypatch.setattr(service, "_call_post", lambda **kwargs: calls.append(kwargs))
+
+        service.update_subscribers(list_id=1, updates={"a@example.com": {"name": "A"}})
+
+        assert calls[0]["endpoint"] == "lists/1/subscribe-bulk"
+        data = json.loads(b"".join(calls[0]["body"]()))
+        assert data["subscriber_data"] == [{"name": "A", "email": "a@example.com"}]
+        assert data["update_existing"] is True
+
+    @pytest.mark.parametrize("body", [b"OK", b"[1]"])
+    def test_add_bulk_subscribers_to_list__no_job_id(self, monkeypatch, service, subscriber, body):
+        response = self.make_response(200)
+        response._content = body
+        self.mock_session_responses(monkeypatch, [response])
+
+        assert service.add_bulk_subscribers_to_list(list_id=1, subscribers=[subscriber]) is None
+
+    def test_add_bulk_subscribers_to_list__streamed(self, monkeypatch, service, subscriber):
+        requests_ = []
+
+        # noinspection PyUnusedLocal
+        def request(session, method, url, data=None, headers=None, **kwargs):
+            requests_.append((list(data), headers))  # Body is consumed like by requests.
+            return self.make_json_response(200 if len(requests_) > 1 else 503, {"job_id": 1})
+
+        monkeypatch.setattr(requests.Session, "request", request)
+        monkeypatch.setattr(time, "sleep", lambda _s: None)
+        events = []
+        service._options.observers = [events.append]
+
+        subscribers = [Subscriber(name="Jan", surname="Novak", email=f"user{_i}@example.com") for _i in range(3000)]
+        _ = service.add_bulk_subscribers_to_list(list_id=1, subscribers=subscribers)
+
+        chunks, headers = requests_[1]
+        assert len(chunks) > 1  # Payload is streamed in chunks.
+        assert headers == {"Content-Type": "application/json"}
+        assert requests_[0][0] == chunks  # Body is encoded again on retry.
+        assert json.loads(b"".join(chunks))["subscriber_data"][2999] == subscribers[2999].as_dict()
+        assert [_e.request_bytes for _e in events] == [sum(map(len, chunks))] * 2
+
+    def test_import_subscribers_to_list__not_json_response(self, monkeypatch, service, subscriber):
+        response = self.make_response(200)
+        response._content = b"OK"
+        self.mock_session_responses(monkeypatch, [response, self.make_json_response(200, {"job_id": 2})])
+        chunks = []
+
+        result = service.import_subscribers_to_list(
+            list_id=123,
+            subscribers=[subscriber for _ in range(2)],
+            max_workers=1,
+            chunk_size=1,
+            on_chunk=lambda _r, _c: chunks.append(_r),
+        )
+
+        assert result.ok
+        assert [(_c.index, _c.job) for _c in chunks][0] == (0, None)  # Accepted chunk without job ID.
+        assert result.job_ids == [2]
+
+    def test_refresh_bulk_job__unknown_status(self, monkeypatch, service):
+        class UnknownStatusMockResponse(MockResponse):
+            _val = {"id": 1}
+
+        monkeypatch.setattr(service, "_call_get_bulk_job_status", lambda *args: UnknownStatusMockResponse())
+        monkeypatch.setattr(time, "sleep", lambda _s: None)
+
+        with pytest.raises(ApiConnectionError):
+            service.wait_for_bulk_jobs([BulkJob(list_id=1, job_id=1, count=10)])
+
+    def test_import_subscribers_to_list__on_chunk(self, monkeypatch, service, subscriber):
+        chunks = []
+        monkeypatch.setattr(service, "_call_add_bulk_subscribers_to_list", lambda *args: MockResponse())
+
+        _ = service.import_subscribers_to_list(
+            list_id=123,
+            subscribers=[subscriber for _ in range(25)],
+            chunk_size=10,
+            on_chunk=lambda result, chunk: chunks.append((result.index, len(chunk), threading.current_thread())),
+        )
+
+        assert sorted(_c[:2] for _c in chunks) == [(0, 10), (1, 10), (2, 5)]
+        assert all(_c[2] is threading.current_thread() for _c in chunks)  # Called in calling thread.
+
+    def test_call_api__observers(self, monkeypatch, service, subscriber):
+        events = []
+        service._options.observers = [events.append]
+        self.mock_session_responses(monkeypatch, [
+            requests.ConnectionError("Connection reset by peer"),
+            self.make_json_response(200, {"id": 1}),
+        ])
+
+        _ = service.add_new_subscriber_to_list(list_id=1, subscriber=subscriber)
+
+        assert [(_e.method, _e.endpoint, _e.status, _e.attempt) for _e in events] == [
+            ("POST", "lists/{list_id}/subscribe", None, 1),
+            ("POST", "lists/{list_id}/subscribe", 200, 2),
+        ]
+        assert events[0].error == "Connection reset by peer"
+        assert events[1].response_bytes == len(b'{"id": 1}')
+        assert all(_e.duration >= 0 and _e.throttle_wait == 0 for _e in events)
+
+    def test_call_api__observer_error(self, monkeypatch, service, subscriber):
+        # noinspection PyUnusedLocal
+        def broken_observer(event):
+            raise RuntimeError("Observer error")
+
+        events = []
+        service._options.observers = [broken_observer, events.append]
+        self.mock_session_responses(monkeypatch, [self.make_json_response(200, {"id": 1})])
+
+        subscriber_id = service.add_new_subscriber_to_list(list_id=1, subscriber=subscriber)
+
+        assert subscriber_id == 1
+        assert len(events) == 1  # Following observers are still called.
+
+    def test_wait_for_bulk_jobs(self, monkeypatch, service):
+        # Job 2 of list 1 is done once job 1 is done, job 3 of list 2 after three polls.
+        polls = {1: ["pending", "done"], 2: ["done"], 3: ["pending", "pending", "done"]}
+        calls, delays = [], []
+
+        def call_status(list_id, job_id):
+            calls.append(job_id)
+
+            class JobStatusMockResponse(MockResponse):
+                _val = {"status": polls[job_id].pop(0)}
+
+            return JobStatusMockResponse()
+
+        monkeypatch.setattr(service, "_call_get_bulk_job_status", call_status)
+        monkeypatch.setattr(time, "sleep", delays.append)
+        jobs = [
+            BulkJob(list_id=1, job_id=2, count=10),
+            BulkJob(list_id=1, job_id=1, count=10),
+            BulkJob(list_id=2, job_id=3, count=10),
+        ]
+
+        pending = service.wait_for_bulk_jobs(jobs, poll_interval=1, max_poll_interval=3)
+
+        assert pending == []
+        assert all(_j.status == BulkJobStatus.DONE for _j in jobs)
+        assert calls == [1, 3, 1, 2, 3, 3]  # Oldest job of each list is polled first.
+        assert delays == [1, 2, 1]  # Wait grows while no job finishes.
+
+    def test_wait_for_bulk_jobs__timeout(self, monkeypatch, service):
+        class PendingMockResponse(MockResponse):
+            _val = {"status": "pending"}
+
+        monkeypatch.setattr(service, "_call_get_bulk_job_status", lambda *args: PendingMockResponse())
+        job = BulkJob(list_id=1, job_id=1, count=10)
+
+        assert service.wait_for_bulk_jobs([job], timeout=0) == [job]
+        assert service.wait_for_bulk_jobs([BulkJob(list_id=1, job_id=2, count=1, status=BulkJobStatus.FAILED)]) == []
+
+    @pytest.mark.parametrize("max_workers", [1, 4])
+    def test_iter_campaign_stats_detail_pages__start_page(self, monkeypatch, service, max_workers):
+        pages = []
+
+        def call_page(campaign_id, page):
+            pages.append(page)
+            return self.stats_detail_page(page)
+
+        monkeypatch.setattr(service, "_call_get_campaigns_stats_detail_page", call_page)
+
+        page_subscribers = list(service.iter_campaign_stats_detail_pages(123, max_workers=max_workers, start_page=4))
+
+        assert sorted(pages) == [4, 5]
+        assert [[_s.open for _s in _p] for _p in page_subscribers] == [[6, 7], [8, 9]]
@@ -44,3 +44,15 @@ class TestSubscriber:
         assert subscriber.phone == "123"
         assert subscriber.country == "CZ"
         assert subscriber.tags == ["tag1", "tag2"]
+
+    def test_from_trusted_dict(self):
+        _d = {
+            "name": "John",
+            "surname": "Doe",
+            "email": "user@example.com",
+            "tags": ["tag1"],
+        }
+        subscriber = Subscriber.from_trusted_dict(_d)
+        assert subscriber == Subscriber.from_dict(_d)
+        assert subscriber.phone is None
+        assert not hasattr(subscriber, "__dict__")  # Slotted class.
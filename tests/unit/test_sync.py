@@ -0,0 +1,149 @@
+import datetime
+
+import pytest
+
+from ecomail.campaign import Campaign, CampaignStatus
+from ecomail.exceptions import ApiConnectionError
+from ecomail.service import EcoMailOptions, EcoMailService
+from ecomail.subscriber import Subscriber
+from ecomail.sync import CampaignSync, CampaignSyncState, SubscriberSync, subscriber_fingerprint
+
+
+class MockResponse:
+    """
+    Mock response with job ID.
+    """
+
+    # noinspection PyUnusedLocal
+    def json(self, *args, **kwargs):
+        return {"job_id": 1}
+
+    @property
+    def content(self) -> bytes:
+        return b'{"job_id": 1}'
+
+
+def make_subscribers(count: int, name: str = "John") -> list[Subscriber]:
+    return [Subscriber(name=name, surname="Doe", email=f"user{_i}@example.com") for _i in range(count)]
+
+
+class TestSubscriberSync:
+
+    @pytest.fixture
+    def service(self) -> EcoMailService:
+        """
+        Dummy service with test values.
+        """
+        options = EcoMailOptions(base_url="https://example.com", api_key="123_mock_key")
+        return EcoMailService(options=options)
+
+    @pytest.fixture
+    def sent(self, monkeypatch, service) -> list[list[str]]:
+        """
+        Records emails sent in bulk calls of service.
+        """
+        sent = []
+
+        def call_bulk(list_id, subscribers):
+            sent.append([_s.email for _s in subscribers])
+            return MockResponse()
+
+        monkeypatch.setattr(service, "_call_add_bulk_subscribers_to_list", call_bulk)
+        return sent
+
+    def test_sync__only_changes(self, tmp_path, service, sent):
+        with SubscriberSync(service, tmp_path / "state.db") as sync:
+            result = sync.sync(1, make_subscribers(1000))
+            assert (result.sent, result.unchanged, result.failed) == (1000, 0, 0)
+
+            subscribers = make_subscribers(1001)
+            subscribers[5] = Subscriber(name="Jane", surname="Doe", email="user5@example.com")
+            result = sync.sync(1, subscribers)
+
+        assert (result.sent, result.unchanged) == (2, 999)
+        assert sent[-1] == ["user5@example.com", "user1000@example.com"]
+
+    def test_sync__state_is_persisted_per_list(self, tmp_path, service, sent):
+        with SubscriberSync(service, tmp_path / "state.db") as sync:
+            sync.sync(1, make_subscribers(10))
+        with SubscriberSync(service, tmp_path / "state.db") as sync:
+            assert sync.sync(1, make_subscribers(10)).sent == 0
+            assert sync.sync(2, make_subscribers(10)).sent == 10
+
+    def test_sync__failed_chunks_are_not_recorded(self, monkeypatch, tmp_path, service):
+        # noinspection PyUnusedLocal
+        def raise_error(list_id, subscribers):
+            raise ApiConnectionError("Server error")
+
+        monkeypatch.setattr(service, "_call_add_bulk_subscribers_to_list", raise_error)
+
+        with SubscriberSync(service, tmp_path / "state.db") as sync:
+            result = sync.sync(1, make_subscribers(10))
+            assert result.failed == 10
+
+            monkeypatch.setattr(service, "_call_add_bulk_subscribers_to_list", lambda *args: MockResponse())
+            assert sync.sync(1, make_subscribers(10)).sent == 10
+
+    def test_forget(self, tmp_path, service, sent):
+        with SubscriberSync(service, tmp_path / "state.db") as sync:
+            sync.sync(1, make_subscribers(10))
+            sync.forget(1, ["user1@example.com"])
+            assert sync.sync(1, make_subscribers(10)).sent == 1
+            sync.forget(1)
+            assert sync.sync(1, make_subscribers(10)).sent == 10
+
+
+def make_campaign(campaign_id: int, status: CampaignStatus = CampaignStatus.SENT) -> Campaign:
+    return Campaign(
+        id=campaign_id,
+        from_name="Org",
+        from_email="org@example.com",
+        reply_to="org@example.com",
+        title=f"Campaign {campaign_id}",
+        subject="Hello",
+        sent_at=datetime.datetime(2024, 1, campaign_id) if status == CampaignStatus.SENT else None,
+        recipients=10,
+        status=status,
+    )
+
+
+class TestCampaignSync:
+
+    def test_sync(self, monkeypatch, tmp_path):
+        service = EcoMailService(options=EcoMailOptions(base_url="https://example.com", api_key="123_mock_key"))
+        calls = []
+        responses = [
+            [make_campaign(1), make_campaign(2, CampaignStatus.SCHEDULED), make_campaign(3)],
+            [make_campaign(2), make_campaign(4, CampaignStatus.DRAFT)],
+        ]
+
+        def iter_campaigns(since_id=None, include_ids=()):
+            calls.append((since_id, set(include_ids)))
+            return iter(responses.pop(0))
+
+        monkeypatch.setattr(service, "iter_campaigns", iter_campaigns)
+
+        assert [_c.id for _c in CampaignSync(service, tmp_path / "state.json").sync()] == [1, 2, 3]
+
+        sync = CampaignSync(service, tmp_path / "state.json")  # State is loaded from file.
+        assert sync.state == CampaignSyncState(
+            high_water_id=3,
+            open_ids=frozenset({2}),
+        )
+        assert [_c.id for _c in sync.sync()] == [2, 4]
+        assert calls == [(None, set()), (3, {2})]
+        assert (sync.state.high_water_id, sync.state.open_ids) == (4, frozenset({4}))
+
+    def test_state_from_dict__extra_keys(self):
+        data = {"high_water_id": 3, "high_water_sent_at": "2024-01-03T00:00:00", "open_ids": [2]}
+        assert CampaignSyncState.from_dict(data) == CampaignSyncState(high_water_id=3, open_ids=frozenset({2}))
+
+
+def test_subscriber_fingerprint():
+    subscriber = Subscriber(name="John", surname="Doe", email="user@example.com", tags=["a"])
+    assert subscriber_fingerprint(subscriber) == subscriber_fingerprint(
+        Subscriber(tags=["a"], email="user@example.com", surname="Doe", name="John"),
+    )
+    assert subscriber_fingerprint(subscriber) != subscriber_fingerprint(
+        Subscriber(name="John", surname="Doe", email="user@example.com", tags=["b"]),
+    )
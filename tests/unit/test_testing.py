@@ -0,0 +1,76 @@
+import pytest
+
+from ecomail.testing import FakeEcoMailServer, FakeServerOptions
+
+
+class FakeClock:
+    """
+    Manually advanced clock.
+    """
+    now = 0.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+class TestFakeEcoMailServer:
+
+    @pytest.fixture
+    def clock(self) -> FakeClock:
+        return FakeClock()
+
+    @pytest.fixture
+    def server(self, clock) -> FakeEcoMailServer:
+        """
+        Fake server handling requests without serving.
+        """
+        options = FakeServerOptions(stats_subscribers=5, stats_per_page=2, rate_limit_calls=2, rate_limit_period=60)
+        server = FakeEcoMailServer(options, clock=clock)
+        yield server
+        server.stop()
+
+    def test_handle__missing_api_key(self, server):
+        status, _, _ = server.handle("GET", "campaigns", {}, {}, None)
+        assert status == 401
+
+    def test_handle__rate_limit(self, server, clock):
+        statuses = [server.handle("GET", "campaigns", {}, {"key": "abc"}, None)[0] for _ in range(3)]
+        assert statuses == [200, 200, 429]
+
+        clock.now = 30
+        _, _, headers = server.handle("GET", "campaigns", {}, {"key": "abc"}, None)
+        assert headers["Retry-After"] == "30"
+
+        clock.now = 60
+        assert server.handle("GET", "campaigns", {}, {"key": "abc"}, None)[0] == 200
+        assert server.request_count == 5
+
+    def test_handle__stats_detail_pages(self, server):
+        _, last_page, _ = server.handle("GET", "campaigns/1/stats-detail", {"page": "3"}, {"key": "abc"}, None)
+        assert list(last_page["subscribers"]) == ["subscriber4@example.com"]
+        assert (last_page["total"], last_page["per_page"], last_page["next_page_url"]) == (5, 2, None)
+
+    def test_handle__campaign_pages(self):
+        server = FakeEcoMailServer(FakeServerOptions(campaigns=5, campaigns_per_page=2))
+        _, last_page, _ = server.handle("GET", "campaigns", {"page": "3"}, {"key": "abc"}, None)
+        assert ([_c["id"] for _c in last_page["data"]], last_page["next_page_url"]) == ([1], None)
+        assert server.handle("GET", "campaigns/5", {}, {"key": "abc"}, None)[1]["id"] == 5
+        assert server.handle("GET", "campaigns/6", {}, {"key": "abc"}, None)[0] == 404
+        server.stop()
+
+    def test_handle__bulk_limit(self, server):
+        body = {"subscriber_data": [{"email": f"user{_i}@example.com"} for _i in range(3001)]}
+        status, _, _ = server.handle("POST", "lists/1/subscribe-bulk", {}, {"key": "abc"}, body)
+        assert status == 422
+
+    def test_handle__injected_errors(self, server):
+        server.fail_next(1, status=503)
+        statuses = [server.handle("GET", "campaigns", {}, {"key": "abc"}, None)[0] for _ in range(2)]
+        assert statuses == [503, 200]
+
+    def test_handle__error_rate(self, clock):
+        options = FakeServerOptions(rate_limit_calls=None, error_rate=0.5, seed=1)
+        server = FakeEcoMailServer(options, clock=clock)
+        statuses = {server.handle("GET", "campaigns", {}, {"key": "abc"}, None)[0] for _ in range(50)}
+        server.stop()
+        assert statuses == {200, 500}
@@ -1,6 +1,8 @@
+import json
+
 import pytest
 
-from ecomail.utils import is_empty_or_whitespace
+from ecomail.utils import chunked, is_empty_or_whitespace, write_json_atomic
 
 
 @pytest.mark.parametrize(
@@ -16,3 +18,28 @@ from ecomail.utils import is_empty_or_whitespace
 )
 def test_is_empty_or_whitespace(input, expected_output):
     assert is_empty_or_whitespace(input) is expected_output
+
+
+@pytest.mark.parametrize(
+    "size, expected_output",
+    [
+        (2, [[0, 1], [2, 3], [4]]),
+        (5, [[0, 1, 2, 3, 4]]),
+        (10, [[0, 1, 2, 3, 4]]),
+    ]
+)
+def test_chunked(size, expected_output):
+    assert list(chunked((_i for _i in range(5)), size)) == expected_output
+
+
+def test_chunked__invalid_size():
+    with pytest.raises(ValueError):
+        _ = list(chunked([1], 0))
+
+
+def test_write_json_atomic(tmp_path):
+    path = tmp_path / "state.json"
+    write_json_atomic(path, {"a": 1})
+    write_json_atomic(path, {"a": 2})
+    assert json.loads(path.read_text()) == {"a": 2}
+    assert [_p.name for _p in tmp_path.iterdir()] == ["state.json"]